@@ -1,12 +1,16 @@
-from fastapi import APIRouter, Header, HTTPException
+import httpx
+from fastapi import APIRouter, Depends, Header, HTTPException
 from sqlalchemy import select
+from sqlalchemy.orm import Session
 
 from app.core.config import settings
-from app.db.models import Source
-from app.db.session import SessionLocal
-from app.jobs.ingestion import run_ingestion_job
-from app.schemas import ReingestRequest, ReingestResponse
-from app.services.queue import get_queue
+from app.db.models import Source, SourceHealth
+from app.db.session import SessionLocal, get_db
+from app.jobs.reingest import ReingestUnavailable, submit_reingest
+from app.schemas import ReingestRequest, ReingestResponse, SourceHealthItem, SourceHealthResponse, WebSubSubscriptionResponse
+from app.services.pipeline import enabled_sources_query
+from app.services.source_health import CLOSED
+from app.services.websub import WebSubError, request_subscription
 
 router = APIRouter(prefix="/v1/admin", tags=["admin"])
 
@@ -22,21 +26,69 @@ def trigger_reingest(payload: ReingestRequest, authorization: str | None = Heade
     verify_admin_token(authorization)
 
     with SessionLocal() as db:
-        source_query = select(Source).where(Source.enabled.is_(True))
-        selected_types = set(payload.source_types or [])
-        if selected_types:
-            source_query = source_query.where(Source.source_type.in_(selected_types))
-        eligible_count = len(db.scalars(source_query).all())
+        eligible_count = len(db.scalars(enabled_sources_query(payload.source_types)).all())
 
     try:
-        queue = get_queue()
-        job = queue.enqueue(run_ingestion_job, source_types=payload.source_types)
-        job_id = job.id
-    except Exception:
-        result = run_ingestion_job(source_types=payload.source_types)
-        job_id = f"sync:{result['normalized_count']}"
-
-    return ReingestResponse(
-        queued=True,
-        message=f"Queued ingestion for {eligible_count} manually curated source(s). job_id={job_id}",
+        submission = submit_reingest(payload.source_types, profile=payload.profile)
+    except ReingestUnavailable as exc:
+        raise HTTPException(status_code=503, detail=str(exc)) from exc
+
+    job_id = submission["job_id"]
+    if submission["coalesced"]:
+        message = f"Ingestion for these source types is already queued or running. job_id={job_id}"
+    else:
+        message = f"Queued ingestion for {eligible_count} manually curated source(s). job_id={job_id}"
+    return ReingestResponse(queued=True, message=message, job_id=job_id, coalesced=submission["coalesced"])
+
+
+def _health_item(source: Source, health: SourceHealth | None) -> SourceHealthItem:
+    item = SourceHealthItem(
+        source_id=source.id, source_type=source.source_type, name=source.name, enabled=source.enabled, state=CLOSED, consecutive_failures=0
+    )
+    if health is None:
+        return item
+    return item.model_copy(
+        update={
+            "state": health.state,
+            "consecutive_failures": health.consecutive_failures,
+            "latency_ewma_ms": health.latency_ewma_ms,
+            "last_error": health.last_error,
+            "last_success_at": health.last_success_at,
+            "last_failure_at": health.last_failure_at,
+            "retry_at": health.retry_at,
+        }
+    )
+
+
+@router.get("/sources/health", response_model=SourceHealthResponse)
+def source_health(authorization: str | None = Header(default=None), db: Session = Depends(get_db)) -> SourceHealthResponse:
+    verify_admin_token(authorization)
+
+    rows = db.execute(
+        select(Source, SourceHealth)
+        .outerjoin(SourceHealth, SourceHealth.source_id == Source.id)
+        .order_by(SourceHealth.consecutive_failures.desc().nulls_last(), Source.id)
+    ).all()
+    return SourceHealthResponse(items=[_health_item(source, health) for source, health in rows])
+
+
+@router.post("/websub/{source_id}/{mode}", response_model=WebSubSubscriptionResponse)
+def manage_websub(
+    source_id: str, mode: str, authorization: str | None = Header(default=None), db: Session = Depends(get_db)
+) -> WebSubSubscriptionResponse:
+    verify_admin_token(authorization)
+    if mode not in ("subscribe", "unsubscribe"):
+        raise HTTPException(status_code=404, detail="Unknown mode")
+    source = db.get(Source, source_id)
+    if source is None:
+        raise HTTPException(status_code=404, detail="Unknown source")
+
+    try:
+        row = request_subscription(db, source, mode)
+    except WebSubError as exc:
+        raise HTTPException(status_code=400, detail=str(exc)) from exc
+    except httpx.HTTPError as exc:
+        raise HTTPException(status_code=502, detail=f"Hub request failed: {exc}") from exc
+    return WebSubSubscriptionResponse(
+        source_id=row.source_id, state=row.state, hub_url=row.hub_url, topic_url=row.topic_url, expires_at=row.expires_at
     )
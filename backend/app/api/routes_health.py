@@ -1,4 +1,6 @@
-from fastapi import APIRouter
+from fastapi import APIRouter, Response
+
+from app.core.metrics import render_metrics
 
 router = APIRouter()
 
@@ -11,3 +13,9 @@ def healthz() -> dict[str, str]:
 @router.get("/readyz")
 def readyz() -> dict[str, str]:
     return {"status": "ready"}
+
+
+@router.get("/metrics", include_in_schema=False)
+def metrics() -> Response:
+    payload, content_type = render_metrics()
+    return Response(content=payload, media_type=content_type)
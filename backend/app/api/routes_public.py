@@ -5,7 +5,7 @@ from app.core.config import settings
 from app.db.session import get_db
 from app.schemas import CategoriesResponse, StoryDetail, StoryListResponse
 from app.services.cache import get_cache_json, set_cache_json
-from app.services.store import get_categories, get_story_cards, get_story_detail, seeded_stories
+from app.services.store import get_categories, get_story_cards, get_story_detail, seeded_cards, seeded_stories
 
 router = APIRouter(prefix="/v1", tags=["public"])
 
@@ -31,8 +31,7 @@ def get_latest(limit: int = Query(default=20, ge=1, le=50), db: Session = Depend
 
     cards = get_story_cards(db, limit=limit)
     if not cards:
-        fallback = [story.model_dump(exclude={"long_summary", "sources"}) for story in seeded_stories()[:limit]]
-        return StoryListResponse(items=fallback)
+        return StoryListResponse(items=seeded_cards(limit))
 
     payload = StoryListResponse(items=cards)
     set_cache_json(cache_key, payload.model_dump(mode="json"), settings.feed_cache_ttl_seconds)
@@ -43,8 +42,7 @@ def get_latest(limit: int = Query(default=20, ge=1, le=50), db: Session = Depend
 def get_breaking(limit: int = Query(default=20, ge=1, le=50), db: Session = Depends(get_db)) -> StoryListResponse:
     cards = get_story_cards(db, limit=limit, status="breaking")
     if not cards:
-        fallback = [story.model_dump(exclude={"long_summary", "sources"}) for story in seeded_stories()[:limit]]
-        return StoryListResponse(items=fallback)
+        return StoryListResponse(items=seeded_cards(limit))
     return StoryListResponse(items=cards)
 
 
@@ -66,8 +64,7 @@ def list_stories(
     if category:
         return StoryListResponse(items=[])
 
-    fallback = [story.model_dump(exclude={"long_summary", "sources"}) for story in seeded_stories()[:limit]]
-    return StoryListResponse(items=fallback)
+    return StoryListResponse(items=seeded_cards(limit))
 
 
 @router.get("/stories/{story_id}", response_model=StoryDetail)
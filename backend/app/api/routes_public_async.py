@@ -0,0 +1,87 @@
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.db.session import get_async_db
+from app.schemas import CategoriesResponse, StoryDetail, StoryListResponse
+from app.services.cache import get_cache_json_async, set_cache_json_async
+from app.services.store import (
+    get_categories_async,
+    get_story_cards_async,
+    get_story_detail_async,
+    seeded_cards,
+    seeded_stories,
+)
+
+# Mirrors routes_public on the async engine and Redis client; main.py mounts one or the other (API_ASYNC_READS).
+router = APIRouter(prefix="/v1", tags=["public"])
+
+
+@router.get("/categories", response_model=CategoriesResponse)
+async def categories(db: AsyncSession = Depends(get_async_db)) -> CategoriesResponse:
+    cache_key = "public:categories"
+    cached = await get_cache_json_async(cache_key)
+    if cached:
+        return CategoriesResponse(**cached)
+
+    payload = CategoriesResponse(items=await get_categories_async(db))
+    await set_cache_json_async(cache_key, payload.model_dump(mode="json"), settings.feed_cache_ttl_seconds)
+    return payload
+
+
+@router.get("/latest", response_model=StoryListResponse)
+async def get_latest(limit: int = Query(default=20, ge=1, le=50), db: AsyncSession = Depends(get_async_db)) -> StoryListResponse:
+    cache_key = f"public:latest:{limit}"
+    cached = await get_cache_json_async(cache_key)
+    if cached:
+        return StoryListResponse(**cached)
+
+    cards = await get_story_cards_async(db, limit=limit)
+    if not cards:
+        return StoryListResponse(items=seeded_cards(limit))
+
+    payload = StoryListResponse(items=cards)
+    await set_cache_json_async(cache_key, payload.model_dump(mode="json"), settings.feed_cache_ttl_seconds)
+    return payload
+
+
+@router.get("/breaking", response_model=StoryListResponse)
+async def get_breaking(limit: int = Query(default=20, ge=1, le=50), db: AsyncSession = Depends(get_async_db)) -> StoryListResponse:
+    cards = await get_story_cards_async(db, limit=limit, status="breaking")
+    if not cards:
+        return StoryListResponse(items=seeded_cards(limit))
+    return StoryListResponse(items=cards)
+
+
+@router.get("/stories", response_model=StoryListResponse)
+async def list_stories(
+    category: str | None = None,
+    limit: int = Query(default=20, ge=1, le=50),
+    db: AsyncSession = Depends(get_async_db),
+) -> StoryListResponse:
+    if category and category.lower() == "breaking":
+        cards = await get_story_cards_async(db, limit=limit, status="breaking")
+        if cards:
+            return StoryListResponse(items=cards)
+
+    cards = await get_story_cards_async(db, limit=limit, category_slug=category)
+    if cards:
+        return StoryListResponse(items=cards)
+
+    if category:
+        return StoryListResponse(items=[])
+
+    return StoryListResponse(items=seeded_cards(limit))
+
+
+@router.get("/stories/{story_id}", response_model=StoryDetail)
+async def get_story(story_id: str, db: AsyncSession = Depends(get_async_db)) -> StoryDetail:
+    detail = await get_story_detail_async(db, story_id)
+    if detail:
+        return detail
+
+    for story in seeded_stories():
+        if story.id == story_id:
+            return story
+
+    raise HTTPException(status_code=404, detail="Story not found")
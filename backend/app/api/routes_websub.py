@@ -0,0 +1,50 @@
+import logging
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import PlainTextResponse
+from sqlalchemy.orm import Session
+
+from app.db.session import get_db
+from app.jobs.push import submit_push_ingestion
+from app.services.websub import receive_notification, verify_intent
+
+logger = logging.getLogger("pulsewire.websub")
+
+router = APIRouter(prefix="/v1/websub", tags=["websub"])
+
+
+@router.get("/{source_id}", response_class=PlainTextResponse)
+def verify_subscription(
+    source_id: str,
+    mode: str = Query(alias="hub.mode"),
+    topic: str = Query(alias="hub.topic"),
+    challenge: str = Query(default="", alias="hub.challenge"),
+    lease_seconds: int | None = Query(default=None, alias="hub.lease_seconds"),
+    db: Session = Depends(get_db),
+) -> str:
+    echoed = verify_intent(db, source_id, mode, topic, challenge, lease_seconds)
+    if echoed is None:
+        raise HTTPException(status_code=404, detail="Unknown subscription")
+    return echoed
+
+
+def _accept_notification(db: Session, source_id: str, body: bytes, signature: str | None) -> None:
+    entries = receive_notification(db, source_id, body, signature)
+    if not entries:
+        return
+    try:
+        submit_push_ingestion(db, source_id, entries)
+    except Exception:
+        # The hub still gets its 2xx; the entries are picked up again once the lease lapses and polling resumes.
+        db.rollback()
+        logger.exception("push ingestion for %s failed", source_id)
+
+
+@router.post("/{source_id}", status_code=202)
+async def receive_push(source_id: str, request: Request, db: Session = Depends(get_db)) -> Response:
+    body = await request.body()
+    signature = request.headers.get("X-Hub-Signature-256") or request.headers.get("X-Hub-Signature")
+    await run_in_threadpool(_accept_notification, db, source_id, body, signature)
+    # Hubs get a 2xx even for unsigned or unknown pushes, which are dropped; anything else makes them retry.
+    return Response(status_code=202)
@@ -0,0 +1,135 @@
+from __future__ import annotations
+
+import os
+from collections.abc import Callable
+from functools import wraps
+from time import perf_counter
+from typing import TypeVar
+
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    REGISTRY,
+    CollectorRegistry,
+    Counter,
+    Histogram,
+    generate_latest,
+    multiprocess,
+    push_to_gateway,
+    write_to_textfile,
+)
+from prometheus_client.core import GaugeMetricFamily
+
+from app.core.config import settings
+from app.db.query_stats import track_queries
+
+F = TypeVar("F", bound=Callable)
+C = TypeVar("C")
+
+# Collectors that read current state at scrape time. Multiprocess files only hold what each process
+# wrote, so render_metrics registers these on the aggregating registry as well.
+_LIVE_COLLECTORS: list = []
+
+
+def register_live_collector(collector: C) -> C:
+    REGISTRY.register(collector)
+    _LIVE_COLLECTORS.append(collector)
+    return collector
+
+
+class LiveGauge:
+    """Gauge whose values are read from callbacks at scrape time; unlike ``Gauge.set_function`` it writes
+    nothing to the multiprocess directory, so it can sit beside the aggregated files."""
+
+    def __init__(self, name: str, documentation: str, labelnames: tuple[str, ...] = ()) -> None:
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = labelnames
+        self._functions: dict[tuple[str, ...], Callable[[], float]] = {}
+
+    def set_function(self, function: Callable[[], float], *labelvalues: str) -> None:
+        self._functions[labelvalues] = function
+
+    def collect(self):
+        if not self._functions:
+            return
+        gauge = GaugeMetricFamily(self.name, self.documentation, labels=self.labelnames)
+        for labelvalues, function in self._functions.items():
+            gauge.add_metric(list(labelvalues), function())
+        yield gauge
+
+
+HTTP_REQUEST_SECONDS = Histogram(
+    "pulsewire_http_request_duration_seconds", "API request latency by route template.", ["method", "route", "status"]
+)
+CACHE_REQUESTS = Counter("pulsewire_cache_requests_total", "Redis response-cache operations.", ["operation", "result"])
+DB_POOL_CHECKOUT_SECONDS = Histogram(
+    "pulsewire_db_pool_checkout_seconds",
+    "Time spent waiting for a pooled database connection.",
+    ["pool"],
+    buckets=(0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0, 30.0),
+)
+DB_POOL_CHECKED_OUT = register_live_collector(
+    LiveGauge("pulsewire_db_pool_checked_out", "Connections currently checked out of the pool.", ("pool",))
+)
+JOB_SECONDS = Histogram(
+    "pulsewire_job_duration_seconds",
+    "Background job duration.",
+    ["job", "outcome"],
+    buckets=(0.1, 0.5, 1, 5, 15, 30, 60, 120, 300, 600, 1800),
+)
+JOB_DB_QUERIES = Histogram(
+    "pulsewire_job_db_queries",
+    "SQL statements issued per background job.",
+    ["job"],
+    buckets=(10, 50, 100, 500, 1000, 5000, 10000, 50000),
+)
+LLM_REQUEST_SECONDS = Histogram(
+    "pulsewire_llm_request_duration_seconds",
+    "Summarization provider latency.",
+    ["provider", "model", "outcome"],
+    buckets=(0.05, 0.25, 0.5, 1, 2, 5, 10, 20, 60),
+)
+LLM_TOKENS = Counter("pulsewire_llm_tokens_total", "Tokens reported by summarization providers.", ["provider", "model", "kind"])
+
+
+def render_metrics() -> tuple[bytes, str]:
+    registry = REGISTRY
+    if os.getenv("PROMETHEUS_MULTIPROC_DIR"):
+        # Several API worker processes: aggregate what each one wrote to the shared directory.
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+        for collector in _LIVE_COLLECTORS:
+            registry.register(collector)
+    return generate_latest(registry), CONTENT_TYPE_LATEST
+
+
+def flush_metrics(job: str) -> None:
+    # Short-lived and queue-driven processes have no scrape endpoint, so they push or write a textfile.
+    try:
+        if settings.metrics_pushgateway_url:
+            push_to_gateway(settings.metrics_pushgateway_url, job=job, registry=REGISTRY)
+        if settings.metrics_textfile_path:
+            write_to_textfile(settings.metrics_textfile_path, REGISTRY)
+    except Exception:
+        return
+
+
+def observe_job(name: str) -> Callable[[F], F]:
+    def decorator(func: F) -> F:
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            started = perf_counter()
+            outcome = "failed"
+            try:
+                with track_queries() as queries:
+                    result = func(*args, **kwargs)
+                outcome = "succeeded"
+                return result
+            finally:
+                JOB_SECONDS.labels(job=name, outcome=outcome).observe(perf_counter() - started)
+                JOB_DB_QUERIES.labels(job=name).observe(queries.count)
+                flush_metrics(f"pulsewire-{name}")
+
+        return wrapper  # type: ignore[return-value]
+
+    return decorator
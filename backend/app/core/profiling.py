@@ -0,0 +1,107 @@
+from __future__ import annotations
+
+import inspect
+import random
+import re
+import sys
+import threading
+from collections import Counter
+from datetime import datetime, timezone
+from pathlib import Path
+from types import CodeType
+
+from fastapi import FastAPI, Request
+from fastapi.concurrency import run_in_threadpool
+from starlette.routing import Match
+
+from app.core.config import settings
+
+# Innermost frames of threads that are parked rather than working; they only add noise.
+_IDLE_MODULES = {"threading", "selectors", "queue", "concurrent.futures.thread", "asyncio.base_events"}
+
+
+def profile_path(prefix: str, suffix: str) -> Path:
+    stamp = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%S%fZ")
+    safe_prefix = re.sub(r"[^A-Za-z0-9_.-]+", "_", prefix).strip("_")
+    directory = Path(settings.profile_dir)
+    directory.mkdir(parents=True, exist_ok=True)
+    return directory / f"{safe_prefix}-{stamp}{suffix}"
+
+
+class StackSampler:
+    """Samples every other thread's stack at a fixed interval into folded-stack counts.
+
+    Sync endpoints run on threadpool workers, which a per-thread profiler started in the
+    middleware would never see, so every thread is inspected. With ``within`` set, only stacks
+    passing through that code object are kept, which leaves out whatever else the process is
+    doing while the request runs.
+    """
+
+    def __init__(self, interval_seconds: float = 0.005, within: CodeType | None = None) -> None:
+        self.interval_seconds = interval_seconds
+        self.within = within
+        self.counts: Counter[str] = Counter()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="stack-sampler", daemon=True)
+
+    def _run(self) -> None:
+        own = threading.get_ident()
+        while not self._stop.wait(self.interval_seconds):
+            for ident, frame in sys._current_frames().items():
+                if ident == own or frame.f_globals.get("__name__") in _IDLE_MODULES:
+                    continue
+                stack: list[str] = []
+                inside = self.within is None
+                while frame is not None:
+                    stack.append(f"{frame.f_globals.get('__name__', '?')}:{frame.f_code.co_name}")
+                    inside = inside or frame.f_code is self.within
+                    frame = frame.f_back
+                if inside:
+                    self.counts[";".join(reversed(stack))] += 1
+
+    def start(self) -> StackSampler:
+        self._thread.start()
+        return self
+
+    def stop(self) -> Counter[str]:
+        self._stop.set()
+        self._thread.join()
+        return self.counts
+
+
+def write_folded(counts: Counter[str], path: Path) -> Path:
+    # One "frame;frame;frame count" line per stack: the input format of flamegraph.pl and speedscope.
+    path.write_text("".join(f"{stack} {count}\n" for stack, count in counts.most_common()), encoding="utf-8")
+    return path
+
+
+def _matched_route(app: FastAPI, request: Request):
+    # Routing happens inside call_next, so the endpoint is resolved up front the same way.
+    for route in app.router.routes:
+        match, _ = route.matches(request.scope)
+        if match == Match.FULL:
+            return route
+    return None
+
+
+def _save_profile(sampler: StackSampler, prefix: str) -> Path:
+    return write_folded(sampler.stop(), profile_path(prefix, ".folded"))
+
+
+def install_request_profiler(app: FastAPI) -> None:
+    @app.middleware("http")
+    async def profile_sampled_requests(request: Request, call_next):
+        if random.random() >= settings.profile_request_rate:
+            return await call_next(request)
+        route = _matched_route(app, request)
+        endpoint = getattr(route, "endpoint", None)
+        if endpoint is None:
+            return await call_next(request)
+
+        # Only the endpoint's own frames: its worker thread for sync routes, its coroutine on the loop for async ones.
+        sampler = StackSampler(settings.profile_sample_interval_ms / 1000, within=inspect.unwrap(endpoint).__code__).start()
+        try:
+            return await call_next(request)
+        finally:
+            # Joining the sampler and writing the file would otherwise block the event loop.
+            await run_in_threadpool(_save_profile, sampler, f"request-{request.method}-{route.path}")
@@ -1,7 +1,16 @@
+from functools import lru_cache
+
 from redis import Redis
+from redis.asyncio import Redis as AsyncRedis
 
 from app.core.config import settings
 
 
 def get_redis(*, decode_responses: bool = True) -> Redis:
     return Redis.from_url(settings.redis_url, decode_responses=decode_responses)
+
+
+@lru_cache(maxsize=1)
+def get_async_redis() -> AsyncRedis:
+    # One pooled client per process: the API serves every async request from the same event loop.
+    return AsyncRedis.from_url(settings.redis_url, decode_responses=True)
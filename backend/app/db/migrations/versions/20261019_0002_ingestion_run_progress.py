@@ -0,0 +1,29 @@
+"""track chunk checkpoints on ingestion runs
+
+Revision ID: 20261019_0002
+Revises: 20260226_0001
+Create Date: 2026-10-19 09:00:00
+"""
+
+from __future__ import annotations
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "20261019_0002"
+down_revision = "20260226_0001"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column("ingestion_runs", sa.Column("completed_source_ids", sa.JSON(), nullable=False, server_default="[]"))
+    op.add_column("ingestion_runs", sa.Column("touched_cluster_ids", sa.JSON(), nullable=False, server_default="[]"))
+    op.add_column("ingestion_runs", sa.Column("checkpointed_at", sa.DateTime(timezone=True), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column("ingestion_runs", "checkpointed_at")
+    op.drop_column("ingestion_runs", "touched_cluster_ids")
+    op.drop_column("ingestion_runs", "completed_source_ids")
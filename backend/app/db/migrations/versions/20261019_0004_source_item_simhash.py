@@ -0,0 +1,25 @@
+"""store simhash fingerprints on source items
+
+Revision ID: 20261019_0004
+Revises: 20261019_0003
+Create Date: 2026-10-19 11:00:00
+"""
+
+from __future__ import annotations
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "20261019_0004"
+down_revision = "20261019_0003"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column("source_items", sa.Column("simhash", sa.BigInteger(), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column("source_items", "simhash")
@@ -0,0 +1,40 @@
+"""per-source ingestion run stats
+
+Revision ID: 20261019_0005
+Revises: 20261019_0004
+Create Date: 2026-10-19 13:00:00
+"""
+
+from __future__ import annotations
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "20261019_0005"
+down_revision = "20261019_0004"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "ingestion_source_stats",
+        sa.Column("id", sa.String(length=64), primary_key=True),
+        sa.Column("run_id", sa.String(length=64), sa.ForeignKey("ingestion_runs.id", ondelete="CASCADE"), nullable=False),
+        sa.Column("source_id", sa.String(length=64), sa.ForeignKey("sources.id", ondelete="CASCADE"), nullable=False),
+        sa.Column("fetch_ms", sa.Float(), nullable=False, server_default="0"),
+        sa.Column("bytes_downloaded", sa.BigInteger(), nullable=True),
+        sa.Column("fetched_count", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("normalized_count", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("created_count", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("error", sa.Text(), nullable=True),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.text("now()"), nullable=False),
+        sa.UniqueConstraint("run_id", "source_id", name="uq_ingestion_source_stats_run_source"),
+    )
+    op.create_index("ix_ingestion_source_stats_source_created", "ingestion_source_stats", ["source_id", "created_at"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_ingestion_source_stats_source_created", table_name="ingestion_source_stats")
+    op.drop_table("ingestion_source_stats")
@@ -0,0 +1,25 @@
+"""resume tokens for streaming sources
+
+Revision ID: 20261019_0008
+Revises: 20261019_0007
+Create Date: 2026-10-19 17:00:00
+"""
+
+from __future__ import annotations
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "20261019_0008"
+down_revision = "20261019_0007"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column("source_cursors", sa.Column("resume_token", sa.String(length=255), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column("source_cursors", "resume_token")
@@ -0,0 +1,40 @@
+"""websub push subscriptions
+
+Revision ID: 20261019_0009
+Revises: 20261019_0008
+Create Date: 2026-10-19 18:00:00
+"""
+
+from __future__ import annotations
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "20261019_0009"
+down_revision = "20261019_0008"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "websub_subscriptions",
+        sa.Column("source_id", sa.String(length=64), sa.ForeignKey("sources.id", ondelete="CASCADE"), primary_key=True),
+        sa.Column("hub_url", sa.String(length=1000), nullable=False),
+        sa.Column("topic_url", sa.String(length=1000), nullable=False),
+        sa.Column("secret", sa.String(length=128), nullable=False),
+        sa.Column("state", sa.String(length=16), nullable=False, server_default="pending"),
+        sa.Column("lease_seconds", sa.Integer(), nullable=True),
+        sa.Column("verified_at", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("expires_at", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("last_notified_at", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.text("now()"), nullable=False),
+        sa.Column("updated_at", sa.DateTime(timezone=True), server_default=sa.text("now()"), nullable=False),
+    )
+    op.create_index("ix_websub_subscriptions_expires_at", "websub_subscriptions", ["expires_at"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_websub_subscriptions_expires_at", table_name="websub_subscriptions")
+    op.drop_table("websub_subscriptions")
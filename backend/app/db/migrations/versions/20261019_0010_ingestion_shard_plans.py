@@ -0,0 +1,31 @@
+"""ingestion shard plans shared by the tasks of one execution
+
+Revision ID: 20261019_0010
+Revises: 20261019_0009
+Create Date: 2026-10-19 19:00:00
+"""
+
+from __future__ import annotations
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "20261019_0010"
+down_revision = "20261019_0009"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "ingestion_shard_plans",
+        sa.Column("execution_id", sa.String(length=128), primary_key=True),
+        sa.Column("task_count", sa.Integer(), nullable=False),
+        sa.Column("shards_json", sa.JSON(), nullable=False),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.text("now()"), nullable=False),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("ingestion_shard_plans")
@@ -0,0 +1,25 @@
+"""websub subscription requests awaiting hub verification
+
+Revision ID: 20261019_0011
+Revises: 20261019_0010
+Create Date: 2026-10-19 20:00:00
+"""
+
+from __future__ import annotations
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "20261019_0011"
+down_revision = "20261019_0010"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column("websub_subscriptions", sa.Column("requested_at", sa.DateTime(timezone=True), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column("websub_subscriptions", "requested_at")
@@ -4,7 +4,7 @@ from datetime import datetime
 from typing import Any
 from uuid import uuid4
 
-from sqlalchemy import JSON, DateTime, Float, ForeignKey, Index, Integer, String, Text, UniqueConstraint, func
+from sqlalchemy import JSON, BigInteger, DateTime, Float, ForeignKey, Index, Integer, String, Text, UniqueConstraint, func
 from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column, relationship
 
 
@@ -43,10 +43,90 @@ class IngestionRun(Base):
     fetched_count: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
     normalized_count: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
     clustered_count: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    completed_source_ids: Mapped[list[str]] = mapped_column(JSON, default=list)
+    touched_cluster_ids: Mapped[list[str]] = mapped_column(JSON, default=list)
+    checkpointed_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
+    stats_json: Mapped[dict[str, Any]] = mapped_column(JSON, default=dict)
     started_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now(), nullable=False)
     completed_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
 
 
+class IngestionSourceStats(Base):
+    __tablename__ = "ingestion_source_stats"
+    __table_args__ = (
+        UniqueConstraint("run_id", "source_id", name="uq_ingestion_source_stats_run_source"),
+        Index("ix_ingestion_source_stats_source_created", "source_id", "created_at"),
+    )
+
+    id: Mapped[str] = mapped_column(String(64), primary_key=True, default=lambda: new_id("srcstat"))
+    run_id: Mapped[str] = mapped_column(ForeignKey("ingestion_runs.id", ondelete="CASCADE"), nullable=False)
+    source_id: Mapped[str] = mapped_column(ForeignKey("sources.id", ondelete="CASCADE"), nullable=False)
+    fetch_ms: Mapped[float] = mapped_column(Float, default=0.0, nullable=False)
+    bytes_downloaded: Mapped[int | None] = mapped_column(BigInteger, nullable=True)
+    fetched_count: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    normalized_count: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    created_count: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    skipped_count: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    error: Mapped[str | None] = mapped_column(Text, nullable=True)
+    created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+
+
+class IngestionShardPlan(Base):
+    __tablename__ = "ingestion_shard_plans"
+
+    execution_id: Mapped[str] = mapped_column(String(128), primary_key=True)
+    task_count: Mapped[int] = mapped_column(Integer, nullable=False)
+    shards_json: Mapped[list[dict]] = mapped_column(JSON, default=list)
+    created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+
+
+class SourceCursor(Base):
+    __tablename__ = "source_cursors"
+
+    source_id: Mapped[str] = mapped_column(ForeignKey("sources.id", ondelete="CASCADE"), primary_key=True)
+    last_external_id: Mapped[str | None] = mapped_column(String(255), nullable=True)
+    last_published_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
+    resume_token: Mapped[str | None] = mapped_column(String(255), nullable=True)
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), server_default=func.now(), onupdate=func.now(), nullable=False
+    )
+
+
+class SourceHealth(Base):
+    __tablename__ = "source_health"
+
+    source_id: Mapped[str] = mapped_column(ForeignKey("sources.id", ondelete="CASCADE"), primary_key=True)
+    state: Mapped[str] = mapped_column(String(16), default="closed", nullable=False)
+    consecutive_failures: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    latency_ewma_ms: Mapped[float | None] = mapped_column(Float, nullable=True)
+    last_error: Mapped[str | None] = mapped_column(Text, nullable=True)
+    last_success_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
+    last_failure_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
+    retry_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), server_default=func.now(), onupdate=func.now(), nullable=False
+    )
+
+
+class WebSubSubscription(Base):
+    __tablename__ = "websub_subscriptions"
+
+    source_id: Mapped[str] = mapped_column(ForeignKey("sources.id", ondelete="CASCADE"), primary_key=True)
+    hub_url: Mapped[str] = mapped_column(String(1000), nullable=False)
+    topic_url: Mapped[str] = mapped_column(String(1000), nullable=False)
+    secret: Mapped[str] = mapped_column(String(128), nullable=False)
+    state: Mapped[str] = mapped_column(String(16), default="pending", nullable=False)
+    lease_seconds: Mapped[int | None] = mapped_column(Integer, nullable=True)
+    requested_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
+    verified_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
+    expires_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True, index=True)
+    last_notified_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
+    created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), server_default=func.now(), onupdate=func.now(), nullable=False
+    )
+
+
 class RawIngestedItem(Base):
     __tablename__ = "raw_ingested_items"
     __table_args__ = (
@@ -86,6 +166,7 @@ class SourceItem(Base):
     raw_payload_json: Mapped[dict[str, Any]] = mapped_column(JSON, default=dict)
     content_hash: Mapped[str] = mapped_column(String(128), nullable=False)
     dedupe_key: Mapped[str] = mapped_column(String(128), nullable=False)
+    simhash: Mapped[int | None] = mapped_column(BigInteger, nullable=True)
     created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now(), nullable=False)
 
 
@@ -0,0 +1,72 @@
+from __future__ import annotations
+
+import logging
+from collections.abc import Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass
+from time import perf_counter
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from app.core.config import settings
+
+logger = logging.getLogger("pulsewire.sql")
+
+
+@dataclass(slots=True)
+class QueryStats:
+    count: int = 0
+    duration_ms: float = 0.0
+
+
+# Trackers nest (a run total around per-stage counters), so every active one sees each query.
+_active: ContextVar[tuple[QueryStats, ...]] = ContextVar("query_stats", default=())
+
+
+@contextmanager
+def track_queries() -> Iterator[QueryStats]:
+    stats = QueryStats()
+    token = _active.set((*_active.get(), stats))
+    try:
+        yield stats
+    finally:
+        _active.reset(token)
+
+
+def parameter_shape(parameters) -> object:
+    # Types only: slow-query logs should show which plan was hit, not user data.
+    if isinstance(parameters, dict):
+        return {key: type(value).__name__ for key, value in parameters.items()}
+    if isinstance(parameters, (list, tuple)):
+        if parameters and isinstance(parameters[0], (dict, list, tuple)):
+            return f"{len(parameters)} x {parameter_shape(parameters[0])}"
+        return [type(value).__name__ for value in parameters]
+    return type(parameters).__name__
+
+
+@event.listens_for(Engine, "before_cursor_execute")
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+    conn.info.setdefault("query_started_at", []).append(perf_counter())
+
+
+@event.listens_for(Engine, "after_cursor_execute")
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+    started = conn.info["query_started_at"].pop()
+    elapsed_ms = (perf_counter() - started) * 1000
+    for stats in _active.get():
+        stats.count += 1
+        stats.duration_ms += elapsed_ms
+
+    if settings.db_slow_query_ms and elapsed_ms >= settings.db_slow_query_ms:
+        logger.warning(
+            "slow query %.1fms: %s params=%s", elapsed_ms, " ".join(statement.split()), parameter_shape(parameters)
+        )
+
+
+@event.listens_for(Engine, "handle_error")
+def _handle_error(context) -> None:
+    started = context.connection.info.get("query_started_at") if context.connection is not None else None
+    if started:
+        started.pop()
@@ -1,12 +1,37 @@
-from collections.abc import Generator
+from collections.abc import AsyncGenerator, Generator
+from time import perf_counter
 
 from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import Session, sessionmaker
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
 
 from app.core.config import settings
+from app.core.metrics import DB_POOL_CHECKED_OUT, DB_POOL_CHECKOUT_SECONDS
 
-engine = create_engine(settings.database_url, pool_pre_ping=True)
+
+class _TimedCheckout:
+    pool_label = "sync"
+
+    def _do_get(self):
+        started = perf_counter()
+        try:
+            return super()._do_get()
+        finally:
+            DB_POOL_CHECKOUT_SECONDS.labels(pool=self.pool_label).observe(perf_counter() - started)
+
+
+class TimedQueuePool(_TimedCheckout, QueuePool):
+    pool_label = "sync"
+
+
+class TimedAsyncAdaptedQueuePool(_TimedCheckout, AsyncAdaptedQueuePool):
+    pool_label = "async"
+
+
+engine = create_engine(settings.database_url, pool_pre_ping=True, poolclass=TimedQueuePool)
 SessionLocal = sessionmaker(bind=engine, autoflush=False, autocommit=False, expire_on_commit=False)
+DB_POOL_CHECKED_OUT.set_function(engine.pool.checkedout, "sync")
 
 
 def get_db() -> Generator[Session, None, None]:
@@ -15,3 +40,27 @@ def get_db() -> Generator[Session, None, None]:
         yield db
     finally:
         db.close()
+
+
+_async_sessions: async_sessionmaker[AsyncSession] | None = None
+
+
+def get_async_sessionmaker() -> async_sessionmaker[AsyncSession]:
+    # Built on first use, so deployments that keep the sync read path never load an async driver.
+    global _async_sessions
+    if _async_sessions is None:
+        # postgresql+psycopg serves both engines; psycopg 3 picks its async connection here.
+        async_engine = create_async_engine(
+            settings.async_database_url or settings.database_url,
+            pool_pre_ping=True,
+            pool_size=settings.db_async_pool_size,
+            poolclass=TimedAsyncAdaptedQueuePool,
+        )
+        DB_POOL_CHECKED_OUT.set_function(async_engine.sync_engine.pool.checkedout, "async")
+        _async_sessions = async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
+    return _async_sessions
+
+
+async def get_async_db() -> AsyncGenerator[AsyncSession, None]:
+    async with get_async_sessionmaker()() as db:
+        yield db
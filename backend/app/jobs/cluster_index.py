@@ -0,0 +1,36 @@
+import logging
+import time
+
+from app.core.config import settings
+from app.core.metrics import observe_job
+from app.db.session import SessionLocal
+from app.services.clustering.shared_index import build_shared_index
+
+logger = logging.getLogger("pulsewire.cluster_index")
+
+
+@observe_job("cluster_index")
+def run_cluster_index_job() -> dict:
+    if not settings.cluster_index_path:
+        return {"built": False, "reason": "CLUSTER_INDEX_PATH is not set"}
+
+    with SessionLocal() as db:
+        count = build_shared_index(db, settings.cluster_index_path, settings.cluster_window_hours)
+    return {"built": True, "path": settings.cluster_index_path, "cluster_count": count}
+
+
+def refresh_cluster_index_if_owner() -> dict | None:
+    if not settings.cluster_index_owner:
+        return None
+    try:
+        return run_cluster_index_job()
+    except Exception:
+        logger.exception("cluster index refresh failed")
+        return {"built": False, "reason": "refresh failed"}
+
+
+if __name__ == "__main__":
+    interval = max(settings.cluster_index_max_age_seconds // 3, 5)
+    while True:
+        print(run_cluster_index_job(), flush=True)
+        time.sleep(interval)
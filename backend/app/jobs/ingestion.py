@@ -1,12 +1,111 @@
+import cProfile
+from pathlib import Path
+
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.metrics import observe_job
+from app.core.profiling import profile_path
+from app.db.models import IngestionRun
 from app.db.session import SessionLocal
-from app.services.pipeline import PipelineResult, run_ingestion_pipeline
+from app.jobs.cluster_index import refresh_cluster_index_if_owner
+from app.jobs.summarization import publish_dirty_clusters
+from app.services.pipeline import PipelineResult, enabled_sources_query, run_ingestion_pipeline
+from app.services.sharding import ShardAssignment, execution_shards, load_fetch_costs, shard_sources
+
+
+def _select_shard(source_types: list[str] | None, task_index: int, task_count: int, execution_id: str | None) -> ShardAssignment:
+    with SessionLocal() as db:
+        source_ids = [source.id for source in db.scalars(enabled_sources_query(source_types)).all()]
+        if execution_id is not None:
+            return execution_shards(db, execution_id, source_ids, task_count)[task_index]
+        costs = load_fetch_costs(db)
+    return shard_sources(source_ids, task_count, costs)[task_index]
+
+
+def _attach_profile(db: Session, run_id: str, path: Path) -> None:
+    run = db.get(IngestionRun, run_id)
+    if run is None:
+        return
+    run.stats_json = {**(run.stats_json or {}), "profile_path": str(path)}
+    db.commit()
 
 
-def run_ingestion_job(source_types: list[str] | None = None) -> dict:
+def _session_run_id(db: Session) -> str | None:
+    # A failed pipeline marks its run as failed and leaves it in the session.
+    return next((obj.id for obj in db if isinstance(obj, IngestionRun)), None)
+
+
+@observe_job("ingestion")
+def run_ingestion_job(
+    source_types: list[str] | None = None,
+    resume_run_id: str | None = None,
+    task_index: int = 0,
+    task_count: int = 1,
+    profile: bool | None = None,
+    execution_id: str | None = None,
+) -> dict:
+    shard: ShardAssignment | None = None
+    source_ids: list[str] | None = None
+    if task_count > 1 and resume_run_id is None:
+        shard = _select_shard(source_types, task_index, task_count, execution_id)
+        source_ids = shard.source_ids
+
+    summarize_inline = settings.summarization_mode == "inline"
+    profiler = cProfile.Profile() if (settings.profile_jobs if profile is None else profile) else None
+    profile_file: Path | None = None
     with SessionLocal() as db:
-        result: PipelineResult = run_ingestion_pipeline(db, source_types=source_types)
-        return {
-            "fetched_count": result.fetched_count,
-            "normalized_count": result.normalized_count,
-            "clustered_count": result.clustered_count,
+        if profiler is not None:
+            profiler.enable()
+        try:
+            result: PipelineResult = run_ingestion_pipeline(
+                db,
+                source_types=source_types,
+                summarize=summarize_inline,
+                resume_run_id=resume_run_id,
+                source_ids=source_ids,
+            )
+        except Exception:
+            if profiler is not None:
+                profiler.disable()
+                run_id = _session_run_id(db) or resume_run_id
+                label = run_id or (f"{execution_id}-{task_index}" if execution_id else None)
+                profile_file = profile_path(f"ingestion-{label}-failed" if label else "ingestion-failed", ".prof")
+                profiler.dump_stats(profile_file)
+                if run_id is not None:
+                    _attach_profile(db, run_id, profile_file)
+            raise
+
+        if profiler is not None:
+            profiler.disable()
+            profile_file = profile_path(f"ingestion-{result.run_id}", ".prof")
+            profiler.dump_stats(profile_file)
+            _attach_profile(db, result.run_id, profile_file)
+
+    summaries = {"queued": 0, "coalesced": 0, "inline": len(result.dirty_cluster_ids) if summarize_inline else 0}
+    if not summarize_inline:
+        summaries = publish_dirty_clusters(result.dirty_cluster_ids)
+
+    cluster_index = refresh_cluster_index_if_owner()
+
+    payload = {
+        "run_id": result.run_id,
+        "fetched_count": result.fetched_count,
+        "normalized_count": result.normalized_count,
+        "clustered_count": result.clustered_count,
+        "deduplicated_count": result.deduplicated_count,
+        "summaries": summaries,
+        "stats": result.stats,
+    }
+    if profile_file is not None:
+        payload["profile_path"] = str(profile_file)
+    if cluster_index is not None:
+        payload["cluster_index"] = cluster_index
+    if shard is not None:
+        payload["shard"] = {
+            "task_index": shard.task_index,
+            "task_count": shard.task_count,
+            "source_ids": shard.source_ids,
+            "estimated_cost_ms": round(shard.estimated_cost_ms, 1),
         }
+    return payload
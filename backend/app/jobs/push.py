@@ -0,0 +1,70 @@
+from datetime import datetime, timedelta, timezone
+
+from redis.exceptions import ConnectionError as RedisConnectionError
+from redis.exceptions import TimeoutError as RedisTimeoutError
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.metrics import observe_job
+from app.db.models import Source, StoryCluster
+from app.db.session import SessionLocal
+from app.jobs.summarization import publish_dirty_clusters
+from app.services.clustering.dedupe import DuplicateIndex
+from app.services.clustering.service import get_cluster_engine
+from app.services.ingestion.registry import get_connector
+from app.services.pipeline import ingest_normalized_batch
+from app.services.queue import get_queue
+from app.services.summarization.service import summarize_cluster
+from app.services.websub import renew_expiring
+
+
+def ingest_pushed_entries(db: Session, source_id: str, entries: list[dict]) -> dict:
+    source = db.get(Source, source_id)
+    if source is None:
+        return {"source_id": source_id, "created_count": 0}
+    connector = get_connector(source.source_type)
+    items = [(source, connector.normalize(source, entry), entry) for entry in entries if connector.validate(entry)]
+
+    duplicates = None
+    if settings.dedupe_enabled:
+        cutoff = datetime.now(timezone.utc) - timedelta(hours=settings.cluster_window_hours)
+        duplicates = DuplicateIndex.load(db, cutoff, settings.dedupe_simhash_radius)
+    result = ingest_normalized_batch(db, items, get_cluster_engine(), duplicates)
+    summarize_inline = settings.summarization_mode == "inline"
+    if summarize_inline:
+        for cluster_id in sorted(result.touched_cluster_ids):
+            cluster = db.get(StoryCluster, cluster_id)
+            if cluster is not None:
+                summarize_cluster(db, cluster)
+    db.commit()
+
+    summaries = None if summarize_inline else publish_dirty_clusters(sorted(result.touched_cluster_ids))
+    return {
+        "source_id": source_id,
+        "entries": len(entries),
+        "created_count": result.created_count,
+        "deduplicated_count": result.deduplicated_count,
+        "summaries": summaries,
+    }
+
+
+@observe_job("push-ingestion")
+def run_push_ingestion_job(source_id: str, entries: list[dict]) -> dict:
+    with SessionLocal() as db:
+        return ingest_pushed_entries(db, source_id, entries)
+
+
+def submit_push_ingestion(db: Session, source_id: str, entries: list[dict]) -> str:
+    try:
+        get_queue().enqueue(run_push_ingestion_job, source_id, entries)
+    except (RedisConnectionError, RedisTimeoutError):
+        # Queue unreachable: pushed entries are few, so ingest them in the request rather than drop them.
+        ingest_pushed_entries(db, source_id, entries)
+        return "inline"
+    return "queue"
+
+
+@observe_job("websub-renew")
+def run_websub_renew_job() -> dict:
+    with SessionLocal() as db:
+        return renew_expiring(db)
@@ -0,0 +1,47 @@
+from datetime import datetime, timezone
+
+from app.core.metrics import observe_job
+from app.core.redis_client import get_redis
+from app.db.session import SessionLocal
+from app.jobs.cluster_index import refresh_cluster_index_if_owner
+from app.jobs.summarization import publish_dirty_clusters
+from app.services.clustering.merge import default_merge_since, merge_fragmented_clusters
+
+LAST_PASS_KEY = "recluster:last_pass_at"
+
+
+def _last_pass_at() -> datetime | None:
+    try:
+        value = get_redis().get(LAST_PASS_KEY)
+        return datetime.fromisoformat(value) if value else None
+    except Exception:
+        return None
+
+
+def _record_pass(started_at: datetime) -> None:
+    try:
+        get_redis().set(LAST_PASS_KEY, started_at.isoformat())
+    except Exception:
+        return
+
+
+@observe_job("recluster")
+def run_recluster_job(full: bool = False) -> dict:
+    started_at = datetime.now(timezone.utc)
+    since = None if full else default_merge_since(_last_pass_at())
+
+    with SessionLocal() as db:
+        result = merge_fragmented_clusters(db, since=since)
+        db.commit()
+
+    _record_pass(started_at)
+    cluster_index = refresh_cluster_index_if_owner() if result.merged_count else None
+    summaries = publish_dirty_clusters(result.surviving_cluster_ids)
+    return {
+        "since": since.isoformat() if since else None,
+        "examined_count": result.examined_count,
+        "merged_count": result.merged_count,
+        "surviving_cluster_ids": result.surviving_cluster_ids,
+        "summaries": summaries,
+        "cluster_index": cluster_index,
+    }
@@ -0,0 +1,102 @@
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from uuid import uuid4
+
+from redis.exceptions import ConnectionError as RedisConnectionError
+from redis.exceptions import TimeoutError as RedisTimeoutError
+from rq import Callback
+
+from app.core.config import settings
+from app.core.redis_client import get_redis
+from app.jobs.ingestion import run_ingestion_job
+from app.services.queue import get_queue
+
+ACTIVE_JOB_STATUSES = {"queued", "deferred", "scheduled", "started"}
+REINGEST_KEY_PREFIX = "reingest:active:"
+# Delete the key only while it still points at the job we judged stale.
+_RELEASE_IF_EQUAL = "if redis.call('get', KEYS[1]) == ARGV[1] then return redis.call('del', KEYS[1]) end return 0"
+
+_fallback_guard = threading.Lock()
+_fallback_executor: ThreadPoolExecutor | None = None
+_fallback_jobs: dict[str, tuple[str, Future]] = {}
+
+
+class ReingestUnavailable(RuntimeError):
+    pass
+
+
+def reingest_key(source_types: list[str] | None) -> str:
+    scope = ",".join(sorted(set(source_types))) if source_types else "*"
+    return f"{REINGEST_KEY_PREFIX}{scope}"
+
+
+def release_reingest_key(job, connection, *args, **kwargs) -> None:
+    """RQ success/failure/stopped callback: frees the coalescing key as soon as the run ends."""
+    connection.eval(_RELEASE_IF_EQUAL, 1, reingest_key(job.kwargs.get("source_types")), job.id)
+
+
+def _submit_queued(source_types: list[str] | None, profile: bool) -> dict:
+    redis = get_redis()
+    queue = get_queue()
+    key = reingest_key(source_types)
+
+    for _ in range(3):
+        existing = redis.get(key)
+        if existing:
+            job = queue.fetch_job(existing)
+            if job is not None and job.get_status() in ACTIVE_JOB_STATUSES:
+                return {"job_id": existing, "coalesced": True, "mode": "queue"}
+            redis.eval(_RELEASE_IF_EQUAL, 1, key, existing)
+
+        job_id = f"ingest-{uuid4().hex}"
+        # No expiry: the job's callbacks delete the key, and a key left by a lost worker is released above.
+        if not redis.set(key, job_id, nx=True):
+            # Another request claimed the key between our read and write; attach to its job instead.
+            continue
+
+        try:
+            queue.enqueue(
+                run_ingestion_job,
+                source_types=source_types,
+                profile=profile or None,
+                job_id=job_id,
+                on_success=Callback(release_reingest_key),
+                on_failure=Callback(release_reingest_key),
+                on_stopped=Callback(release_reingest_key),
+            )
+        except Exception:
+            redis.eval(_RELEASE_IF_EQUAL, 1, key, job_id)
+            raise
+        return {"job_id": job_id, "coalesced": False, "mode": "queue"}
+
+    raise RuntimeError(f"Could not claim {key}")
+
+
+def _submit_local(source_types: list[str] | None, profile: bool) -> dict:
+    global _fallback_executor
+    key = reingest_key(source_types)
+
+    with _fallback_guard:
+        for pending_key, (_, future) in list(_fallback_jobs.items()):
+            if future.done():
+                del _fallback_jobs[pending_key]
+
+        if key in _fallback_jobs:
+            return {"job_id": _fallback_jobs[key][0], "coalesced": True, "mode": "local"}
+        if len(_fallback_jobs) >= settings.reingest_fallback_max_pending:
+            raise ReingestUnavailable("Queue unavailable and local ingestion backlog is full")
+
+        if _fallback_executor is None:
+            _fallback_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="reingest")
+        job_id = f"local-{uuid4().hex}"
+        future = _fallback_executor.submit(run_ingestion_job, source_types=source_types, profile=profile or None)
+        _fallback_jobs[key] = (job_id, future)
+        return {"job_id": job_id, "coalesced": False, "mode": "local"}
+
+
+def submit_reingest(source_types: list[str] | None = None, profile: bool = False) -> dict:
+    try:
+        return _submit_queued(source_types, profile)
+    except (RedisConnectionError, RedisTimeoutError):
+        # Queue unreachable: run in this process, one run at a time, instead of inside the request.
+        return _submit_local(source_types, profile)
@@ -0,0 +1,33 @@
+import asyncio
+import signal
+
+from app.core.config import settings
+from app.core.metrics import observe_job
+from app.db.session import SessionLocal
+from app.jobs.summarization import publish_dirty_clusters
+from app.services.ingestion.registry import get_streaming_connector
+from app.services.pipeline import enabled_sources_query
+from app.services.stream_runner import StreamRunner
+
+
+async def _run_until_signalled(runner: StreamRunner, streams: list) -> dict:
+    stop = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for signum in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(signum, stop.set)
+    stats = await runner.run(streams, stop)
+    return stats.to_json()
+
+
+@observe_job("stream")
+def run_stream_job(source_types: list[str] | None = None) -> dict:
+    """Streams every enabled source that has a streaming connector until SIGINT/SIGTERM, then drains the last batch."""
+    with SessionLocal() as db:
+        sources = db.scalars(enabled_sources_query(source_types)).all()
+    streams = [(source, connector) for source in sources if (connector := get_streaming_connector(source.source_type)) is not None]
+    if not streams:
+        return {"sources": 0}
+
+    publish = None if settings.summarization_mode == "inline" else publish_dirty_clusters
+    runner = StreamRunner(SessionLocal, publish=publish)
+    return {"sources": len(streams), **asyncio.run(_run_until_signalled(runner, streams))}
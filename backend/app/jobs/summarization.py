@@ -0,0 +1,78 @@
+from collections.abc import Iterable
+
+from redis.exceptions import ConnectionError as RedisConnectionError
+from redis.exceptions import TimeoutError as RedisTimeoutError
+from rq import Retry
+from rq.job import Dependency
+
+from app.core.config import settings
+from app.core.metrics import observe_job
+from app.db.models import StoryCluster
+from app.db.session import SessionLocal
+from app.services.queue import get_queue
+from app.services.summarization.service import summarize_cluster
+
+PENDING_JOB_STATUSES = {"queued", "deferred", "scheduled"}
+
+
+def summarization_job_id(cluster_id: str) -> str:
+    return f"summarize-{cluster_id}"
+
+
+def summarization_followup_job_id(cluster_id: str) -> str:
+    return f"summarize-{cluster_id}-followup"
+
+
+@observe_job("summarization")
+def run_summarization_job(cluster_id: str) -> dict:
+    with SessionLocal() as db:
+        cluster = db.get(StoryCluster, cluster_id)
+        if cluster is None:
+            return {"cluster_id": cluster_id, "summarized": False}
+
+        summary = summarize_cluster(db, cluster)
+        db.commit()
+        return {"cluster_id": cluster_id, "summarized": True, "summary_id": summary.id}
+
+
+def publish_dirty_clusters(cluster_ids: Iterable[str]) -> dict:
+    pending_ids = list(cluster_ids)
+    queued = 0
+    coalesced = 0
+    inline = 0
+
+    try:
+        queue = get_queue(settings.summarization_queue_name)
+        for cluster_id in pending_ids:
+            # A pending job reads the cluster's latest items when it runs, so one is enough.
+            slots = {}
+            for slot_id in (summarization_job_id(cluster_id), summarization_followup_job_id(cluster_id)):
+                job = queue.fetch_job(slot_id)
+                slots[slot_id] = job.get_status(refresh=False) if job is not None else None
+            if any(status in PENDING_JOB_STATUSES for status in slots.values()):
+                coalesced += 1
+                continue
+
+            # A started job may already have read the cluster, so it can't absorb this change. Queue
+            # behind it under the other id instead of overwriting its record; the two ids alternate,
+            # so at most one of them is ever running.
+            running_id = next((slot_id for slot_id, status in slots.items() if status == "started"), None)
+            job_id = next(slot_id for slot_id in slots if slot_id != running_id)
+            queue.enqueue(
+                run_summarization_job,
+                cluster_id,
+                job_id=job_id,
+                depends_on=Dependency(jobs=[running_id], allow_failure=True) if running_id is not None else None,
+                job_timeout=settings.summarization_job_timeout_seconds,
+                retry=Retry(max=settings.summarization_job_retries, interval=[10, 30, 60])
+                if settings.summarization_job_retries
+                else None,
+            )
+            queued += 1
+    except (RedisConnectionError, RedisTimeoutError):
+        # Queue unreachable: summarize the remaining clusters inline rather than dropping them.
+        for cluster_id in pending_ids[queued + coalesced :]:
+            run_summarization_job(cluster_id)
+            inline += 1
+
+    return {"queued": queued, "coalesced": coalesced, "inline": inline}
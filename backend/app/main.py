@@ -1,10 +1,17 @@
-from fastapi import FastAPI
+from time import perf_counter
+
+from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
 
 from app.api.routes_admin import router as admin_router
 from app.api.routes_health import router as health_router
 from app.api.routes_public import router as public_router
+from app.api.routes_public_async import router as async_public_router
+from app.api.routes_websub import router as websub_router
 from app.core.config import settings
+from app.core.metrics import HTTP_REQUEST_SECONDS
+from app.core.profiling import install_request_profiler
+from app.db.query_stats import track_queries
 from app.db.bootstrap import init_db, seed_categories, seed_sources
 from app.db.session import SessionLocal
 
@@ -19,6 +26,34 @@ app.add_middleware(
 )
 
 
+@app.middleware("http")
+async def observe_request(request: Request, call_next):
+    started = perf_counter()
+    status = 500
+    with track_queries() as queries:
+        try:
+            response = await call_next(request)
+            status = response.status_code
+        finally:
+            elapsed = perf_counter() - started
+            route = request.scope.get("route")
+            # Label by route template so story ids and slugs do not explode the series count.
+            if route is not None and route.path.startswith("/v1/"):
+                HTTP_REQUEST_SECONDS.labels(method=request.method, route=route.path, status=str(status)).observe(elapsed)
+
+    if settings.app_env != "production":
+        response.headers["X-DB-Queries"] = str(queries.count)
+        response.headers["Server-Timing"] = (
+            f'db;dur={queries.duration_ms:.1f};desc="{queries.count} queries", app;dur={elapsed * 1000:.1f}'
+        )
+    return response
+
+
+# Only installed when sampling is on, so a disabled profiler costs nothing per request.
+if settings.profile_request_rate > 0:
+    install_request_profiler(app)
+
+
 @app.on_event("startup")
 def startup_event() -> None:
     init_db()
@@ -28,5 +63,6 @@ def startup_event() -> None:
 
 
 app.include_router(health_router)
-app.include_router(public_router)
+app.include_router(async_public_router if settings.api_async_reads else public_router)
 app.include_router(admin_router)
+app.include_router(websub_router)
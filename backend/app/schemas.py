@@ -41,8 +41,37 @@ class CategoriesResponse(BaseModel):
 
 class ReingestRequest(BaseModel):
     source_types: list[str] | None = None
+    profile: bool = False
 
 
 class ReingestResponse(BaseModel):
     queued: bool
     message: str
+    job_id: str | None = None
+    coalesced: bool = False
+
+
+class SourceHealthItem(BaseModel):
+    source_id: str
+    source_type: str
+    name: str
+    enabled: bool
+    state: str
+    consecutive_failures: int
+    latency_ewma_ms: float | None = None
+    last_error: str | None = None
+    last_success_at: datetime | None = None
+    last_failure_at: datetime | None = None
+    retry_at: datetime | None = None
+
+
+class SourceHealthResponse(BaseModel):
+    items: list[SourceHealthItem]
+
+
+class WebSubSubscriptionResponse(BaseModel):
+    source_id: str
+    state: str
+    hub_url: str
+    topic_url: str
+    expires_at: datetime | None = None
@@ -1,6 +1,7 @@
 import json
 
-from app.core.redis_client import get_redis
+from app.core.metrics import CACHE_REQUESTS
+from app.core.redis_client import get_async_redis, get_redis
 
 
 def get_cache_json(key: str) -> dict | None:
@@ -8,10 +9,14 @@ def get_cache_json(key: str) -> dict | None:
         redis = get_redis()
         payload = redis.get(key)
         if not payload:
+            CACHE_REQUESTS.labels(operation="get", result="miss").inc()
             return None
-        return json.loads(payload)
+        value = json.loads(payload)
     except Exception:
+        CACHE_REQUESTS.labels(operation="get", result="error").inc()
         return None
+    CACHE_REQUESTS.labels(operation="get", result="hit").inc()
+    return value
 
 
 def set_cache_json(key: str, value: dict, ttl_seconds: int) -> None:
@@ -19,4 +24,29 @@ def set_cache_json(key: str, value: dict, ttl_seconds: int) -> None:
         redis = get_redis()
         redis.setex(key, ttl_seconds, json.dumps(value, default=str))
     except Exception:
+        CACHE_REQUESTS.labels(operation="set", result="error").inc()
         return
+    CACHE_REQUESTS.labels(operation="set", result="ok").inc()
+
+
+async def get_cache_json_async(key: str) -> dict | None:
+    try:
+        payload = await get_async_redis().get(key)
+        if not payload:
+            CACHE_REQUESTS.labels(operation="get", result="miss").inc()
+            return None
+        value = json.loads(payload)
+    except Exception:
+        CACHE_REQUESTS.labels(operation="get", result="error").inc()
+        return None
+    CACHE_REQUESTS.labels(operation="get", result="hit").inc()
+    return value
+
+
+async def set_cache_json_async(key: str, value: dict, ttl_seconds: int) -> None:
+    try:
+        await get_async_redis().setex(key, ttl_seconds, json.dumps(value, default=str))
+    except Exception:
+        CACHE_REQUESTS.labels(operation="set", result="error").inc()
+        return
+    CACHE_REQUESTS.labels(operation="set", result="ok").inc()
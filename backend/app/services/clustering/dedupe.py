@@ -0,0 +1,115 @@
+from __future__ import annotations
+
+from collections import Counter
+from dataclasses import dataclass
+from datetime import datetime
+from hashlib import blake2b
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app.db.models import ClusterItem, SourceItem
+from app.services.clustering.clusterer import TOKEN_PATTERN
+
+FINGERPRINT_BITS = 64
+_SIGN_BIT = 1 << (FINGERPRINT_BITS - 1)
+_MASK = (1 << FINGERPRINT_BITS) - 1
+
+
+def _token_hash(token: str) -> int:
+    return int.from_bytes(blake2b(token.encode("utf-8"), digest_size=8).digest(), "big")
+
+
+def simhash(text: str) -> int:
+    weights = [0] * FINGERPRINT_BITS
+    for token, count in Counter(token.lower() for token in TOKEN_PATTERN.findall(text)).items():
+        hashed = _token_hash(token)
+        for bit in range(FINGERPRINT_BITS):
+            weights[bit] += count if hashed >> bit & 1 else -count
+
+    fingerprint = 0
+    for bit, weight in enumerate(weights):
+        if weight > 0:
+            fingerprint |= 1 << bit
+    return fingerprint
+
+
+def hamming_distance(left: int, right: int) -> int:
+    return ((left ^ right) & _MASK).bit_count()
+
+
+def to_signed64(fingerprint: int) -> int:
+    return fingerprint - (1 << FINGERPRINT_BITS) if fingerprint & _SIGN_BIT else fingerprint
+
+
+def from_signed64(value: int) -> int:
+    return value & _MASK
+
+
+def item_fingerprint(title: str, body: str, min_tokens: int) -> int | None:
+    text = f"{title} {body}"
+    if len(TOKEN_PATTERN.findall(text)) < min_tokens:
+        return None
+    return to_signed64(simhash(text))
+
+
+@dataclass(slots=True)
+class DuplicateMatch:
+    cluster_id: str
+    kind: str
+    distance: int = 0
+
+
+class DuplicateIndex:
+    """Per-run lookup of items already clustered in the active window.
+
+    Exact matches use ``dedupe_key``. Near-duplicates use SimHash with the fingerprint split
+    into ``radius + 1`` bands: any fingerprint within the Hamming radius shares at least one
+    band exactly, so only bucket-mates need a full distance check.
+    """
+
+    def __init__(self, radius: int) -> None:
+        self.radius = radius
+        self.band_count = radius + 1
+        self.band_width = -(-FINGERPRINT_BITS // self.band_count)
+        self._by_key: dict[str, str] = {}
+        self._bands: dict[tuple[int, int], list[tuple[int, str]]] = {}
+
+    @classmethod
+    def load(cls, db: Session, cutoff: datetime, radius: int) -> DuplicateIndex:
+        index = cls(radius)
+        rows = db.execute(
+            select(SourceItem.dedupe_key, SourceItem.simhash, ClusterItem.cluster_id)
+            .join(ClusterItem, ClusterItem.source_item_id == SourceItem.id)
+            .where(SourceItem.published_at >= cutoff)
+        ).all()
+        for dedupe_key, fingerprint, cluster_id in rows:
+            index.add(dedupe_key, fingerprint, cluster_id)
+        return index
+
+    def _band_keys(self, fingerprint: int) -> list[tuple[int, int]]:
+        unsigned = from_signed64(fingerprint)
+        band_mask = (1 << self.band_width) - 1
+        return [(band, unsigned >> (band * self.band_width) & band_mask) for band in range(self.band_count)]
+
+    def add(self, dedupe_key: str, fingerprint: int | None, cluster_id: str) -> None:
+        self._by_key.setdefault(dedupe_key, cluster_id)
+        if fingerprint is None:
+            return
+        for band_key in self._band_keys(fingerprint):
+            self._bands.setdefault(band_key, []).append((fingerprint, cluster_id))
+
+    def match(self, dedupe_key: str, fingerprint: int | None) -> DuplicateMatch | None:
+        cluster_id = self._by_key.get(dedupe_key)
+        if cluster_id is not None:
+            return DuplicateMatch(cluster_id=cluster_id, kind="exact")
+        if fingerprint is None:
+            return None
+
+        best: DuplicateMatch | None = None
+        for band_key in self._band_keys(fingerprint):
+            for candidate, candidate_cluster_id in self._bands.get(band_key, []):
+                distance = hamming_distance(fingerprint, candidate)
+                if distance <= self.radius and (best is None or distance < best.distance):
+                    best = DuplicateMatch(cluster_id=candidate_cluster_id, kind="simhash", distance=distance)
+        return best
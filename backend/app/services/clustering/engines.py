@@ -0,0 +1,48 @@
+from __future__ import annotations
+
+from abc import ABC, abstractmethod
+from dataclasses import dataclass, field
+from datetime import datetime
+
+from app.services.clustering.clusterer import cluster_similarity
+
+
+@dataclass(slots=True)
+class ClusterCandidate:
+    cluster_id: str
+    headline: str
+    last_updated_at: datetime
+    member_texts: list[str] = field(default_factory=list)
+
+
+class ClusterEngine(ABC):
+    engine_name: str
+    uses_member_texts: bool = False
+
+    @abstractmethod
+    def score(self, item_text: str, item_time: datetime, candidates: list[ClusterCandidate]) -> list[float]:
+        raise NotImplementedError
+
+    def score_matrix(
+        self, item_texts: list[str], item_times: list[datetime], candidates: list[ClusterCandidate]
+    ) -> list[list[float]]:
+        return [self.score(text, time, candidates) for text, time in zip(item_texts, item_times)]
+
+    def score_peers(self, item_texts: list[str], item_times: list[datetime]) -> list[list[float]]:
+        """Scores a batch's items against each other, for grouping the ones no existing cluster took."""
+        peers = [
+            ClusterCandidate(cluster_id=str(index), headline=text, last_updated_at=time)
+            for index, (text, time) in enumerate(zip(item_texts, item_times))
+        ]
+        return self.score_matrix(item_texts, item_times, peers)
+
+
+class JaccardEngine(ClusterEngine):
+    engine_name = "jaccard"
+
+    def score(self, item_text: str, item_time: datetime, candidates: list[ClusterCandidate]) -> list[float]:
+        return [
+            cluster_similarity(item_text, candidate.headline, item_time, candidate.last_updated_at)
+            for candidate in candidates
+        ]
+
@@ -0,0 +1,109 @@
+from __future__ import annotations
+
+import random
+import threading
+import time
+from collections.abc import Callable, Iterable
+from hashlib import blake2b
+
+from sqlalchemy import event, func, select
+from sqlalchemy.orm import Session, SessionTransaction
+
+from app.core.config import settings
+from app.core.redis_client import get_redis
+
+# Lock order, to stay deadlock-free across workers: CREATE_LOCK first (only when new clusters may be
+# created), then per-cluster locks in sorted order. Every lock is held until the transaction ends, so
+# rows written under a lock are committed before anyone else can take it. CREATE_LOCK requested while
+# cluster locks are already held is only tried once; callers roll back and retry the whole chunk.
+CREATE_LOCK = "clustering:create"
+_HELD_KEY = "cluster_locks"
+
+_local_locks: dict[str, threading.Lock] = {}
+_local_guard = threading.Lock()
+
+
+class ClusterLockTimeout(RuntimeError):
+    pass
+
+
+def cluster_lock_name(cluster_id: str) -> str:
+    return f"clustering:cluster:{cluster_id}"
+
+
+def advisory_key(name: str) -> int:
+    return int.from_bytes(blake2b(name.encode("utf-8"), digest_size=8).digest(), "big", signed=True)
+
+
+def _backend(db: Session) -> str:
+    backend = settings.cluster_lock_backend
+    if backend != "auto":
+        return backend
+    return "advisory" if db.get_bind().dialect.name == "postgresql" else "local"
+
+
+def _try_advisory(db: Session, name: str) -> Callable[[], None] | None:
+    acquired = db.scalar(select(func.pg_try_advisory_xact_lock(advisory_key(name))))
+    # Transaction-scoped: Postgres releases it on commit or rollback.
+    return (lambda: None) if acquired else None
+
+
+def _try_local(db: Session, name: str) -> Callable[[], None] | None:
+    with _local_guard:
+        lock = _local_locks.setdefault(name, threading.Lock())
+    return lock.release if lock.acquire(blocking=False) else None
+
+
+def _try_redis(db: Session, name: str) -> Callable[[], None] | None:
+    lock = get_redis().lock(name, timeout=settings.cluster_lock_lease_seconds)
+    if not lock.acquire(blocking=False):
+        return None
+
+    def release() -> None:
+        try:
+            lock.release()
+        except Exception:
+            return
+
+    return release
+
+
+_BACKENDS: dict[str, Callable[[Session, str], Callable[[], None] | None]] = {
+    "advisory": _try_advisory,
+    "local": _try_local,
+    "redis": _try_redis,
+}
+
+
+def acquire_cluster_locks(db: Session, names: Iterable[str]) -> None:
+    backend = _backend(db)
+    if backend == "none":
+        return
+
+    # Locks live as long as the transaction, so make sure there is one to end.
+    db.connection()
+    held: dict[str, Callable[[], None]] = db.info.setdefault(_HELD_KEY, {})
+    holds_cluster_locks = any(name != CREATE_LOCK for name in held)
+    for name in sorted(set(names) - set(held), key=lambda name: (name != CREATE_LOCK, name)):
+        # Waiting for the create lock behind cluster locks could deadlock against a worker holding it.
+        out_of_order = name == CREATE_LOCK and holds_cluster_locks
+        deadline = time.monotonic() + (0 if out_of_order else settings.cluster_lock_timeout_seconds)
+        delay = 0.005
+        while True:
+            release = _BACKENDS[backend](db, name)
+            if release is not None:
+                held[name] = release
+                break
+            if time.monotonic() >= deadline:
+                raise ClusterLockTimeout(f"Timed out waiting for {name}")
+            time.sleep(delay + random.uniform(0, delay))
+            delay = min(delay * 2, 0.2)
+
+
+@event.listens_for(Session, "after_transaction_end")
+def _release_cluster_locks(session: Session, transaction: SessionTransaction) -> None:
+    if transaction.parent is not None:
+        return
+    held = session.info.pop(_HELD_KEY, None)
+    for release in (held or {}).values():
+        release()
@@ -0,0 +1,116 @@
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import delete, func, select, update
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.db.models import ClusterItem, StoryCluster
+from app.services.clustering.engines import ClusterEngine
+from app.services.clustering.locks import CREATE_LOCK, acquire_cluster_locks, cluster_lock_name
+from app.services.clustering.service import (
+    connected_components,
+    get_cluster_engine,
+    load_candidate_clusters,
+    refresh_cluster_aggregates,
+)
+
+
+@dataclass(slots=True)
+class MergeResult:
+    examined_count: int
+    merged_count: int
+    surviving_cluster_ids: list[str] = field(default_factory=list)
+
+
+def _merge_into(db: Session, survivor: StoryCluster, absorbed_ids: list[str]) -> None:
+    survivor_item_ids = select(ClusterItem.source_item_id).where(ClusterItem.cluster_id == survivor.id)
+    # An item can sit in several absorbed clusters; keep one link each so the move can't collide on the survivor.
+    kept_link_ids = (
+        select(func.min(ClusterItem.id)).where(ClusterItem.cluster_id.in_(absorbed_ids)).group_by(ClusterItem.source_item_id)
+    )
+    db.execute(
+        delete(ClusterItem)
+        .where(ClusterItem.cluster_id.in_(absorbed_ids), ClusterItem.id.not_in(kept_link_ids))
+        .execution_options(synchronize_session=False)
+    )
+    db.execute(
+        update(ClusterItem)
+        .where(ClusterItem.cluster_id.in_(absorbed_ids), ClusterItem.source_item_id.not_in(survivor_item_ids))
+        .values(cluster_id=survivor.id, is_primary=False)
+        .execution_options(synchronize_session=False)
+    )
+    # Whatever is left links items the survivor already holds.
+    db.execute(delete(ClusterItem).where(ClusterItem.cluster_id.in_(absorbed_ids)).execution_options(synchronize_session=False))
+    db.execute(delete(StoryCluster).where(StoryCluster.id.in_(absorbed_ids)).execution_options(synchronize_session=False))
+    refresh_cluster_aggregates(db, survivor)
+
+
+def merge_fragmented_clusters(
+    db: Session,
+    since: datetime | None = None,
+    engine: ClusterEngine | None = None,
+    threshold: float | None = None,
+) -> MergeResult:
+    engine = engine or get_cluster_engine()
+    threshold = settings.cluster_merge_threshold if threshold is None else threshold
+
+    candidates = load_candidate_clusters(db, engine, limit=None)
+    if since is None:
+        dirty_ids = {candidate.cluster_id for candidate in candidates}
+    else:
+        dirty_ids = set(
+            db.scalars(
+                select(StoryCluster.id).where(
+                    StoryCluster.id.in_([candidate.cluster_id for candidate in candidates]), StoryCluster.updated_at >= since
+                )
+            ).all()
+        )
+    dirty = [candidate for candidate in candidates if candidate.cluster_id in dirty_ids]
+    if not dirty:
+        return MergeResult(examined_count=0, merged_count=0)
+
+    position = {candidate.cluster_id: index for index, candidate in enumerate(candidates)}
+    texts = [" ".join([candidate.headline, *candidate.member_texts]) for candidate in dirty]
+    scores = engine.score_matrix(texts, [candidate.last_updated_at for candidate in dirty], candidates)
+
+    edges = [
+        (position[candidate.cluster_id], other)
+        for row, candidate in zip(scores, dirty)
+        for other, score in enumerate(row)
+        if other != position[candidate.cluster_id] and score >= threshold
+    ]
+
+    components = [component for component in connected_components(len(candidates), edges) if len(component) >= 2]
+    if components:
+        # Same order as ingestion workers: the create lock, then every cluster involved, sorted.
+        acquire_cluster_locks(db, [CREATE_LOCK])
+        acquire_cluster_locks(
+            db, [cluster_lock_name(candidates[index].cluster_id) for component in components for index in component]
+        )
+
+    merged_count = 0
+    surviving_ids: list[str] = []
+    for component in components:
+        clusters = [db.get(StoryCluster, candidates[index].cluster_id) for index in component]
+        clusters = sorted((cluster for cluster in clusters if cluster is not None), key=lambda row: (row.first_seen_at, row.id))
+        if len(clusters) < 2:
+            continue
+        survivor, absorbed = clusters[0], clusters[1:]
+        for cluster in absorbed:
+            db.expunge(cluster)
+        _merge_into(db, survivor, [cluster.id for cluster in absorbed])
+        merged_count += len(absorbed)
+        surviving_ids.append(survivor.id)
+
+    db.flush()
+    return MergeResult(examined_count=len(dirty), merged_count=merged_count, surviving_cluster_ids=sorted(surviving_ids))
+
+
+def default_merge_since(last_pass_at: datetime | None) -> datetime | None:
+    if last_pass_at is None:
+        return None
+    # Overlap passes slightly so clusters updated while the previous pass ran are not skipped.
+    return last_pass_at.astimezone(timezone.utc) - timedelta(minutes=1)
@@ -8,7 +8,12 @@ from sqlalchemy.orm import Session
 
 from app.core.config import settings
 from app.db.models import Category, ClusterItem, Source, SourceItem, StoryCluster
-from app.services.clustering.clusterer import cluster_similarity
+from app.services.clustering.engines import ClusterCandidate, ClusterEngine, JaccardEngine
+from app.services.clustering.locks import CREATE_LOCK, acquire_cluster_locks, cluster_lock_name
+from app.services.clustering.shared_index import SharedClusterIndex
+from app.services.clustering.tfidf import TfidfEngine
+
+CANDIDATE_LIMIT = 100
 
 
 def _slugify(title: str) -> str:
@@ -33,69 +38,271 @@ def _resolve_primary_category_id(db: Session, item: SourceItem) -> str | None:
     return None
 
 
-def assign_item_to_cluster(db: Session, item: SourceItem) -> StoryCluster:
-    cutoff = datetime.now(timezone.utc) - timedelta(hours=settings.cluster_window_hours)
+def get_cluster_engine() -> ClusterEngine:
+    if settings.cluster_engine == "tfidf":
+        return TfidfEngine(n_features=settings.cluster_tfidf_features)
+    return JaccardEngine()
+
 
-    candidate_clusters = db.scalars(
-        select(StoryCluster).where(StoryCluster.last_updated_at >= cutoff).order_by(desc(StoryCluster.last_updated_at)).limit(100)
+def _query_candidates(db: Session, engine: ClusterEngine, *criteria, limit: int | None = None) -> list[ClusterCandidate]:
+    rows = db.execute(
+        select(StoryCluster.id, StoryCluster.headline, StoryCluster.last_updated_at)
+        .where(*criteria)
+        .order_by(desc(StoryCluster.last_updated_at), StoryCluster.id)
+        .limit(limit)
     ).all()
+    candidates = [ClusterCandidate(cluster_id=row.id, headline=row.headline, last_updated_at=row.last_updated_at) for row in rows]
 
-    item_text = f"{item.title} {item.body}"
-    chosen: StoryCluster | None = None
-    chosen_score = 0.0
+    if engine.uses_member_texts and candidates:
+        by_id = {candidate.cluster_id: candidate for candidate in candidates}
+        member_rows = db.execute(
+            select(ClusterItem.cluster_id, SourceItem.title)
+            .join(SourceItem, SourceItem.id == ClusterItem.source_item_id)
+            .where(ClusterItem.cluster_id.in_(by_id))
+        ).all()
+        for cluster_id, title in member_rows:
+            by_id[cluster_id].member_texts.append(title)
 
-    for cluster in candidate_clusters:
-        cluster_text = cluster.headline
-        score = cluster_similarity(item_text, cluster_text, item.published_at, cluster.last_updated_at)
-        if score > chosen_score and score >= settings.cluster_similarity_threshold:
-            chosen = cluster
-            chosen_score = score
+    return candidates
+
+
+_shared_index: SharedClusterIndex | None = None
+
+
+def get_shared_index() -> SharedClusterIndex | None:
+    global _shared_index
+    if not settings.cluster_index_path:
+        return None
+    if _shared_index is None or str(_shared_index.path) != settings.cluster_index_path:
+        _shared_index = SharedClusterIndex(settings.cluster_index_path)
+    return _shared_index
+
+
+def _active_cutoff() -> datetime:
+    return datetime.now(timezone.utc) - timedelta(hours=settings.cluster_window_hours)
+
+
+def load_candidate_clusters(db: Session, engine: ClusterEngine, limit: int | None = CANDIDATE_LIMIT) -> list[ClusterCandidate]:
+    cutoff = _active_cutoff()
+    shared = get_shared_index()
+    if shared is None or not shared.is_fresh(settings.cluster_index_max_age_seconds):
+        return _query_candidates(db, engine, StoryCluster.last_updated_at >= cutoff, limit=limit)
+
+    # The mapped index covers everything committed before its build; clusters stamped since the oldest
+    # transaction open during the build come from Postgres.
+    changed = _query_candidates(
+        db, engine, StoryCluster.last_updated_at >= cutoff, StoryCluster.updated_at >= shared.changed_since
+    )
+    # Clusters only move forward in time, so the newest `limit` records cover every one that can make the cut.
+    by_id = {candidate.cluster_id: candidate for candidate in shared.candidates(cutoff, limit)}
+    by_id.update({candidate.cluster_id: candidate for candidate in changed})
+    candidates = sorted(by_id.values(), key=lambda candidate: (-candidate.last_updated_at.timestamp(), candidate.cluster_id))
+    return candidates[:limit] if limit is not None else candidates
+
+
+def _unseen_candidates(db: Session, engine: ClusterEngine, seen: list[ClusterCandidate]) -> list[ClusterCandidate]:
+    # Called with the create lock held: clusters other workers committed after our scan are visible now.
+    seen_ids = {candidate.cluster_id for candidate in seen}
+    fresh = _query_candidates(db, engine, StoryCluster.last_updated_at >= _active_cutoff(), limit=CANDIDATE_LIMIT)
+    return [candidate for candidate in fresh if candidate.cluster_id not in seen_ids]
+
+
+def _existing_cluster_ids(db: Session, cluster_ids: set[str]) -> set[str]:
+    if not cluster_ids:
+        return set()
+    return set(db.scalars(select(StoryCluster.id).where(StoryCluster.id.in_(cluster_ids))).all())
+
+
+def _best_match(scores: list[float], candidates: list[ClusterCandidate]) -> tuple[str, float] | None:
+    best = max(range(len(candidates)), key=scores.__getitem__, default=None)
+    if best is None or scores[best] < settings.cluster_similarity_threshold:
+        return None
+    return candidates[best].cluster_id, scores[best]
+
+
+def _new_cluster(db: Session, item: SourceItem) -> StoryCluster:
+    cluster = StoryCluster(
+        slug=_slugify(item.title),
+        headline=item.title,
+        short_headline=item.title[:120],
+        primary_category_id=_resolve_primary_category_id(db, item),
+        status="breaking",
+        representative_item_id=item.id,
+        first_seen_at=item.published_at,
+        last_updated_at=item.published_at,
+        item_count=0,
+        source_count=0,
+        ranking_score=0.0,
+    )
+    db.add(cluster)
+    db.flush()
+    return cluster
 
-    if chosen is None:
-        chosen = StoryCluster(
-            slug=_slugify(item.title),
-            headline=item.title,
-            short_headline=item.title[:120],
-            primary_category_id=_resolve_primary_category_id(db, item),
-            status="breaking",
-            representative_item_id=item.id,
-            first_seen_at=item.published_at,
-            last_updated_at=item.published_at,
-            item_count=0,
-            source_count=0,
-            ranking_score=0.0,
-        )
-        db.add(chosen)
-        db.flush()
 
-    existing_link = db.scalar(
-        select(ClusterItem).where(ClusterItem.cluster_id == chosen.id, ClusterItem.source_item_id == item.id)
+def attach_items_to_cluster(db: Session, cluster: StoryCluster, scored_items: list[tuple[SourceItem, float]]) -> StoryCluster:
+    # Aggregates are recomputed from committed links, so holding the cluster lock until commit keeps them exact.
+    acquire_cluster_locks(db, [cluster_lock_name(cluster.id)])
+    item_ids = [item.id for item, _ in scored_items]
+    linked_ids = set(
+        db.scalars(
+            select(ClusterItem.source_item_id).where(ClusterItem.cluster_id == cluster.id, ClusterItem.source_item_id.in_(item_ids))
+        ).all()
     )
 
-    if not existing_link:
+    for item, relevance_score in scored_items:
+        if item.id in linked_ids:
+            continue
         db.add(
             ClusterItem(
-                cluster_id=chosen.id,
+                cluster_id=cluster.id,
                 source_item_id=item.id,
-                relevance_score=chosen_score or 1.0,
-                is_primary=chosen.representative_item_id == item.id,
+                relevance_score=relevance_score,
+                is_primary=cluster.representative_item_id == item.id,
             )
         )
-        db.flush()
+        linked_ids.add(item.id)
+    db.flush()
 
-    cluster_items = db.scalars(select(ClusterItem).where(ClusterItem.cluster_id == chosen.id)).all()
+    if cluster.primary_category_id is None:
+        cluster.primary_category_id = _resolve_primary_category_id(db, scored_items[0][0])
+
+    return refresh_cluster_aggregates(db, cluster)
+
+
+def refresh_cluster_aggregates(db: Session, cluster: StoryCluster) -> StoryCluster:
+    cluster_items = db.scalars(select(ClusterItem).where(ClusterItem.cluster_id == cluster.id)).all()
     source_item_ids = [link.source_item_id for link in cluster_items]
 
     related_items = db.scalars(select(SourceItem).where(SourceItem.id.in_(source_item_ids))).all() if source_item_ids else []
     sources = {row.source_id for row in related_items}
 
-    if chosen.primary_category_id is None:
-        chosen.primary_category_id = _resolve_primary_category_id(db, item)
+    cluster.item_count = len(cluster_items)
+    cluster.source_count = len(sources)
+    if related_items:
+        cluster.first_seen_at = min([cluster.first_seen_at] + [row.published_at for row in related_items])
+        cluster.last_updated_at = max(row.published_at for row in related_items)
+    cluster.status = "breaking" if cluster.item_count <= 3 else "developing"
+    cluster.ranking_score = _ranking_score(cluster)
+
+    return cluster
+
+
+def attach_item_to_cluster(db: Session, cluster: StoryCluster, item: SourceItem, relevance_score: float = 1.0) -> StoryCluster:
+    return attach_items_to_cluster(db, cluster, [(item, relevance_score)])
+
+
+def assign_item_to_cluster(db: Session, item: SourceItem, engine: ClusterEngine | None = None) -> StoryCluster:
+    engine = engine or get_cluster_engine()
+    text = f"{item.title} {item.body}"
+    candidates = load_candidate_clusters(db, engine)
+    match = _best_match(engine.score(text, item.published_at, candidates), candidates)
+
+    chosen: StoryCluster | None = None
+    if match is not None:
+        acquire_cluster_locks(db, [cluster_lock_name(match[0])])
+        if _existing_cluster_ids(db, {match[0]}):
+            chosen = db.get(StoryCluster, match[0])
+
+    if chosen is None:
+        # Behind the cluster lock when the match vanished: tried once rather than waited for.
+        acquire_cluster_locks(db, [CREATE_LOCK])
+        fresh = _unseen_candidates(db, engine, candidates)
+        match = _best_match(engine.score(text, item.published_at, fresh), fresh) if fresh else None
+        chosen = db.get(StoryCluster, match[0]) if match is not None else _new_cluster(db, item)
+
+    return attach_item_to_cluster(db, chosen, item, match[1] if match is not None else 1.0)
+
+
+def connected_components(size: int, edges: list[tuple[int, int]]) -> list[list[int]]:
+    parent = list(range(size))
+
+    def find(node: int) -> int:
+        while parent[node] != node:
+            parent[node] = parent[parent[node]]
+            node = parent[node]
+        return node
+
+    for left, right in edges:
+        left_root, right_root = find(left), find(right)
+        if left_root != right_root:
+            parent[max(left_root, right_root)] = min(left_root, right_root)
+
+    components: dict[int, list[int]] = {}
+    for node in range(size):
+        components.setdefault(find(node), []).append(node)
+    return list(components.values())
+
+
+def assign_items_to_clusters(
+    db: Session, items: list[SourceItem], engine: ClusterEngine | None = None, pinned: dict[str, str] | None = None
+) -> list[StoryCluster]:
+    if not items:
+        return []
+
+    engine = engine or get_cluster_engine()
+    pinned = pinned or {}
+    threshold = settings.cluster_similarity_threshold
+    # Oldest first so component seeds (and therefore new cluster headlines) are deterministic.
+    ordered = sorted({item.id: item for item in items}.values(), key=lambda row: (row.published_at, row.id))
+    texts = [f"{item.title} {item.body}" for item in ordered]
+    times = [item.published_at for item in ordered]
+
+    matches: list[tuple[str, float] | None] = [
+        (pinned[item.id], 1.0) if item.id in pinned else None for item in ordered
+    ]
+    scored = [position for position, item in enumerate(ordered) if item.id not in pinned]
+    candidates = load_candidate_clusters(db, engine) if scored else []
+    for position, scores in zip(scored, engine.score_matrix([texts[p] for p in scored], [times[p] for p in scored], candidates)):
+        matches[position] = _best_match(scores, candidates)
+
+    # Lock order: the create lock (only when new clusters may be needed), then matched clusters sorted by id.
+    unmatched = [position for position, match in enumerate(matches) if match is None]
+    if unmatched:
+        acquire_cluster_locks(db, [CREATE_LOCK])
+        fresh = _unseen_candidates(db, engine, candidates)
+        if fresh:
+            rescored = engine.score_matrix([texts[p] for p in unmatched], [times[p] for p in unmatched], fresh)
+            for position, scores in zip(unmatched, rescored):
+                matches[position] = _best_match(scores, fresh)
+
+    targets = {match[0] for match in matches if match is not None}
+    acquire_cluster_locks(db, [cluster_lock_name(cluster_id) for cluster_id in targets])
+    # The shared index, or a recluster pass that finished before we locked, can name clusters that are gone.
+    existing = _existing_cluster_ids(db, targets)
+    matches = [match if match is not None and match[0] in existing else None for match in matches]
+
+    scored_by_cluster: dict[str, list[tuple[SourceItem, float]]] = {}
+    for position, match in enumerate(matches):
+        if match is not None:
+            scored_by_cluster.setdefault(match[0], []).append((ordered[position], match[1]))
+
+    clusters: dict[str, StoryCluster] = {}
+    unmatched = [position for position, match in enumerate(matches) if match is None]
+    if unmatched:
+        # Normally already held; after a lost merge race it comes after cluster locks and is only tried once.
+        acquire_cluster_locks(db, [CREATE_LOCK])
+        item_item_scores = engine.score_peers([texts[position] for position in unmatched], [times[position] for position in unmatched])
+        edges = [
+            (left, right)
+            for left in range(len(unmatched))
+            for right in range(left + 1, len(unmatched))
+            if max(item_item_scores[left][right], item_item_scores[right][left]) >= threshold
+        ]
+        for component in connected_components(len(unmatched), edges):
+            seed_index = component[0]
+            seed = ordered[unmatched[seed_index]]
+            cluster = _new_cluster(db, seed)
+            clusters[cluster.id] = cluster
+            scored_by_cluster[cluster.id] = [
+                (ordered[unmatched[member]], 1.0 if member == seed_index else item_item_scores[member][seed_index])
+                for member in component
+            ]
 
-    chosen.item_count = len(cluster_items)
-    chosen.source_count = len(sources)
-    chosen.last_updated_at = max([item.published_at] + [row.published_at for row in related_items])
-    chosen.status = "breaking" if chosen.item_count <= 3 else "developing"
-    chosen.ranking_score = _ranking_score(chosen)
+    assigned: dict[str, StoryCluster] = {}
+    for cluster_id, scored_items in scored_by_cluster.items():
+        cluster = clusters.get(cluster_id) or db.get(StoryCluster, cluster_id)
+        attach_items_to_cluster(db, cluster, scored_items)
+        for item, _ in scored_items:
+            assigned[item.id] = cluster
 
-    return chosen
+    return [assigned[item.id] for item in items]
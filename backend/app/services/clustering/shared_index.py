@@ -0,0 +1,172 @@
+from __future__ import annotations
+
+import os
+import tempfile
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+import numpy as np
+from sqlalchemy import desc, select, text
+from sqlalchemy.orm import Session
+
+from app.db.models import ClusterItem, SourceItem, StoryCluster
+from app.services.clustering.engines import ClusterCandidate
+
+MAGIC = b"PWCLIDX2"
+HEADER_DTYPE = np.dtype([("magic", "S8"), ("count", "<u8"), ("built_at", "<f8"), ("changed_since", "<f8")])
+RECORD_DTYPE = np.dtype(
+    [
+        ("cluster_id", "S64"),
+        ("headline", "S512"),
+        ("members", "S2048"),
+        ("last_updated_at", "<f8"),
+    ]
+)
+MEMBER_SEPARATOR = "\n"
+# Without a view of in-flight transactions, only clock skew between hosts is allowed for.
+CLOCK_SLACK_SECONDS = 5
+
+# Start of the oldest transaction still open elsewhere, on the database clock. `updated_at` is stamped
+# with now(), the transaction start, so anything the build cannot see yet is stamped at or after this.
+OLDEST_OPEN_TRANSACTION_SQL = text(
+    """
+    SELECT least(clock_timestamp(), min(xact_start))
+    FROM pg_stat_activity
+    WHERE datname = current_database() AND pid <> pg_backend_pid() AND xact_start IS NOT NULL
+    """
+)
+
+
+def _fixed_width(text: str, width: int) -> bytes:
+    return text.encode("utf-8")[:width]
+
+
+def _text(value: bytes) -> str:
+    return value.decode("utf-8", errors="ignore")
+
+
+def _epoch(value: datetime) -> float:
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return value.timestamp()
+
+
+def _change_horizon(db: Session, built_at: datetime) -> datetime:
+    if db.get_bind().dialect.name != "postgresql":
+        return built_at - timedelta(seconds=CLOCK_SLACK_SECONDS)
+    return db.scalar(OLDEST_OPEN_TRANSACTION_SQL)
+
+
+def build_shared_index(db: Session, path: str | Path, window_hours: int) -> int:
+    built_at = datetime.now(timezone.utc)
+    # Taken before the rows are read: clusters committed after the read were stamped no earlier than this.
+    changed_since = _change_horizon(db, built_at)
+    cutoff = built_at - timedelta(hours=window_hours)
+    rows = db.execute(
+        select(StoryCluster.id, StoryCluster.headline, StoryCluster.last_updated_at)
+        .where(StoryCluster.last_updated_at >= cutoff)
+        .order_by(desc(StoryCluster.last_updated_at), StoryCluster.id)
+    ).all()
+
+    members: dict[str, list[str]] = {}
+    if rows:
+        member_rows = db.execute(
+            select(ClusterItem.cluster_id, SourceItem.title)
+            .join(SourceItem, SourceItem.id == ClusterItem.source_item_id)
+            .join(StoryCluster, StoryCluster.id == ClusterItem.cluster_id)
+            .where(StoryCluster.last_updated_at >= cutoff)
+        ).all()
+        for cluster_id, title in member_rows:
+            members.setdefault(cluster_id, []).append(title)
+
+    records = np.zeros(len(rows), dtype=RECORD_DTYPE)
+    for position, row in enumerate(rows):
+        records[position] = (
+            _fixed_width(row.id, 64),
+            _fixed_width(row.headline, 512),
+            _fixed_width(MEMBER_SEPARATOR.join(members.get(row.id, [])), 2048),
+            _epoch(row.last_updated_at),
+        )
+    header = np.array([(MAGIC, len(rows), built_at.timestamp(), _epoch(changed_since))], dtype=HEADER_DTYPE)
+
+    # Write beside the target and rename so readers only ever map a complete file.
+    target = Path(path)
+    target.parent.mkdir(parents=True, exist_ok=True)
+    with tempfile.NamedTemporaryFile(dir=target.parent, prefix=f".{target.name}.", delete=False) as handle:
+        handle.write(header.tobytes())
+        handle.write(records.tobytes())
+        handle.flush()
+        os.fsync(handle.fileno())
+    os.replace(handle.name, target)
+    return len(rows)
+
+
+class SharedClusterIndex:
+    """Read-only view of the active-window cluster table, mapped from a file.
+
+    Every worker on a host maps the same file, so the page cache holds one copy no matter how
+    many workers run. The file is replaced atomically by its owner; readers remap on change.
+    """
+
+    def __init__(self, path: str | Path) -> None:
+        self.path = Path(path)
+        self._stat_key: tuple[int, int] | None = None
+        self._records: np.ndarray | None = None
+        self.built_at: datetime | None = None
+        # Clusters updated at or after this may be missing from the file and must come from the database.
+        self.changed_since: datetime | None = None
+
+    def _refresh(self) -> bool:
+        try:
+            stat = os.stat(self.path)
+        except FileNotFoundError:
+            self._records, self.built_at, self.changed_since, self._stat_key = None, None, None, None
+            return False
+
+        stat_key = (stat.st_ino, stat.st_mtime_ns)
+        if stat_key == self._stat_key:
+            return self._records is not None
+
+        header = np.fromfile(self.path, dtype=HEADER_DTYPE, count=1)
+        if len(header) != 1 or header[0]["magic"] != MAGIC:
+            self._records, self.built_at, self.changed_since, self._stat_key = None, None, None, stat_key
+            return False
+
+        count = int(header[0]["count"])
+        self._records = (
+            np.memmap(self.path, dtype=RECORD_DTYPE, mode="r", offset=HEADER_DTYPE.itemsize, shape=(count,))
+            if count
+            else np.zeros(0, dtype=RECORD_DTYPE)
+        )
+        self.built_at = datetime.fromtimestamp(float(header[0]["built_at"]), tz=timezone.utc)
+        self.changed_since = datetime.fromtimestamp(float(header[0]["changed_since"]), tz=timezone.utc)
+        self._stat_key = stat_key
+        return True
+
+    def is_fresh(self, max_age_seconds: int) -> bool:
+        if not self._refresh() or self.built_at is None:
+            return False
+        return datetime.now(timezone.utc) - self.built_at <= timedelta(seconds=max_age_seconds)
+
+    def candidates(self, cutoff: datetime, limit: int | None = None) -> list[ClusterCandidate]:
+        if not self._refresh() or self._records is None:
+            return []
+
+        records = self._records
+        # Records are written newest first, so the active window is a prefix.
+        active = int(np.count_nonzero(records["last_updated_at"] >= _epoch(cutoff)))
+        if limit is not None:
+            active = min(active, limit)
+
+        candidates: list[ClusterCandidate] = []
+        for record in records[:active]:
+            members = _text(record["members"])
+            candidates.append(
+                ClusterCandidate(
+                    cluster_id=_text(record["cluster_id"]),
+                    headline=_text(record["headline"]),
+                    last_updated_at=datetime.fromtimestamp(float(record["last_updated_at"]), tz=timezone.utc),
+                    member_texts=members.split(MEMBER_SEPARATOR) if members else [],
+                )
+            )
+        return candidates
@@ -0,0 +1,164 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from zlib import crc32
+
+import numpy as np
+
+from app.services.clustering.clusterer import TOKEN_PATTERN
+from app.services.clustering.engines import ClusterCandidate, ClusterEngine
+
+RECENCY_HOURS = 72
+# Share of cached documents that may be added or removed before the frozen IDF is recomputed.
+IDF_REFRESH_DRIFT = 0.1
+# Clusters not scored against for this many calls leave the cache (and the document frequencies).
+CACHE_IDLE_CALLS = 16
+
+
+def _as_utc_timestamp(value: datetime) -> float:
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return value.timestamp()
+
+
+def hashed_term_counts(texts: list[str], n_features: int) -> np.ndarray:
+    counts = np.zeros((len(texts), n_features), dtype=np.float32)
+    for row, text in enumerate(texts):
+        columns = [crc32(token.lower().encode("utf-8")) % n_features for token in TOKEN_PATTERN.findall(text)]
+        if columns:
+            np.add.at(counts[row], columns, 1.0)
+    return counts
+
+
+def _l2_normalize(matrix: np.ndarray) -> np.ndarray:
+    norms = np.linalg.norm(matrix, axis=-1, keepdims=True)
+    return np.divide(matrix, norms, out=np.zeros_like(matrix), where=norms > 0)
+
+
+@dataclass(slots=True)
+class _CentroidEntry:
+    signature: tuple[str, ...]
+    # (hashed columns, term counts) per text, kept so an unchanged cluster is never re-tokenized.
+    documents: list[tuple[np.ndarray, np.ndarray]]
+    centroid: np.ndarray | None = None
+    generation: int = -1
+    last_used: int = 0
+
+
+class TfidfEngine(ClusterEngine):
+    """Hashed TF-IDF centroids, cached per cluster across calls.
+
+    Document frequencies are kept up to date as clusters enter, change or leave the cache, but the IDF
+    is frozen per generation: only clusters whose texts changed get a new centroid row, until the
+    documents added or removed since the freeze pass ``IDF_REFRESH_DRIFT`` and every row is rebuilt.
+    One instance serves one thread.
+    """
+
+    engine_name = "tfidf"
+    uses_member_texts = True
+
+    def __init__(self, n_features: int = 4096) -> None:
+        self.n_features = n_features
+        self._entries: dict[str, _CentroidEntry] = {}
+        self._document_frequency = np.zeros(n_features, dtype=np.int64)
+        self._documents = 0
+        self._idf: np.ndarray | None = None
+        self._idf_documents = 0
+        self._drift = 0
+        self._generation = 0
+        self._calls = 0
+
+    def _terms(self, text: str) -> tuple[np.ndarray, np.ndarray]:
+        columns = [crc32(token.lower().encode("utf-8")) % self.n_features for token in TOKEN_PATTERN.findall(text)]
+        unique, counts = np.unique(np.asarray(columns, dtype=np.intp), return_counts=True)
+        return unique, counts.astype(np.float32)
+
+    def _count(self, entry: _CentroidEntry, sign: int) -> None:
+        for columns, _ in entry.documents:
+            self._document_frequency[columns] += sign
+        self._documents += sign * len(entry.documents)
+        self._drift += len(entry.documents)
+
+    def _track(self, candidate: ClusterCandidate) -> _CentroidEntry:
+        signature = (candidate.headline, *sorted(candidate.member_texts))
+        entry = self._entries.get(candidate.cluster_id)
+        if entry is not None and entry.signature == signature:
+            return entry
+        if entry is not None:
+            self._count(entry, -1)
+        entry = self._entries[candidate.cluster_id] = _CentroidEntry(signature, [self._terms(text) for text in signature])
+        self._count(entry, 1)
+        return entry
+
+    def _evict_idle(self) -> None:
+        idle = [cluster_id for cluster_id, entry in self._entries.items() if self._calls - entry.last_used > CACHE_IDLE_CALLS]
+        for cluster_id in idle:
+            self._count(self._entries.pop(cluster_id), -1)
+
+    def _current_idf(self) -> np.ndarray:
+        if self._idf is None or self._drift > IDF_REFRESH_DRIFT * max(self._idf_documents, 1):
+            idf = np.log((1.0 + self._documents) / (1.0 + self._document_frequency)) + 1.0
+            self._idf = idf.astype(np.float32)
+            self._idf_documents, self._drift = self._documents, 0
+            self._generation += 1
+        return self._idf
+
+    def _centroid(self, entry: _CentroidEntry, idf: np.ndarray) -> np.ndarray:
+        if entry.generation != self._generation:
+            centroid = np.zeros(self.n_features, dtype=np.float32)
+            for columns, counts in entry.documents:
+                weights = np.log1p(counts) * idf[columns]
+                norm = np.linalg.norm(weights)
+                if norm > 0:
+                    centroid[columns] += weights / norm
+            entry.centroid = _l2_normalize(centroid)
+            entry.generation = self._generation
+        return entry.centroid
+
+    def centroids(self, candidates: list[ClusterCandidate]) -> tuple[np.ndarray, np.ndarray]:
+        self._calls += 1
+        entries = [self._track(candidate) for candidate in candidates]
+        for entry in entries:
+            entry.last_used = self._calls
+        self._evict_idle()
+        idf = self._current_idf()
+        return np.stack([self._centroid(entry, idf) for entry in entries]), idf
+
+    def vectorize(self, texts: list[str], idf: np.ndarray) -> np.ndarray:
+        return _l2_normalize(np.log1p(hashed_term_counts(texts, self.n_features)) * idf)
+
+    def recency(self, item_times: list[datetime], candidates: list[ClusterCandidate]) -> np.ndarray:
+        return self._recency(item_times, [candidate.last_updated_at for candidate in candidates])
+
+    def _recency(self, item_times: list[datetime], other_times: list[datetime]) -> np.ndarray:
+        item_seconds = np.array([_as_utc_timestamp(value) for value in item_times], dtype=np.float64)
+        other_seconds = np.array([_as_utc_timestamp(value) for value in other_times], dtype=np.float64)
+        hours = np.abs(item_seconds[:, None] - other_seconds[None, :]) / 3600
+        return np.exp(-hours / RECENCY_HOURS)
+
+    def score(self, item_text: str, item_time: datetime, candidates: list[ClusterCandidate]) -> list[float]:
+        if not candidates:
+            return []
+        centroids, idf = self.centroids(candidates)
+        item_vector = self.vectorize([item_text], idf)[0]
+        lexical = centroids @ item_vector
+        scores = 0.75 * lexical + 0.25 * self.recency([item_time], candidates)[0]
+        return scores.tolist()
+
+    def score_matrix(
+        self, item_texts: list[str], item_times: list[datetime], candidates: list[ClusterCandidate]
+    ) -> list[list[float]]:
+        if not candidates:
+            return [[] for _ in item_texts]
+        centroids, idf = self.centroids(candidates)
+        lexical = self.vectorize(item_texts, idf) @ centroids.T
+        return (0.75 * lexical + 0.25 * self.recency(item_times, candidates)).tolist()
+
+    def score_peers(self, item_texts: list[str], item_times: list[datetime]) -> list[list[float]]:
+        # A one-text centroid is just that text's vector. Scoring the vectors directly keeps per-item
+        # entries out of the cluster cache and the document frequencies.
+        if not item_texts:
+            return []
+        vectors = self.vectorize(item_texts, self._current_idf())
+        return (0.75 * (vectors @ vectors.T) + 0.25 * self._recency(item_times, item_times)).tolist()
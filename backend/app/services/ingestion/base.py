@@ -3,16 +3,23 @@ from __future__ import annotations
 from abc import ABC, abstractmethod
 
 from app.db.models import Source
-from app.services.ingestion.models import NormalizedItem
+from app.services.ingestion.models import FetchCursor, NormalizedItem
 
 
 class SourceConnector(ABC):
     source_type: str
+    # Whether the pipeline drops fetched items at or behind the source's cursor.
+    cursor_filter: bool = True
 
     @abstractmethod
     def fetch_latest(self, source: Source, limit: int = 25) -> list[dict]:
         raise NotImplementedError
 
+    def fetch_new(self, source: Source, limit: int, cursor: FetchCursor) -> list[dict]:
+        # Connectors whose upstream can skip or stop at already-seen content override this; the
+        # pipeline drops whatever older items still come back.
+        return self.fetch_latest(source, limit=limit)
+
     @abstractmethod
     def normalize(self, source: Source, raw_item: dict) -> NormalizedItem:
         raise NotImplementedError
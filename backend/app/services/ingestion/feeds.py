@@ -0,0 +1,201 @@
+from __future__ import annotations
+
+import multiprocessing
+import os
+import threading
+import xml.etree.ElementTree as ET
+from collections.abc import Callable, Iterable, Iterator
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from contextlib import contextmanager
+from itertools import takewhile
+from pathlib import Path
+
+import feedparser
+import httpx
+
+from app.core.config import settings
+from app.services.ingestion.ratelimit import send
+from app.services.run_stats import record_bytes_downloaded
+
+STREAM_CHUNK_BYTES = 64 * 1024
+ENTRY_TAGS = {"item", "entry"}
+
+_pool_guard = threading.Lock()
+_pool: ProcessPoolExecutor | None = None
+
+
+def fetch_feed_bytes(ref: str, source_type: str = "rss") -> bytes:
+    if not ref.startswith(("http://", "https://")):
+        content = Path(ref).read_bytes()
+    else:
+        with httpx.Client(timeout=settings.ingestion_timeout_seconds, follow_redirects=True) as client:
+            content = send(client, source_type, "GET", ref).content
+    record_bytes_downloaded(len(content))
+    return content
+
+
+def _plain(value):
+    # FeedParserDict -> dict, minus the *_parsed struct_times and *_detail copies of fields we already keep.
+    if isinstance(value, dict):
+        return {key: _plain(item) for key, item in value.items() if not key.endswith(("_parsed", "_detail"))}
+    if isinstance(value, list):
+        return [_plain(item) for item in value]
+    return value
+
+
+def parse_entries(content: bytes, limit: int) -> list[dict]:
+    feed = feedparser.parse(content)
+    return [_plain(entry) for entry in feed.entries[:limit]]
+
+
+def _parse_processes() -> int:
+    configured = settings.feed_parse_processes
+    return (os.cpu_count() or 1) if configured is None else configured
+
+
+def _get_pool() -> ProcessPoolExecutor:
+    global _pool
+    with _pool_guard:
+        if _pool is None:
+            # spawn, not fork: the parent has DB pools and fetch threads that must not be copied mid-use.
+            _pool = ProcessPoolExecutor(max_workers=_parse_processes(), mp_context=multiprocessing.get_context("spawn"))
+        return _pool
+
+
+def _discard_pool(broken: ProcessPoolExecutor, terminate: bool = False) -> None:
+    global _pool
+    with _pool_guard:
+        if _pool is broken:
+            _pool = None
+    if terminate:
+        # shutdown() leaves a worker stuck mid-parse running; the executor has no public way to kill it.
+        for process in list((broken._processes or {}).values()):
+            process.terminate()
+    broken.shutdown(wait=False, cancel_futures=True)
+
+
+def parse_feed(content: bytes, limit: int) -> list[dict]:
+    """Parses feed bytes off the calling process and returns at most ``limit`` plain entry dicts."""
+    if _parse_processes() == 0:
+        return parse_entries(content, limit)
+
+    pool = _get_pool()
+    try:
+        return pool.submit(parse_entries, content, limit).result(timeout=settings.ingestion_timeout_seconds)
+    except TimeoutError:
+        # A pathological feed is holding a worker; recycle the pool and let the source count as failed.
+        _discard_pool(pool, terminate=True)
+        raise TimeoutError(f"Feed parse took longer than {settings.ingestion_timeout_seconds}s") from None
+    except BrokenProcessPool:
+        # A worker died (OOM on a huge feed, killed); start a fresh pool next time and parse this one here.
+        _discard_pool(pool)
+        return parse_entries(content, limit)
+
+
+@contextmanager
+def _open_stream(ref: str, source_type: str) -> Iterator[Iterator[bytes]]:
+    if not ref.startswith(("http://", "https://")):
+        with open(ref, "rb") as handle:
+            yield iter(lambda: handle.read(STREAM_CHUNK_BYTES), b"")
+        return
+    with httpx.Client(timeout=settings.ingestion_timeout_seconds, follow_redirects=True) as client:
+        response = send(client, source_type, "GET", ref, stream=True)
+        try:
+            yield response.iter_bytes(STREAM_CHUNK_BYTES)
+        finally:
+            response.close()
+
+
+def _local_name(tag: str) -> str:
+    return tag.rsplit("}", 1)[-1]
+
+
+def _entry_dict(element: ET.Element) -> dict:
+    # Same keys feedparser produces for the fields the connectors read.
+    entry: dict = {}
+    for child in element:
+        name = _local_name(child.tag)
+        text = (child.text or "").strip()
+        if name == "link":
+            href = child.get("href")
+            if href is None:
+                entry.setdefault("link", text)
+            elif child.get("rel", "alternate") == "alternate":
+                entry.setdefault("link", href)
+        elif name in ("guid", "id"):
+            entry["id"] = text
+        elif name == "title":
+            entry["title"] = text
+        elif name in ("description", "summary"):
+            entry["summary"] = text
+        elif name in ("content", "encoded"):
+            entry.setdefault("summary", text)
+        elif name in ("pubDate", "published"):
+            entry["published"] = text
+        elif name == "updated":
+            entry["updated"] = text
+        elif name in ("author", "creator"):
+            entry["author"] = text or (child.findtext("{*}name") or "").strip()
+        elif name == "videoId":
+            entry["yt_videoid"] = text
+        elif name == "group":
+            description = (child.findtext("{*}description") or "").strip()
+            if description:
+                entry.setdefault("summary", description)
+    return entry
+
+
+def iter_feed_entries(chunks: Iterable[bytes]) -> Iterator[dict]:
+    """Yields RSS items / Atom entries as soon as each one has been read, keeping only the open one in memory."""
+    parser = ET.XMLPullParser(events=("start", "end"))
+    open_elements: list[ET.Element] = []
+    for chunk in chunks:
+        parser.feed(chunk)
+        for event, element in parser.read_events():
+            if event == "start":
+                open_elements.append(element)
+                continue
+            open_elements.pop()
+            if _local_name(element.tag) in ENTRY_TAGS:
+                yield _entry_dict(element)
+                if open_elements:
+                    open_elements[-1].remove(element)
+    parser.close()
+
+
+def stream_feed_entries(ref: str, limit: int, is_known: Callable[[dict], bool], source_type: str = "rss") -> list[dict]:
+    """Reads the feed only until ``limit`` entries or the first already-stored entry (feeds are newest-first)."""
+    received: list[bytes] = []
+    entries: list[dict] = []
+    with _open_stream(ref, source_type) as chunks:
+
+        def kept(stream: Iterator[bytes]) -> Iterator[bytes]:
+            for chunk in stream:
+                received.append(chunk)
+                yield chunk
+
+        try:
+            for entry in iter_feed_entries(kept(chunks)):
+                if is_known(entry):
+                    break
+                entries.append(entry)
+                if len(entries) >= limit:
+                    break
+        except ET.ParseError:
+            # Not well-formed XML (HTML entities, stray markup); feedparser copes with those.
+            received.extend(chunks)
+            record_bytes_downloaded(sum(map(len, received)))
+            return list(takewhile(lambda entry: not is_known(entry), parse_feed(b"".join(received), limit)))
+
+    record_bytes_downloaded(sum(map(len, received)))
+    return entries
+
+
+def fetch_feed_entries(
+    ref: str, limit: int, is_known: Callable[[dict], bool] | None = None, source_type: str = "rss"
+) -> list[dict]:
+    is_known = is_known or (lambda entry: False)
+    if settings.feed_parser == "streaming":
+        return stream_feed_entries(ref, limit, is_known, source_type)
+    return list(takewhile(lambda entry: not is_known(entry), parse_feed(fetch_feed_bytes(ref, source_type), limit)))
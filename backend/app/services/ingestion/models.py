@@ -26,6 +26,10 @@ class NormalizedItem:
     category_candidates: list[str] = field(default_factory=list)
     media: dict = field(default_factory=dict)
     raw_payload: dict = field(default_factory=dict)
+    # Set when the source gave no usable timestamp and published_at is the fetch time.
+    published_at_estimated: bool = False
+    # Set when the entry had no link and url is the source's own page, which every such entry shares.
+    url_is_source_fallback: bool = False
 
     @property
     def content_hash(self) -> str:
@@ -34,5 +38,22 @@ class NormalizedItem:
 
     @property
     def dedupe_key(self) -> str:
-        payload = self.url.strip().lower() or f"{self.source_type}:{self.external_id}"
+        url = "" if self.url_is_source_fallback else self.url.strip().lower()
+        payload = url or f"{self.source_type}:{self.external_id}"
         return sha256(payload.encode("utf-8")).hexdigest()
+
+
+@dataclass(slots=True)
+class FetchCursor:
+    """Where the previous runs left off for a source: the newest item stored and a few recent ids."""
+
+    external_id: str | None = None
+    published_at: datetime | None = None
+    known_ids: frozenset[str] = frozenset()
+
+    def knows(self, external_id: str) -> bool:
+        return external_id == self.external_id or external_id in self.known_ids
+
+    def is_behind(self, external_id: str, published_at: datetime) -> bool:
+        # Equal timestamps are kept unless the id is known: several posts can share a second.
+        return self.knows(external_id) or (self.published_at is not None and published_at < self.published_at)
@@ -0,0 +1,176 @@
+from __future__ import annotations
+
+import random
+import threading
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from email.utils import parsedate_to_datetime
+from urllib.parse import urlsplit
+
+import httpx
+
+from app.core.config import settings
+from app.services.ingestion.models import utc_now
+
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+_deadline: ContextVar[float | None] = ContextVar("fetch_deadline", default=None)
+_buckets_guard = threading.Lock()
+_buckets: dict[str, TokenBucket] = {}
+
+
+class HostRateLimited(RuntimeError):
+    """The host is throttling us past the run deadline; the source is skipped, not marked unhealthy."""
+
+
+class TokenBucket:
+    """Thread-safe token bucket. Tokens may go negative: each caller reserves its slot and sleeps outside the lock."""
+
+    def __init__(self, rate: float, burst: int) -> None:
+        self.configured_rate = rate
+        self.rate = rate
+        self.burst = burst
+        self.tokens = float(burst)
+        self.updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self, now: float) -> None:
+        # `updated` sits in the future while the host has told us to back off.
+        if now > self.updated:
+            self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+
+    def reserve(self, max_wait: float | None = None) -> float | None:
+        """Takes a token and returns how long to wait for it, or None (taking nothing) if that exceeds ``max_wait``.
+
+        A token that is available now is always handed out, even when ``max_wait`` has gone negative.
+        """
+        with self._lock:
+            now = time.monotonic()
+            self._refill(now)
+            wait = max(0.0, self.updated - now) + max(0.0, 1 - self.tokens) / self.rate
+            if max_wait is not None and wait > max(max_wait, 0.0):
+                return None
+            self.tokens -= 1
+            return wait
+
+    def block_for(self, seconds: float) -> None:
+        with self._lock:
+            now = time.monotonic()
+            self._refill(now)
+            if now + seconds > self.updated:
+                self.tokens = min(self.tokens, 0.0)
+                self.updated = now + seconds
+
+    def adapt(self, remaining: float, reset_seconds: float) -> None:
+        # Spread what is left of the provider's quota over its window, never faster than configured.
+        with self._lock:
+            self.rate = min(self.configured_rate, max(remaining, 1.0) / max(reset_seconds, 1.0))
+
+
+def bucket_for(url: str, source_type: str) -> TokenBucket:
+    host = urlsplit(url).hostname or ""
+    with _buckets_guard:
+        bucket = _buckets.get(host)
+        if bucket is None:
+            rate = settings.connector_rate_limits.get(source_type, settings.connector_default_rate_per_second)
+            bucket = _buckets[host] = TokenBucket(rate, settings.connector_rate_burst)
+        return bucket
+
+
+@contextmanager
+def fetch_deadline(deadline: float | None) -> Iterator[None]:
+    """Bounds rate-limit waits and retries for fetches in this context to a ``time.monotonic()`` deadline."""
+    token = _deadline.set(deadline)
+    try:
+        yield
+    finally:
+        _deadline.reset(token)
+
+
+def _remaining() -> float | None:
+    deadline = _deadline.get()
+    return None if deadline is None else deadline - time.monotonic()
+
+
+def retry_after_seconds(response: httpx.Response) -> float | None:
+    value = response.headers.get("Retry-After")
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, (parsedate_to_datetime(value) - utc_now()).total_seconds())
+    except (TypeError, ValueError):
+        return None
+
+
+def _observe_rate_headers(bucket: TokenBucket, response: httpx.Response) -> None:
+    remaining = response.headers.get("X-Ratelimit-Remaining")
+    reset = response.headers.get("X-Ratelimit-Reset")
+    if remaining is None or reset is None:
+        return
+    try:
+        remaining_count, reset_seconds = float(remaining), float(reset)
+    except ValueError:
+        return
+    if remaining_count < 1:
+        bucket.block_for(reset_seconds)
+    else:
+        bucket.adapt(remaining_count, reset_seconds)
+
+
+def backoff_seconds(attempt: int) -> float:
+    # Full jitter: uniform over the exponential window, so retrying workers do not move in lockstep.
+    return random.uniform(0, min(settings.connector_backoff_max_seconds, settings.connector_backoff_base_seconds * 2**attempt))
+
+
+def send(client: httpx.Client, source_type: str, method: str, url: str, stream: bool = False, **kwargs) -> httpx.Response:
+    """Sends a request through the host's token bucket, retrying 429/5xx and transport errors with backoff.
+
+    Raises ``HostRateLimited`` when the host keeps throttling past the fetch deadline; other failures raise as
+    ``httpx`` would. With ``stream=True`` the caller must close the returned response.
+    """
+    bucket = bucket_for(url, source_type)
+    attempt = 0
+    while True:
+        wait = bucket.reserve(_remaining())
+        if wait is None:
+            raise HostRateLimited(f"{urlsplit(url).hostname} rate limit would exceed the fetch deadline")
+        if wait:
+            time.sleep(wait)
+
+        retry_after: float | None = None
+        try:
+            response = client.send(client.build_request(method, url, **kwargs), stream=stream)
+        except httpx.TransportError as exc:
+            error: Exception = exc
+        else:
+            _observe_rate_headers(bucket, response)
+            if response.is_success:
+                return response
+            if stream:
+                response.close()
+            if response.status_code not in RETRY_STATUSES:
+                response.raise_for_status()
+            retry_after = retry_after_seconds(response)
+            if retry_after is not None:
+                # The next reservation waits this out, for every fetch on the host.
+                bucket.block_for(retry_after)
+            if response.status_code == 429:
+                error = HostRateLimited(f"{urlsplit(url).hostname} answered 429 after {attempt + 1} attempt(s)")
+            else:
+                error = httpx.HTTPStatusError(
+                    f"Server error '{response.status_code}' for url '{url}'", request=response.request, response=response
+                )
+
+        delay = backoff_seconds(attempt)
+        remaining = _remaining()
+        if attempt >= settings.connector_retry_attempts or (remaining is not None and max(delay, retry_after or 0.0) > remaining):
+            raise error
+        attempt += 1
+        time.sleep(delay)
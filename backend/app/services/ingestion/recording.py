@@ -0,0 +1,161 @@
+from __future__ import annotations
+
+import gzip
+import json
+import re
+import threading
+import time
+from collections.abc import Callable
+from dataclasses import dataclass
+from datetime import datetime
+from pathlib import Path
+
+from app.db.models import Source
+from app.services.ingestion.base import SourceConnector
+from app.services.ingestion.models import FetchCursor, NormalizedItem, utc_now
+
+# Marks the extra copies a multiplied replay fans each item out into.
+REPLAY_COPY_KEY = "_replay_copy"
+
+_append_lock = threading.Lock()
+
+
+class ReplayedFetchError(RuntimeError):
+    pass
+
+
+def recording_path(directory: Path, source: Source) -> Path:
+    safe_id = re.sub(r"[^A-Za-z0-9_.-]+", "_", source.id)
+    return directory / source.source_type / f"{safe_id}.jsonl.gz"
+
+
+def append_recording(directory: Path, source: Source, entry: dict) -> None:
+    path = recording_path(directory, source)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    line = json.dumps({"source_id": source.id, "source_type": source.source_type, **entry}, default=str)
+    # Each append is its own gzip member; gzip readers treat the concatenation as one stream.
+    with _append_lock, gzip.open(path, "at", encoding="utf-8") as handle:
+        handle.write(line + "\n")
+
+
+def load_recording(directory: Path, source: Source) -> list[dict]:
+    path = recording_path(directory, source)
+    if not path.exists():
+        return []
+    with gzip.open(path, "rt", encoding="utf-8") as handle:
+        return [json.loads(line) for line in handle if line.strip()]
+
+
+class RecordingConnector(SourceConnector):
+    """Fetches live and appends every result, with its timing and any error, to the source's recording."""
+
+    def __init__(self, inner: SourceConnector, directory: Path) -> None:
+        self.inner = inner
+        self.source_type = inner.source_type
+        self.cursor_filter = inner.cursor_filter
+        self.directory = directory
+
+    def _record(self, source: Source, fetch: Callable[[], list[dict]]) -> list[dict]:
+        recorded_at = utc_now().isoformat()
+        started = time.perf_counter()
+        try:
+            items = fetch()
+        except Exception as exc:
+            fetch_ms = round((time.perf_counter() - started) * 1000, 1)
+            error = f"{type(exc).__name__}: {exc}"[:500]
+            append_recording(self.directory, source, {"recorded_at": recorded_at, "fetch_ms": fetch_ms, "error": error, "items": []})
+            raise
+        fetch_ms = round((time.perf_counter() - started) * 1000, 1)
+        append_recording(self.directory, source, {"recorded_at": recorded_at, "fetch_ms": fetch_ms, "items": items})
+        return items
+
+    def fetch_latest(self, source: Source, limit: int = 25) -> list[dict]:
+        return self._record(source, lambda: self.inner.fetch_latest(source, limit=limit))
+
+    def fetch_new(self, source: Source, limit: int, cursor: FetchCursor) -> list[dict]:
+        # Records what the pipeline really asks upstream for, cursor anchors and early stops included.
+        return self._record(source, lambda: self.inner.fetch_new(source, limit, cursor))
+
+    def normalize(self, source: Source, raw_item: dict) -> NormalizedItem:
+        return self.inner.normalize(source, raw_item)
+
+    def validate(self, raw_item: dict) -> bool:
+        return self.inner.validate(raw_item)
+
+    def entry_id(self, source: Source, raw_item: dict) -> str:
+        # Feed connectors only; WebSub diffs pushed entries by it.
+        return self.inner.entry_id(source, raw_item)
+
+
+@dataclass(slots=True)
+class _ReplayState:
+    batches: list[dict]
+    cursor: int = 0
+    started: float | None = None
+
+
+class ReplayConnector(SourceConnector):
+    """Serves recorded fetches in order, looping at the end.
+
+    ``speed`` 0 replays as fast as possible; otherwise batches are spaced (and fetch latency
+    reproduced) at their recorded timing divided by ``speed``. ``multiplier`` fans every item out
+    into that many copies with rewritten ids and URLs, so one recording stands in for more volume.
+    """
+
+    def __init__(self, inner: SourceConnector, directory: Path, speed: float = 0.0, multiplier: int = 1) -> None:
+        self.inner = inner
+        self.source_type = inner.source_type
+        self.cursor_filter = inner.cursor_filter
+        self.directory = directory
+        self.speed = speed
+        self.multiplier = multiplier
+        self._states: dict[str, _ReplayState] = {}
+        self._lock = threading.Lock()
+
+    def _next_batch(self, source: Source) -> tuple[dict | None, float]:
+        with self._lock:
+            state = self._states.get(source.id)
+            if state is None:
+                state = self._states[source.id] = _ReplayState(load_recording(self.directory, source))
+            if not state.batches:
+                return None, 0.0
+            if state.cursor == len(state.batches):
+                state.cursor, state.started = 0, None
+            batch = state.batches[state.cursor]
+            state.cursor += 1
+
+            now = time.monotonic()
+            if state.started is None or not self.speed:
+                state.started = now
+                return batch, 0.0
+            offset = datetime.fromisoformat(batch["recorded_at"]) - datetime.fromisoformat(state.batches[0]["recorded_at"])
+            return batch, max(0.0, state.started + offset.total_seconds() / self.speed - now)
+
+    def fetch_latest(self, source: Source, limit: int = 25) -> list[dict]:
+        batch, wait_seconds = self._next_batch(source)
+        if batch is None:
+            return []
+        if self.speed:
+            time.sleep(wait_seconds + batch.get("fetch_ms", 0.0) / 1000 / self.speed)
+        if batch.get("error"):
+            raise ReplayedFetchError(batch["error"])
+
+        items = batch["items"][:limit]
+        copies = [{**item, REPLAY_COPY_KEY: copy} for copy in range(1, self.multiplier) for item in items]
+        return [*items, *copies]
+
+    def normalize(self, source: Source, raw_item: dict) -> NormalizedItem:
+        copy = raw_item.get(REPLAY_COPY_KEY)
+        if not copy:
+            return self.inner.normalize(source, raw_item)
+        normalized = self.inner.normalize(source, {key: value for key, value in raw_item.items() if key != REPLAY_COPY_KEY})
+        normalized.external_id = f"{normalized.external_id}~r{copy}"
+        normalized.url = f"{normalized.url}#replay-{copy}"
+        return normalized
+
+    def validate(self, raw_item: dict) -> bool:
+        return self.inner.validate(raw_item)
+
+    def entry_id(self, source: Source, raw_item: dict) -> str:
+        # Feed connectors only; WebSub diffs pushed entries by it.
+        return self.inner.entry_id(source, raw_item)
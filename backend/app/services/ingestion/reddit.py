@@ -1,25 +1,30 @@
 from __future__ import annotations
 
+from datetime import timedelta
+
 import httpx
 
 from app.core.config import settings
 from app.db.models import Source
 from app.services.ingestion.base import SourceConnector
-from app.services.ingestion.models import NormalizedItem, utc_now
-from app.services.ingestion.utils import parse_datetime
+from app.services.ingestion.models import FetchCursor, NormalizedItem, utc_now
+from app.services.ingestion.ratelimit import send
+from app.services.ingestion.utils import parse_optional_datetime
+from app.services.run_stats import record_bytes_downloaded
+
+CURSOR_RECHECK_AGE = timedelta(hours=24)
 
 
 class RedditConnector(SourceConnector):
     source_type = "reddit"
 
-    def fetch_latest(self, source: Source, limit: int = 25) -> list[dict]:
+    def _fetch_listing(self, source: Source, params: dict) -> list[dict]:
         subreddit = source.external_ref.strip().replace("r/", "")
         url = f"https://www.reddit.com/r/{subreddit}/new.json"
         headers = {"User-Agent": settings.reddit_user_agent}
-        params = {"limit": min(limit, 100), "raw_json": 1}
         with httpx.Client(timeout=settings.ingestion_timeout_seconds, headers=headers) as client:
-            response = client.get(url, params=params)
-            response.raise_for_status()
+            response = send(client, self.source_type, "GET", url, params={**params, "raw_json": 1})
+            record_bytes_downloaded(len(response.content))
             data = response.json()
 
         posts: list[dict] = []
@@ -27,11 +32,25 @@ class RedditConnector(SourceConnector):
             posts.append(child.get("data", {}))
         return posts
 
+    def fetch_latest(self, source: Source, limit: int = 25) -> list[dict]:
+        return self._fetch_listing(source, {"limit": min(limit, 100)})
+
+    def fetch_new(self, source: Source, limit: int, cursor: FetchCursor) -> list[dict]:
+        if not cursor.external_id:
+            return self.fetch_latest(source, limit)
+        # `before` lists only posts newer than the anchor (oldest first among them, up to the limit).
+        posts = self._fetch_listing(source, {"limit": min(limit, 100), "before": f"t3_{cursor.external_id}"})
+        if posts or cursor.published_at is None or utc_now() - cursor.published_at < CURSOR_RECHECK_AGE:
+            return posts
+        # A deleted anchor makes `before` return nothing forever; re-anchor from the plain listing now and then.
+        return self.fetch_latest(source, limit)
+
     def normalize(self, source: Source, raw_item: dict) -> NormalizedItem:
         permalink = raw_item.get("permalink", "")
         url = raw_item.get("url_overridden_by_dest") or f"https://reddit.com{permalink}"
         body = raw_item.get("selftext") or ""
-        published = parse_datetime(raw_item.get("created_utc"))
+        published = parse_optional_datetime(raw_item.get("created_utc"))
+        fetched_at = utc_now()
 
         return NormalizedItem(
             source_id=source.id,
@@ -42,12 +61,13 @@ class RedditConnector(SourceConnector):
             title=raw_item.get("title", "Untitled"),
             body=body,
             url=url,
-            published_at=published,
-            fetched_at=utc_now(),
+            published_at=published or fetched_at,
+            fetched_at=fetched_at,
             engagement={
                 "upvotes": raw_item.get("ups", 0),
                 "comments": raw_item.get("num_comments", 0),
             },
             category_candidates=source.category_hints,
             raw_payload=raw_item,
+            published_at_estimated=published is None,
         )
@@ -1,8 +1,13 @@
+from pathlib import Path
+
+from app.core.config import settings
 from app.services.ingestion.base import SourceConnector
 from app.services.ingestion.discord import DiscordConnector
 from app.services.ingestion.reddit import RedditConnector
+from app.services.ingestion.recording import RecordingConnector, ReplayConnector
 from app.services.ingestion.rss import RSSConnector
-from app.services.ingestion.twitter import TwitterConnector
+from app.services.ingestion.streaming import StreamingConnector
+from app.services.ingestion.twitter import TwitterConnector, TwitterStreamConnector
 from app.services.ingestion.youtube import YouTubeConnector
 
 CONNECTORS: dict[str, SourceConnector] = {
@@ -13,6 +18,39 @@ CONNECTORS: dict[str, SourceConnector] = {
     "discord": DiscordConnector(),
 }
 
+# Wrappers live for the process so a replay keeps its place in each recording between runs.
+_wrapped: dict[tuple, SourceConnector] = {}
+
+
+def _wrap(connector: SourceConnector, mode: str) -> SourceConnector:
+    directory = Path(settings.connector_recording_dir)
+    if mode == "record":
+        return RecordingConnector(connector, directory)
+    if mode == "replay":
+        return ReplayConnector(
+            connector,
+            directory,
+            speed=settings.connector_replay_speed,
+            multiplier=settings.connector_replay_multiplier,
+        )
+    raise ValueError(f"Unknown connector mode: {mode}")
+
 
 def get_connector(source_type: str) -> SourceConnector | None:
-    return CONNECTORS.get(source_type)
+    connector = CONNECTORS.get(source_type)
+    mode = settings.connector_mode
+    if connector is None or mode == "live":
+        return connector
+    key = (mode, source_type, settings.connector_recording_dir, settings.connector_replay_speed, settings.connector_replay_multiplier)
+    if key not in _wrapped:
+        _wrapped[key] = _wrap(connector, mode)
+    return _wrapped[key]
+
+
+STREAMING_CONNECTORS: dict[str, StreamingConnector] = {
+    "twitter": TwitterStreamConnector(),
+}
+
+
+def get_streaming_connector(source_type: str) -> StreamingConnector | None:
+    return STREAMING_CONNECTORS.get(source_type)
@@ -1,26 +1,34 @@
 from __future__ import annotations
 
-import feedparser
-
 from app.db.models import Source
 from app.services.ingestion.base import SourceConnector
-from app.services.ingestion.models import NormalizedItem, utc_now
-from app.services.ingestion.utils import parse_datetime
+from app.services.ingestion.feeds import fetch_feed_entries
+from app.services.ingestion.models import FetchCursor, NormalizedItem, utc_now
+from app.services.ingestion.utils import parse_optional_datetime
 
 
 class RSSConnector(SourceConnector):
     source_type = "rss"
 
     def fetch_latest(self, source: Source, limit: int = 25) -> list[dict]:
-        feed = feedparser.parse(source.external_ref)
-        return [dict(entry) for entry in feed.entries[:limit]]
+        return fetch_feed_entries(source.external_ref, limit, source_type=self.source_type)
+
+    def fetch_new(self, source: Source, limit: int, cursor: FetchCursor) -> list[dict]:
+        return fetch_feed_entries(
+            source.external_ref, limit, lambda entry: cursor.knows(self.entry_id(source, entry)), self.source_type
+        )
+
+    def entry_id(self, source: Source, raw_item: dict) -> str:
+        return raw_item.get("id") or raw_item.get("link") or source.url
 
     def normalize(self, source: Source, raw_item: dict) -> NormalizedItem:
         title = raw_item.get("title", "Untitled")
         body = raw_item.get("summary", "")
-        url = raw_item.get("link") or source.url
-        published = parse_datetime(raw_item.get("published") or raw_item.get("updated"))
-        external_id = raw_item.get("id") or url
+        link = raw_item.get("link")
+        url = link or source.url
+        published = parse_optional_datetime(raw_item.get("published") or raw_item.get("updated"))
+        fetched_at = utc_now()
+        external_id = self.entry_id(source, raw_item)
 
         return NormalizedItem(
             source_id=source.id,
@@ -31,8 +39,10 @@ class RSSConnector(SourceConnector):
             title=title,
             body=body,
             url=url,
-            published_at=published,
-            fetched_at=utc_now(),
+            published_at=published or fetched_at,
+            fetched_at=fetched_at,
             category_candidates=source.category_hints,
             raw_payload=raw_item,
+            published_at_estimated=published is None,
+            url_is_source_fallback=not link,
         )
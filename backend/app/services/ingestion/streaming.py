@@ -0,0 +1,63 @@
+from __future__ import annotations
+
+import json
+from abc import ABC, abstractmethod
+from collections.abc import AsyncIterator
+from dataclasses import dataclass
+
+import httpx
+
+from app.core.config import settings
+from app.db.models import Source
+from app.services.ingestion.models import NormalizedItem
+
+
+@dataclass(slots=True)
+class StreamEvent:
+    raw: dict
+    # Handed back to `stream` on reconnect so the upstream can resume after this event.
+    resume_token: str | None = None
+
+
+class StreamingConnector(ABC):
+    """Push counterpart of ``SourceConnector``: one long-lived stream per source instead of polled lists."""
+
+    source_type: str
+
+    @abstractmethod
+    def stream(self, source: Source, resume_token: str | None) -> AsyncIterator[StreamEvent]:
+        """Yields events until the upstream closes the stream; the stream runner reconnects."""
+        raise NotImplementedError
+
+    @abstractmethod
+    def normalize(self, source: Source, raw_item: dict) -> NormalizedItem:
+        raise NotImplementedError
+
+    def validate(self, raw_item: dict) -> bool:
+        return bool(raw_item)
+
+
+class ChunkedJSONStreamConnector(StreamingConnector):
+    """Reads newline-delimited JSON from a long-lived chunked HTTP response; blank lines are keep-alives."""
+
+    def stream_request(self, source: Source, resume_token: str | None) -> tuple[str, dict[str, str]]:
+        headers = {"Last-Event-ID": resume_token} if resume_token else {}
+        return source.url, headers
+
+    def parse_message(self, message: dict) -> StreamEvent | None:
+        event_id = message.get("id")
+        return StreamEvent(message, str(event_id) if event_id is not None else None)
+
+    async def stream(self, source: Source, resume_token: str | None) -> AsyncIterator[StreamEvent]:
+        url, headers = self.stream_request(source, resume_token)
+        # The read timeout doubles as the idle timeout: a silent stream (no keep-alives) is reconnected.
+        timeout = httpx.Timeout(settings.ingestion_timeout_seconds, read=settings.stream_idle_timeout_seconds)
+        async with httpx.AsyncClient(timeout=timeout) as client:
+            async with client.stream("GET", url, headers=headers) as response:
+                response.raise_for_status()
+                async for line in response.aiter_lines():
+                    if not line.strip():
+                        continue
+                    event = self.parse_message(json.loads(line))
+                    if event is not None:
+                        yield event
@@ -2,14 +2,68 @@ from __future__ import annotations
 
 from app.db.models import Source
 from app.services.ingestion.base import SourceConnector
-from app.services.ingestion.models import NormalizedItem
+from app.services.ingestion.models import NormalizedItem, utc_now
+from app.services.ingestion.streaming import ChunkedJSONStreamConnector, StreamEvent
+from app.services.ingestion.utils import parse_optional_datetime
+
+TWITTER_STREAM_URL = "https://api.twitter.com/2/tweets/search/stream"
+TWITTER_STREAM_PARAMS = "expansions=author_id&tweet.fields=created_at,public_metrics&user.fields=username"
 
 
 class TwitterConnector(SourceConnector):
     source_type = "twitter"
 
     def fetch_latest(self, source: Source, limit: int = 25) -> list[dict]:
+        # Twitter sources are ingested by the stream runner (TwitterStreamConnector), not polled.
         return []
 
     def normalize(self, source: Source, raw_item: dict) -> NormalizedItem:
-        raise NotImplementedError("Twitter ingestion adapter is intentionally a placeholder for MVP hardening")
+        raise NotImplementedError("Twitter sources are ingested by the stream runner")
+
+
+class TwitterStreamConnector(ChunkedJSONStreamConnector):
+    """Filtered-stream (v2) tweets for the rules configured on the source's app."""
+
+    source_type = "twitter"
+
+    def stream_request(self, source: Source, resume_token: str | None) -> tuple[str, dict[str, str]]:
+        auth = source.auth_config or {}
+        url = auth.get("stream_url") or f"{TWITTER_STREAM_URL}?{TWITTER_STREAM_PARAMS}"
+        _, headers = super().stream_request(source, resume_token)
+        if auth.get("bearer_token"):
+            headers["Authorization"] = f"Bearer {auth['bearer_token']}"
+        return url, headers
+
+    def parse_message(self, message: dict) -> StreamEvent | None:
+        tweet = message.get("data")
+        if not tweet or "id" not in tweet:
+            # Operational messages (errors, rule notices) carry no tweet.
+            return None
+        users = {user.get("id"): user for user in (message.get("includes") or {}).get("users", [])}
+        author = users.get(tweet.get("author_id"), {})
+        return StreamEvent({**tweet, "username": author.get("username")}, tweet["id"])
+
+    def normalize(self, source: Source, raw_item: dict) -> NormalizedItem:
+        text = raw_item.get("text", "")
+        username = raw_item.get("username")
+        path = f"{username}/status" if username else "i/web/status"
+        metrics = raw_item.get("public_metrics") or {}
+        published = parse_optional_datetime(raw_item.get("created_at"))
+        fetched_at = utc_now()
+
+        return NormalizedItem(
+            source_id=source.id,
+            source_type=source.source_type,
+            source_name=source.name,
+            external_id=raw_item["id"],
+            author=username,
+            title=text.split("\n", 1)[0][:280],
+            body=text,
+            url=f"https://twitter.com/{path}/{raw_item['id']}",
+            published_at=published or fetched_at,
+            fetched_at=fetched_at,
+            engagement={"likes": metrics.get("like_count", 0), "reposts": metrics.get("retweet_count", 0)},
+            category_candidates=source.category_hints,
+            raw_payload=raw_item,
+            published_at_estimated=published is None,
+        )
@@ -3,8 +3,12 @@ from email.utils import parsedate_to_datetime
 
 
 def parse_datetime(value: str | int | float | None) -> datetime:
+    return parse_optional_datetime(value) or datetime.now(timezone.utc)
+
+
+def parse_optional_datetime(value: str | int | float | None) -> datetime | None:
     if value is None:
-        return datetime.now(timezone.utc)
+        return None
 
     if isinstance(value, (int, float)):
         return datetime.fromtimestamp(value, tz=timezone.utc)
@@ -28,4 +32,4 @@ def parse_datetime(value: str | int | float | None) -> datetime:
             return dt.replace(tzinfo=timezone.utc)
         return dt.astimezone(timezone.utc)
     except ValueError:
-        return datetime.now(timezone.utc)
+        return None
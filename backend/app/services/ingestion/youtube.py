@@ -1,35 +1,45 @@
 from __future__ import annotations
 
-import feedparser
-
 from app.db.models import Source
 from app.services.ingestion.base import SourceConnector
-from app.services.ingestion.models import NormalizedItem, utc_now
-from app.services.ingestion.utils import parse_datetime
+from app.services.ingestion.feeds import fetch_feed_entries
+from app.services.ingestion.models import FetchCursor, NormalizedItem, utc_now
+from app.services.ingestion.utils import parse_optional_datetime
 
 
 class YouTubeConnector(SourceConnector):
     source_type = "youtube"
 
     def fetch_latest(self, source: Source, limit: int = 25) -> list[dict]:
-        feed = feedparser.parse(source.external_ref)
-        return [dict(entry) for entry in feed.entries[:limit]]
+        return fetch_feed_entries(source.external_ref, limit, source_type=self.source_type)
+
+    def fetch_new(self, source: Source, limit: int, cursor: FetchCursor) -> list[dict]:
+        return fetch_feed_entries(
+            source.external_ref, limit, lambda entry: cursor.knows(self.entry_id(source, entry)), self.source_type
+        )
+
+    def entry_id(self, source: Source, raw_item: dict) -> str:
+        return raw_item.get("yt_videoid", raw_item.get("link", source.url))
 
     def normalize(self, source: Source, raw_item: dict) -> NormalizedItem:
-        url = raw_item.get("link", source.url)
-        published = parse_datetime(raw_item.get("published") or raw_item.get("updated"))
+        link = raw_item.get("link")
+        url = link or source.url
+        published = parse_optional_datetime(raw_item.get("published") or raw_item.get("updated"))
+        fetched_at = utc_now()
 
         return NormalizedItem(
             source_id=source.id,
             source_type=source.source_type,
             source_name=source.name,
-            external_id=raw_item.get("yt_videoid", url),
+            external_id=self.entry_id(source, raw_item),
             author=raw_item.get("author"),
             title=raw_item.get("title", "Untitled"),
             body=raw_item.get("summary", ""),
             url=url,
-            published_at=published,
-            fetched_at=utc_now(),
+            published_at=published or fetched_at,
+            fetched_at=fetched_at,
             category_candidates=source.category_hints,
             raw_payload=raw_item,
+            published_at_estimated=published is None,
+            url_is_source_fallback=not link,
         )
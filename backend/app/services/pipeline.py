@@ -1,27 +1,65 @@
 from __future__ import annotations
 
-from dataclasses import dataclass
-from datetime import datetime, timezone
+import random
+from collections import deque
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from functools import partial
+from datetime import datetime, timedelta, timezone
+from time import monotonic, perf_counter, sleep
 
-from sqlalchemy import select
+from sqlalchemy import Select, select
 from sqlalchemy.orm import Session
 
 from app.core.config import settings
-from app.db.models import IngestionRun, RawIngestedItem, Source, SourceItem, StoryCluster
-from app.services.clustering.service import assign_item_to_cluster
-from app.services.ingestion.models import NormalizedItem
+from app.db.models import (
+    IngestionRun,
+    IngestionSourceStats,
+    RawIngestedItem,
+    Source,
+    SourceCursor,
+    SourceHealth,
+    SourceItem,
+    StoryCluster,
+)
+from app.services.clustering.dedupe import DuplicateIndex, item_fingerprint
+from app.services.clustering.engines import ClusterEngine
+from app.services.clustering.locks import CREATE_LOCK, ClusterLockTimeout, acquire_cluster_locks
+from app.services.clustering.service import (
+    assign_item_to_cluster,
+    assign_items_to_clusters,
+    attach_item_to_cluster,
+    attach_items_to_cluster,
+    get_cluster_engine,
+)
+from app.services.ingestion.base import SourceConnector
+from app.services.ingestion.models import FetchCursor, NormalizedItem
+from app.services.ingestion.ratelimit import HostRateLimited, fetch_deadline
 from app.services.ingestion.registry import get_connector
+from app.services.run_stats import RunStats, count_downloads
+from app.services.source_health import begin_fetch, record_fetch
 from app.services.summarization.service import summarize_cluster
+from app.services.websub import pushed_source_ids
+
+
+# Upper bound of the first jittered wait before a chunk is clustered again after a lock timeout.
+CLUSTER_RETRY_BACKOFF_SECONDS = 0.2
 
 
 @dataclass(slots=True)
 class PipelineResult:
+    run_id: str
     fetched_count: int
     normalized_count: int
     clustered_count: int
+    deduplicated_count: int = 0
+    dirty_cluster_ids: list[str] = field(default_factory=list)
+    stats: dict = field(default_factory=dict)
 
 
 def _upsert_source_item(db: Session, normalized: NormalizedItem, raw_item_id: str | None) -> tuple[SourceItem, bool]:
+    fingerprint = item_fingerprint(normalized.title, normalized.body, settings.dedupe_min_tokens)
     existing = db.scalar(
         select(SourceItem).where(SourceItem.source_id == normalized.source_id, SourceItem.external_id == normalized.external_id)
     )
@@ -39,6 +77,7 @@ def _upsert_source_item(db: Session, normalized: NormalizedItem, raw_item_id: st
         existing.raw_payload_json = normalized.raw_payload
         existing.content_hash = normalized.content_hash
         existing.dedupe_key = normalized.dedupe_key
+        existing.simhash = fingerprint
         existing.raw_item_id = raw_item_id
         return existing, False
 
@@ -58,82 +97,461 @@ def _upsert_source_item(db: Session, normalized: NormalizedItem, raw_item_id: st
         raw_payload_json=normalized.raw_payload,
         content_hash=normalized.content_hash,
         dedupe_key=normalized.dedupe_key,
+        simhash=fingerprint,
     )
     db.add(created)
     db.flush()
     return created, True
 
 
-def run_ingestion_pipeline(db: Session, source_types: list[str] | None = None) -> PipelineResult:
-    run = IngestionRun(source_filter=source_types or [])
-    db.add(run)
-    db.flush()
+def _store_raw_item(db: Session, source: Source, normalized: NormalizedItem, raw: dict) -> tuple[SourceItem, bool]:
+    raw_existing = db.scalar(
+        select(RawIngestedItem).where(
+            RawIngestedItem.source_id == source.id, RawIngestedItem.external_id == normalized.external_id
+        )
+    )
+    if raw_existing:
+        raw_existing.payload_json = raw
+        raw_record = raw_existing
+    else:
+        raw_record = RawIngestedItem(source_id=source.id, external_id=normalized.external_id, payload_json=raw)
+        db.add(raw_record)
+        db.flush()
 
-    source_query = select(Source).where(Source.enabled.is_(True))
+    return _upsert_source_item(db, normalized, raw_record.id)
+
+
+def enabled_sources_query(source_types: list[str] | None = None, source_ids: list[str] | None = None) -> Select:
+    query = select(Source).where(Source.enabled.is_(True)).order_by(Source.id)
     if source_types:
-        source_query = source_query.where(Source.source_type.in_(source_types))
+        query = query.where(Source.source_type.in_(source_types))
+    if source_ids is not None:
+        query = query.where(Source.id.in_(source_ids))
+    return query
 
-    sources = db.scalars(source_query).all()
 
-    fetched_count = 0
-    normalized_count = 0
-    clustered_count = 0
-    touched_cluster_ids: set[str] = set()
+def _start_run(
+    db: Session, source_types: list[str] | None, source_ids: list[str] | None, resume_run_id: str | None
+) -> IngestionRun:
+    if resume_run_id is None:
+        stats = {"source_fetch_ms": {}}
+        if source_ids is not None:
+            stats["source_ids"] = sorted(source_ids)
+        run = IngestionRun(
+            source_filter=source_types or [], completed_source_ids=[], touched_cluster_ids=[], stats_json=stats
+        )
+        db.add(run)
+        db.commit()
+        return run
 
-    for source in sources:
-        connector = get_connector(source.source_type)
-        if connector is None:
-            continue
+    run = db.get(IngestionRun, resume_run_id)
+    if run is None:
+        raise ValueError(f"Unknown ingestion run: {resume_run_id}")
+    if run.status == "completed":
+        raise ValueError(f"Ingestion run {resume_run_id} already completed")
+    run.status = "running"
+    db.commit()
+    return run
+
+
+def _checkpoint(
+    db: Session,
+    run: IngestionRun,
+    counts: dict[str, int],
+    touched_cluster_ids: set[str],
+    fetch_ms: dict[str, float],
+    stats: RunStats,
+) -> None:
+    run.stats_json = {
+        **(run.stats_json or {}),
+        **stats.to_json(counts["clustered"]),
+        "source_fetch_ms": dict(fetch_ms),
+        "deduplicated_count": counts["deduplicated"],
+    }
+    run.fetched_count = counts["fetched"]
+    run.normalized_count = counts["normalized"]
+    run.clustered_count = counts["clustered"]
+    run.touched_cluster_ids = sorted(touched_cluster_ids)
+    run.checkpointed_at = datetime.now(timezone.utc)
+    with stats.stage("commit"):
+        db.commit()
+    # Drop everything the chunk loaded so the identity map stays bounded across the run.
+    db.expunge_all()
+    db.add(run)
+
+
+def _record_source_stats(db: Session, run: IngestionRun, source: Source, values: dict) -> None:
+    row = db.scalar(
+        select(IngestionSourceStats).where(IngestionSourceStats.run_id == run.id, IngestionSourceStats.source_id == source.id)
+    )
+    if row is None:
+        row = IngestionSourceStats(run_id=run.id, source_id=source.id)
+        db.add(row)
+    for key, value in values.items():
+        setattr(row, key, value)
+
+
+def _source_stats_payload(db: Session, run_id: str) -> dict[str, dict]:
+    rows = db.scalars(select(IngestionSourceStats).where(IngestionSourceStats.run_id == run_id)).all()
+    return {
+        row.source_id: {
+            "fetch_ms": row.fetch_ms,
+            "bytes_downloaded": row.bytes_downloaded,
+            "fetched_count": row.fetched_count,
+            "normalized_count": row.normalized_count,
+            "created_count": row.created_count,
+            "skipped_count": row.skipped_count,
+            "error": row.error,
+        }
+        for row in sorted(rows, key=lambda row: row.source_id)
+    }
 
+
+@dataclass(slots=True)
+class FetchOutcome:
+    items: list[dict]
+    error: str | None
+    fetch_ms: float
+    bytes_downloaded: int
+    circuit_open: bool = False
+    throttled: bool = False
+
+
+def _known_external_ids(db: Session, source_id: str) -> set[str]:
+    return set(
+        db.scalars(
+            select(SourceItem.external_id)
+            .where(SourceItem.source_id == source_id)
+            .order_by(SourceItem.published_at.desc())
+            .limit(settings.ingestion_default_limit)
+        )
+    )
+
+
+def _fetch_cursor(row: SourceCursor | None, known_ids: set[str]) -> FetchCursor:
+    if row is None:
+        return FetchCursor(known_ids=frozenset(known_ids))
+    return FetchCursor(row.last_external_id, row.last_published_at, frozenset(known_ids))
+
+
+def _advance_cursor(db: Session, source_id: str, newest: NormalizedItem) -> None:
+    # Looked up again rather than taken from the rows loaded up front: chunk checkpoints expunge those.
+    row = db.get(SourceCursor, source_id)
+    if row is None:
+        row = SourceCursor(source_id=source_id)
+        db.add(row)
+    # A feed dated in the future would otherwise put every later item behind the cursor.
+    published_at = min(newest.published_at, newest.fetched_at)
+    if row.last_published_at is None or published_at >= row.last_published_at:
+        row.last_external_id = newest.external_id
+        row.last_published_at = published_at
+
+
+def _fetch_source(connector: SourceConnector, source: Source, cursor: FetchCursor, deadline: float) -> FetchOutcome:
+    items: list[dict] = []
+    error: str | None = None
+    throttled = False
+    started = perf_counter()
+    with count_downloads() as downloaded, fetch_deadline(deadline):
         try:
-            raw_items = connector.fetch_latest(source, limit=settings.ingestion_default_limit)
-        except Exception:
+            items = connector.fetch_new(source, settings.ingestion_default_limit, cursor)
+        except HostRateLimited as exc:
+            error, throttled = f"HostRateLimited: {exc}"[:500], True
+        except Exception as exc:
+            error = f"{type(exc).__name__}: {exc}"[:500]
+    return FetchOutcome(items, error, round((perf_counter() - started) * 1000, 1), downloaded[0], throttled=throttled)
+
+
+def _cluster_item(
+    db: Session, row: SourceItem, engine: ClusterEngine, duplicates: DuplicateIndex | None, counts: dict[str, int]
+) -> StoryCluster:
+    if duplicates is None:
+        return assign_item_to_cluster(db, row, engine)
+
+    cluster = _duplicate_cluster(db, row, duplicates, counts)
+    if cluster is None:
+        cluster = assign_item_to_cluster(db, row, engine)
+
+    duplicates.add(row.dedupe_key, row.simhash, cluster.id)
+    return cluster
+
+
+def _duplicate_cluster(db: Session, row: SourceItem, duplicates: DuplicateIndex, counts: dict[str, int]) -> StoryCluster | None:
+    match = duplicates.match(row.dedupe_key, row.simhash)
+    cluster = db.get(StoryCluster, match.cluster_id) if match else None
+    if cluster is None:
+        return None
+    counts["deduplicated"] += 1
+    return attach_item_to_cluster(db, cluster, row)
+
+
+def _cluster_chunk(
+    db: Session, rows: list[SourceItem], engine: ClusterEngine, duplicates: DuplicateIndex | None, counts: dict[str, int]
+) -> set[str]:
+    if not settings.cluster_batch_mode:
+        # Item-at-a-time clustering cannot order its locks up front, so it serializes on the create lock.
+        acquire_cluster_locks(db, [CREATE_LOCK])
+        return {_cluster_item(db, row, engine, duplicates, counts).id for row in rows}
+
+    batch: list[SourceItem] = []
+    pinned: dict[str, str] = {}
+    # Duplicates of another item in the same chunk follow that item's cluster instead of being scored.
+    followers: dict[str, list[SourceItem]] = {}
+    chunk_duplicates = DuplicateIndex(settings.dedupe_simhash_radius)
+    for row in rows:
+        match = duplicates.match(row.dedupe_key, row.simhash) if duplicates is not None else None
+        if match is not None:
+            counts["deduplicated"] += 1
+            pinned[row.id] = match.cluster_id
+            batch.append(row)
             continue
-        fetched_count += len(raw_items)
 
-        for raw in raw_items:
-            if not connector.validate(raw):
-                continue
+        leader = chunk_duplicates.match(row.dedupe_key, row.simhash) if duplicates is not None else None
+        if leader is not None:
+            counts["deduplicated"] += 1
+            followers.setdefault(leader.cluster_id, []).append(row)
+            continue
+
+        chunk_duplicates.add(row.dedupe_key, row.simhash, row.id)
+        batch.append(row)
+
+    touched: set[str] = set()
+    for row, cluster in zip(batch, assign_items_to_clusters(db, batch, engine, pinned=pinned)):
+        touched.add(cluster.id)
+        row_followers = followers.get(row.id, [])
+        if row_followers:
+            attach_items_to_cluster(db, cluster, [(follower, 1.0) for follower in row_followers])
+        if duplicates is not None:
+            for member in [row, *row_followers]:
+                duplicates.add(member.dedupe_key, member.simhash, cluster.id)
+    return touched
+
+
+@dataclass(slots=True)
+class BatchResult:
+    created_count: int
+    deduplicated_count: int
+    touched_cluster_ids: set[str]
+
+
+def ingest_normalized_batch(
+    db: Session, items: list[tuple[Source, NormalizedItem, dict]], engine: ClusterEngine, duplicates: DuplicateIndex | None
+) -> BatchResult:
+    """Stores and clusters one micro-batch outside a pipeline run (the stream runner); the caller commits."""
+    counts = {"deduplicated": 0}
+    rows: list[SourceItem] = []
+    created_count = 0
+    for source, normalized, raw in items:
+        row, created = _store_raw_item(db, source, normalized, raw)
+        created_count += created
+        rows.append(row)
+    touched = _cluster_chunk(db, rows, engine, duplicates, counts)
+    return BatchResult(created_count, counts["deduplicated"], touched)
+
+
+def run_ingestion_pipeline(
+    db: Session,
+    source_types: list[str] | None = None,
+    summarize: bool = True,
+    resume_run_id: str | None = None,
+    source_ids: list[str] | None = None,
+) -> PipelineResult:
+    run = _start_run(db, source_types, source_ids, resume_run_id)
+    source_types = run.source_filter or None
+    source_ids = (run.stats_json or {}).get("source_ids")
+
+    completed_source_ids = set(run.completed_source_ids or [])
+    query = enabled_sources_query(source_types, source_ids)
+    if settings.websub_enabled:
+        query = query.where(Source.id.not_in(pushed_source_ids()))
+    sources = [source for source in db.scalars(query).all() if source.id not in completed_source_ids]
+
+    counts = {
+        "fetched": run.fetched_count,
+        "normalized": run.normalized_count,
+        "clustered": run.clustered_count,
+        "deduplicated": (run.stats_json or {}).get("deduplicated_count", 0),
+    }
+    touched_cluster_ids: set[str] = set(run.touched_cluster_ids or [])
+    fetch_ms: dict[str, float] = dict((run.stats_json or {}).get("source_fetch_ms") or {})
 
+    stats = RunStats.from_json(run.stats_json)
+    prior_wall_ms = stats.wall_ms
+    execution_started = perf_counter()
+
+    def checkpoint() -> None:
+        stats.wall_ms = prior_wall_ms + (perf_counter() - execution_started) * 1000
+        _checkpoint(db, run, counts, touched_cluster_ids, fetch_ms, stats)
+
+    engine = get_cluster_engine()
+    duplicates: DuplicateIndex | None = None
+    if settings.dedupe_enabled:
+        cutoff = datetime.now(timezone.utc) - timedelta(hours=settings.cluster_window_hours)
+        with stats.stage("cluster"):
+            duplicates = DuplicateIndex.load(db, cutoff, settings.dedupe_simhash_radius)
+
+    buffered: list[SourceItem] = []
+    buffered_source_ids: list[str] = []
+
+    # Every write since the last checkpoint, so a chunk rolled back after a lock timeout can be redone.
+    chunk_writes: list[Callable[[], object]] = []
+
+    def write(operation: Callable[[], object]) -> object:
+        chunk_writes.append(operation)
+        return operation()
+
+    def store(source: Source, normalized: NormalizedItem, raw: dict) -> bool:
+        row, created = _store_raw_item(db, source, normalized, raw)
+        buffered.append(row)
+        return created
+
+    def cluster_buffered() -> set[str]:
+        attempt = 0
+        while True:
+            attempt_counts = {"deduplicated": 0}
             try:
-                normalized = connector.normalize(source, raw)
-            except Exception:
+                touched = _cluster_chunk(db, buffered, engine, duplicates, attempt_counts)
+            except ClusterLockTimeout:
+                # Releases every lock the attempt held, then redoes the chunk's writes in a fresh transaction.
+                db.rollback()
+                if attempt >= settings.cluster_lock_retries:
+                    raise
+                sleep(random.uniform(0, CLUSTER_RETRY_BACKOFF_SECONDS * 2**attempt))
+                attempt += 1
+                buffered.clear()
+                for operation in chunk_writes:
+                    operation()
                 continue
+            counts["deduplicated"] += attempt_counts["deduplicated"]
+            return touched
+
+    def flush_chunk() -> None:
+        with stats.stage("cluster"):
+            touched_cluster_ids.update(cluster_buffered())
+        counts["clustered"] += len(buffered)
+        buffered.clear()
+        # A source only counts as done once all of its items are clustered and committed.
+        run.completed_source_ids = [*(run.completed_source_ids or []), *buffered_source_ids]
+        buffered_source_ids.clear()
+        checkpoint()
+        chunk_writes.clear()
 
-            external_id = normalized.external_id
-            raw_existing = db.scalar(
-                select(RawIngestedItem).where(RawIngestedItem.source_id == source.id, RawIngestedItem.external_id == external_id)
-            )
-            if raw_existing:
-                raw_existing.payload_json = raw
-                raw_record = raw_existing
+    fetchable = [(source, connector) for source in sources if (connector := get_connector(source.source_type)) is not None]
+    upcoming = iter(fetchable)
+    cursor_rows = {
+        row.source_id: row
+        for row in db.scalars(select(SourceCursor).where(SourceCursor.source_id.in_([source.id for source, _ in fetchable])))
+    }
+    # Rate-limit waits and retries stop here; sources still throttled after it are skipped for this run.
+    deadline = monotonic() + settings.ingestion_run_deadline_seconds
+    pending: deque[tuple[Source, SourceConnector, FetchCursor, Callable[[], FetchOutcome]]] = deque()
+    depth = settings.ingestion_fetch_concurrency
+    fetch_pool = ThreadPoolExecutor(max_workers=depth, thread_name_prefix="fetch") if depth > 1 else None
+
+    def fetch_ahead() -> None:
+        # Keep up to `depth` fetches in flight while earlier sources are normalized and clustered.
+        while len(pending) < depth and (next_source := next(upcoming, None)) is not None:
+            source, connector = next_source
+            if not begin_fetch(db, source.id, datetime.now(timezone.utc)):
+                retry_at = db.get(SourceHealth, source.id).retry_at
+                skipped = FetchOutcome([], f"CircuitOpen: retrying after {retry_at.isoformat()}", 0.0, 0, circuit_open=True)
+                pending.append((source, connector, FetchCursor(), lambda skipped=skipped: skipped))
+                continue
+            # Loaded here, on the session's thread; the fetch itself may run on a worker.
+            cursor = _fetch_cursor(cursor_rows.get(source.id), _known_external_ids(db, source.id))
+            if fetch_pool is None:
+                pending.append((source, connector, cursor, partial(_fetch_source, connector, source, cursor, deadline)))
             else:
-                raw_record = RawIngestedItem(source_id=source.id, external_id=external_id, payload_json=raw)
-                db.add(raw_record)
-                db.flush()
+                pending.append((source, connector, cursor, fetch_pool.submit(_fetch_source, connector, source, cursor, deadline).result))
+
+    try:
+        fetch_ahead()
+        while pending:
+            source, connector, cursor, fetched = pending.popleft()
+            with stats.stage("fetch"):
+                fetch_ahead()
+                outcome = fetched()
+            raw_items, error = outcome.items, outcome.error
+            fetch_ms[source.id] = outcome.fetch_ms
+            stats.bytes_downloaded += outcome.bytes_downloaded
+            # Skipped or throttled fetches say nothing about whether the source itself is healthy.
+            if not (outcome.circuit_open or outcome.throttled):
+                write(partial(record_fetch, db, source.id, outcome.fetch_ms, error, datetime.now(timezone.utc)))
+            counts["fetched"] += len(raw_items)
+
+            normalized_count = 0
+            created_count = 0
+            skipped_count = 0
+            newest: NormalizedItem | None = None
+            for raw in raw_items:
+                with stats.stage("normalize"):
+                    if not connector.validate(raw):
+                        continue
+                    try:
+                        normalized = connector.normalize(source, raw)
+                    except Exception:
+                        continue
+                    # Connectors that cannot ask upstream for only newer content still return old items.
+                    if connector.cursor_filter and cursor.is_behind(normalized.external_id, normalized.published_at):
+                        skipped_count += 1
+                        continue
+                    # An undated item was stamped with the fetch time, which says nothing about where the feed is.
+                    if not normalized.published_at_estimated and (newest is None or normalized.published_at > newest.published_at):
+                        newest = normalized
 
-            row, created = _upsert_source_item(db, normalized, raw_record.id)
-            if created:
+                with stats.stage("upsert"):
+                    created = write(partial(store, source, normalized, raw))
                 normalized_count += 1
-            cluster = assign_item_to_cluster(db, row)
-            touched_cluster_ids.add(cluster.id)
-            clustered_count += 1
+                if created:
+                    created_count += 1
+                    counts["normalized"] += 1
+                if len(buffered) >= settings.ingestion_chunk_size:
+                    flush_chunk()
 
-    for cluster_id in touched_cluster_ids:
-        cluster = db.get(StoryCluster, cluster_id)
-        if cluster is None:
-            continue
-        summarize_cluster(db, cluster)
+            source_stats = {
+                "fetch_ms": fetch_ms[source.id],
+                "bytes_downloaded": outcome.bytes_downloaded or None,
+                "fetched_count": len(raw_items),
+                "normalized_count": normalized_count,
+                "created_count": created_count,
+                "skipped_count": skipped_count,
+                "error": error,
+            }
+            write(partial(_record_source_stats, db, run, source, source_stats))
+            if newest is not None:
+                write(partial(_advance_cursor, db, source.id, newest))
+            buffered_source_ids.append(source.id)
+            if not buffered:
+                flush_chunk()
+
+        flush_chunk()
+
+        if summarize:
+            with stats.stage("summarize"):
+                for cluster_id in sorted(touched_cluster_ids):
+                    cluster = db.get(StoryCluster, cluster_id)
+                    if cluster is None:
+                        continue
+                    summarize_cluster(db, cluster)
+    except Exception:
+        db.rollback()
+        run.status = "failed"
+        db.commit()
+        raise
+    finally:
+        if fetch_pool is not None:
+            fetch_pool.shutdown(cancel_futures=True)
 
-    run.fetched_count = fetched_count
-    run.normalized_count = normalized_count
-    run.clustered_count = clustered_count
     run.status = "completed"
     run.completed_at = datetime.now(timezone.utc)
-    db.commit()
+    checkpoint()
 
     return PipelineResult(
-        fetched_count=fetched_count,
-        normalized_count=normalized_count,
-        clustered_count=clustered_count,
+        run_id=run.id,
+        fetched_count=counts["fetched"],
+        normalized_count=counts["normalized"],
+        clustered_count=counts["clustered"],
+        deduplicated_count=counts["deduplicated"],
+        dirty_cluster_ids=sorted(touched_cluster_ids),
+        stats={**stats.to_json(counts["clustered"]), "sources": _source_stats_payload(db, run.id)},
     )
@@ -1,7 +1,24 @@
+from prometheus_client.core import GaugeMetricFamily
 from rq import Queue
 
+from app.core.config import settings
+from app.core.metrics import register_live_collector
 from app.core.redis_client import get_redis
 
 
-def get_queue(name: str = "pulsewire") -> Queue:
-    return Queue(name=name, connection=get_redis(decode_responses=False))
+def get_queue(name: str | None = None) -> Queue:
+    return Queue(name=name or settings.ingestion_queue_name, connection=get_redis(decode_responses=False))
+
+
+class QueueDepthCollector:
+    def collect(self):
+        depth = GaugeMetricFamily("pulsewire_queue_jobs", "Jobs waiting in each RQ queue.", labels=["queue"])
+        for name in (settings.ingestion_queue_name, settings.summarization_queue_name):
+            try:
+                depth.add_metric([name], get_queue(name).count)
+            except Exception:
+                continue
+        yield depth
+
+
+register_live_collector(QueueDepthCollector())
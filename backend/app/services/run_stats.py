@@ -0,0 +1,86 @@
+from __future__ import annotations
+
+from collections.abc import Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import asdict, dataclass, field
+from time import perf_counter, thread_time
+
+from app.db.query_stats import track_queries
+
+PIPELINE_STAGES = ("fetch", "normalize", "upsert", "cluster", "commit", "summarize")
+
+_download_counters: ContextVar[tuple[list[int], ...]] = ContextVar("download_counters", default=())
+
+
+def record_bytes_downloaded(size: int) -> None:
+    for counter in _download_counters.get():
+        counter[0] += size
+
+
+@contextmanager
+def count_downloads() -> Iterator[list[int]]:
+    # Connectors that see the response body report it; the counter stays at zero otherwise.
+    counter = [0]
+    token = _download_counters.set((*_download_counters.get(), counter))
+    try:
+        yield counter
+    finally:
+        _download_counters.reset(token)
+
+
+@dataclass(slots=True)
+class StageStats:
+    calls: int = 0
+    wall_ms: float = 0.0
+    cpu_ms: float = 0.0
+    db_queries: int = 0
+    db_ms: float = 0.0
+
+
+@dataclass(slots=True)
+class RunStats:
+    stages: dict[str, StageStats] = field(default_factory=lambda: {name: StageStats() for name in PIPELINE_STAGES})
+    bytes_downloaded: int = 0
+    wall_ms: float = 0.0
+
+    @classmethod
+    def from_json(cls, payload: dict | None) -> RunStats:
+        stats = cls()
+        payload = payload or {}
+        for name, values in (payload.get("stages") or {}).items():
+            stats.stages[name] = StageStats(**values)
+        totals = payload.get("totals") or {}
+        stats.bytes_downloaded = totals.get("bytes_downloaded", 0)
+        stats.wall_ms = totals.get("wall_ms", 0.0)
+        return stats
+
+    @contextmanager
+    def stage(self, name: str) -> Iterator[None]:
+        stage = self.stages.setdefault(name, StageStats())
+        wall_started, cpu_started = perf_counter(), thread_time()
+        with track_queries() as queries:
+            try:
+                yield
+            finally:
+                stage.calls += 1
+                stage.wall_ms += (perf_counter() - wall_started) * 1000
+                stage.cpu_ms += (thread_time() - cpu_started) * 1000
+                stage.db_queries += queries.count
+                stage.db_ms += queries.duration_ms
+
+    def to_json(self, item_count: int) -> dict:
+        seconds = self.wall_ms / 1000
+        return {
+            "stages": {
+                name: {key: round(value, 2) if isinstance(value, float) else value for key, value in asdict(stage).items()}
+                for name, stage in self.stages.items()
+            },
+            "totals": {
+                "wall_ms": round(self.wall_ms, 2),
+                "db_queries": sum(stage.db_queries for stage in self.stages.values()),
+                "db_ms": round(sum(stage.db_ms for stage in self.stages.values()), 2),
+                "bytes_downloaded": self.bytes_downloaded,
+                "items_per_second": round(item_count / seconds, 2) if seconds > 0 else 0.0,
+            },
+        }
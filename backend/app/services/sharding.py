@@ -0,0 +1,108 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from hashlib import sha1
+
+from sqlalchemy import delete, select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from app.db.models import IngestionRun, IngestionShardPlan, SourceHealth
+from app.services.source_health import is_open
+
+DEFAULT_FETCH_COST_MS = 1000.0
+# Plans are only read while their execution's tasks start up.
+SHARD_PLAN_RETENTION = timedelta(days=1)
+
+
+@dataclass(slots=True)
+class ShardAssignment:
+    task_index: int
+    task_count: int
+    source_ids: list[str]
+    estimated_cost_ms: float
+
+
+def stable_source_hash(source_id: str) -> int:
+    return int.from_bytes(sha1(source_id.encode("utf-8")).digest()[:8], "big")
+
+
+def load_fetch_costs(db: Session, run_limit: int = 20) -> dict[str, float]:
+    runs = db.scalars(
+        select(IngestionRun)
+        .where(IngestionRun.status == "completed")
+        .order_by(IngestionRun.started_at.desc())
+        .limit(run_limit)
+    ).all()
+
+    samples: dict[str, list[float]] = {}
+    for run in runs:
+        for source_id, fetch_ms in ((run.stats_json or {}).get("source_fetch_ms") or {}).items():
+            samples.setdefault(source_id, []).append(float(fetch_ms))
+    costs = {source_id: sum(values) / len(values) for source_id, values in samples.items()}
+
+    # The health EWMA tracks recent fetches more closely than a run average; open circuits cost nothing.
+    now = datetime.now(timezone.utc)
+    for health in db.scalars(select(SourceHealth)):
+        if is_open(health, now):
+            costs[health.source_id] = 0.0
+        elif health.latency_ewma_ms is not None:
+            costs[health.source_id] = health.latency_ewma_ms
+    return costs
+
+
+def shard_sources(source_ids: list[str], task_count: int, costs: dict[str, float] | None = None) -> list[ShardAssignment]:
+    if task_count < 1:
+        raise ValueError("task_count must be at least 1")
+
+    costs = costs or {}
+    known_costs = [value for value in costs.values() if value > 0]
+    fallback_cost = sum(known_costs) / len(known_costs) if known_costs else DEFAULT_FETCH_COST_MS
+
+    shards = [ShardAssignment(task_index=index, task_count=task_count, source_ids=[], estimated_cost_ms=0.0) for index in range(task_count)]
+
+    # Longest-processing-time first: heaviest sources land on the currently lightest shard.
+    # Hash order breaks ties so assignments are stable across tasks and executions.
+    ordered = sorted(set(source_ids), key=lambda source_id: (-costs.get(source_id, fallback_cost), stable_source_hash(source_id)))
+    for source_id in ordered:
+        target = min(shards, key=lambda shard: (shard.estimated_cost_ms, (stable_source_hash(source_id) + shard.task_index) % task_count))
+        target.source_ids.append(source_id)
+        target.estimated_cost_ms += costs.get(source_id, fallback_cost)
+
+    for shard in shards:
+        shard.source_ids.sort()
+    return shards
+
+
+def execution_shards(db: Session, execution_id: str, source_ids: list[str], task_count: int) -> list[ShardAssignment]:
+    """One partition per execution: the first task to get here computes and stores it, the others read it back.
+
+    Costs come from live run history and source health, so tasks that start at different times would
+    otherwise see different costs and could overlap or miss sources.
+    """
+    plan = db.get(IngestionShardPlan, execution_id)
+    if plan is None:
+        shards = shard_sources(source_ids, task_count, load_fetch_costs(db))
+        db.execute(delete(IngestionShardPlan).where(IngestionShardPlan.created_at < datetime.now(timezone.utc) - SHARD_PLAN_RETENTION))
+        db.add(
+            IngestionShardPlan(
+                execution_id=execution_id,
+                task_count=task_count,
+                shards_json=[{"source_ids": shard.source_ids, "estimated_cost_ms": shard.estimated_cost_ms} for shard in shards],
+            )
+        )
+        try:
+            db.commit()
+            return shards
+        except IntegrityError:
+            # Another task stored the plan first.
+            db.rollback()
+            plan = db.get(IngestionShardPlan, execution_id)
+
+    if plan.task_count != task_count:
+        raise ValueError(f"Execution {execution_id} was planned for {plan.task_count} tasks, not {task_count}")
+    return [
+        ShardAssignment(task_index=index, task_count=plan.task_count, source_ids=shard["source_ids"], estimated_cost_ms=shard["estimated_cost_ms"])
+        for index, shard in enumerate(plan.shards_json)
+    ]
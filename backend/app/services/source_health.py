@@ -0,0 +1,61 @@
+from __future__ import annotations
+
+from datetime import datetime, timedelta
+
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.db.models import SourceHealth
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+def is_open(row: SourceHealth | None, now: datetime) -> bool:
+    return row is not None and row.state == OPEN and row.retry_at is not None and now < row.retry_at
+
+
+def begin_fetch(db: Session, source_id: str, now: datetime) -> bool:
+    """Returns False while the circuit is open; once the cooldown has passed the next fetch is a half-open probe."""
+    # Rows are looked up per call: pipeline checkpoints expunge anything loaded before them.
+    row = db.get(SourceHealth, source_id)
+    if row is None or row.state == CLOSED:
+        return True
+    if is_open(row, now):
+        return False
+    row.state = HALF_OPEN
+    return True
+
+
+def _cooldown_seconds(failures: int) -> int:
+    # Each failed probe after tripping doubles the wait, up to the cap.
+    trips = max(0, failures - settings.source_breaker_failure_threshold)
+    return min(settings.source_breaker_cooldown_seconds * 2 ** min(trips, 16), settings.source_breaker_max_cooldown_seconds)
+
+
+def record_fetch(db: Session, source_id: str, fetch_ms: float, error: str | None, now: datetime) -> SourceHealth:
+    row = db.get(SourceHealth, source_id)
+    if row is None:
+        row = SourceHealth(source_id=source_id, state=CLOSED, consecutive_failures=0)
+        db.add(row)
+        db.flush()
+
+    alpha = settings.source_latency_ewma_alpha
+    previous = row.latency_ewma_ms
+    row.latency_ewma_ms = fetch_ms if previous is None else round(alpha * fetch_ms + (1 - alpha) * previous, 1)
+
+    if error is None:
+        row.state = CLOSED
+        row.consecutive_failures = 0
+        row.last_success_at = now
+        row.retry_at = None
+        return row
+
+    row.consecutive_failures += 1
+    row.last_error = error
+    row.last_failure_at = now
+    if row.state == HALF_OPEN or row.consecutive_failures >= settings.source_breaker_failure_threshold:
+        row.state = OPEN
+        row.retry_at = now + timedelta(seconds=_cooldown_seconds(row.consecutive_failures))
+    return row
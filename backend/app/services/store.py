@@ -3,6 +3,7 @@ from datetime import datetime, timezone
 from pathlib import Path
 
 from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
 from app.db.models import Category, ClusterItem, Source, SourceItem, StoryCluster, Summary
@@ -66,6 +67,10 @@ def seeded_stories() -> list[StoryDetail]:
     ]
 
 
+def seeded_cards(limit: int) -> list[dict]:
+    return [story.model_dump(exclude={"long_summary", "sources"}) for story in seeded_stories()[:limit]]
+
+
 def get_categories(db: Session) -> list[dict]:
     rows = db.scalars(select(Category).order_by(Category.name.asc())).all()
     if not rows:
@@ -73,19 +78,24 @@ def get_categories(db: Session) -> list[dict]:
     return [{"slug": row.slug, "name": row.name} for row in rows]
 
 
-def _category_name(db: Session, category_id: str | None) -> str:
-    if not category_id:
-        return "Breaking News"
-    category = db.get(Category, category_id)
-    return category.name if category else "Breaking News"
+def _category_names(db: Session, category_ids: set[str | None]) -> dict[str | None, str]:
+    ids = {category_id for category_id in category_ids if category_id}
+    rows = db.execute(select(Category.id, Category.name).where(Category.id.in_(ids))).all() if ids else []
+    return {row.id: row.name for row in rows}
 
 
-def _latest_summary(db: Session, cluster_id: str) -> Summary | None:
-    return db.scalar(
+def _latest_summaries(db: Session, cluster_ids: list[str]) -> dict[str, Summary]:
+    if not cluster_ids:
+        return {}
+    rows = db.scalars(
         select(Summary)
-        .where(Summary.cluster_id == cluster_id, Summary.invalidated_at.is_(None))
+        .where(Summary.cluster_id.in_(cluster_ids), Summary.invalidated_at.is_(None))
         .order_by(Summary.generated_at.desc())
-    )
+    ).all()
+    latest: dict[str, Summary] = {}
+    for row in rows:
+        latest.setdefault(row.cluster_id, row)
+    return latest
 
 
 def get_story_cards(db: Session, limit: int, status: str | None = None, category_slug: str | None = None) -> list[StoryCard]:
@@ -102,16 +112,18 @@ def get_story_cards(db: Session, limit: int, status: str | None = None, category
             return []
 
     clusters = db.scalars(query).all()
+    summaries = _latest_summaries(db, [cluster.id for cluster in clusters])
+    category_names = _category_names(db, {cluster.primary_category_id for cluster in clusters})
     cards: list[StoryCard] = []
 
     for cluster in clusters:
-        summary = _latest_summary(db, cluster.id)
+        summary = summaries.get(cluster.id)
         cards.append(
             StoryCard(
                 id=cluster.id,
                 headline=cluster.headline,
                 short_summary=summary.short_summary if summary else "Summary pending.",
-                primary_category=_category_name(db, cluster.primary_category_id),
+                primary_category=category_names.get(cluster.primary_category_id, "Breaking News"),
                 status=cluster.status,
                 source_count=cluster.source_count,
                 last_updated_at=cluster.last_updated_at,
@@ -126,21 +138,23 @@ def get_story_detail(db: Session, story_id: str) -> StoryDetail | None:
     if not cluster:
         return None
 
-    summary = _latest_summary(db, cluster.id)
-    links = db.scalars(select(ClusterItem).where(ClusterItem.cluster_id == cluster.id)).all()
-    item_ids = [link.source_item_id for link in links]
-    items = db.scalars(select(SourceItem).where(SourceItem.id.in_(item_ids))).all() if item_ids else []
-
-    source_by_id = {source.id: source for source in db.scalars(select(Source)).all()}
+    summary = _latest_summaries(db, [cluster.id]).get(cluster.id)
+    rows = db.execute(
+        select(SourceItem.canonical_url, SourceItem.published_at, Source.name, Source.source_type)
+        .join(ClusterItem, ClusterItem.source_item_id == SourceItem.id)
+        .outerjoin(Source, Source.id == SourceItem.source_id)
+        .where(ClusterItem.cluster_id == cluster.id)
+        .order_by(SourceItem.published_at.desc())
+    ).all()
 
     sources = [
         {
-            "source_name": source_by_id[item.source_id].name if item.source_id in source_by_id else "Unknown",
-            "source_type": source_by_id[item.source_id].source_type if item.source_id in source_by_id else "unknown",
-            "url": item.canonical_url,
-            "published_at": item.published_at,
+            "source_name": row.name or "Unknown",
+            "source_type": row.source_type or "unknown",
+            "url": row.canonical_url,
+            "published_at": row.published_at,
         }
-        for item in sorted(items, key=lambda row: row.published_at, reverse=True)
+        for row in rows
     ]
 
     return StoryDetail(
@@ -148,9 +162,25 @@ def get_story_detail(db: Session, story_id: str) -> StoryDetail | None:
         headline=cluster.headline,
         short_summary=summary.short_summary if summary else "Summary pending.",
         long_summary=summary.long_summary if summary else "Summary pending.",
-        primary_category=_category_name(db, cluster.primary_category_id),
+        primary_category=_category_names(db, {cluster.primary_category_id}).get(cluster.primary_category_id, "Breaking News"),
         status=cluster.status,
         source_count=cluster.source_count,
         last_updated_at=cluster.last_updated_at,
         sources=sources,
     )
+
+
+# Async read path: the same queries, run through the async engine's driver. run_sync executes them in a
+# greenlet, so the event loop is free while Postgres answers and no threadpool thread is held.
+async def get_categories_async(db: AsyncSession) -> list[dict]:
+    return await db.run_sync(get_categories)
+
+
+async def get_story_cards_async(
+    db: AsyncSession, limit: int, status: str | None = None, category_slug: str | None = None
+) -> list[StoryCard]:
+    return await db.run_sync(get_story_cards, limit, status, category_slug)
+
+
+async def get_story_detail_async(db: AsyncSession, story_id: str) -> StoryDetail | None:
+    return await db.run_sync(get_story_detail, story_id)
@@ -0,0 +1,210 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+from collections.abc import Callable, Iterable
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
+from time import monotonic
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session, sessionmaker
+
+from app.core.config import settings
+from app.db.models import Source, SourceCursor, StoryCluster
+from app.services.clustering.dedupe import DuplicateIndex
+from app.services.clustering.service import get_cluster_engine
+from app.services.ingestion.models import NormalizedItem
+from app.services.ingestion.ratelimit import backoff_seconds
+from app.services.ingestion.streaming import StreamEvent, StreamingConnector
+from app.services.pipeline import ingest_normalized_batch
+from app.services.summarization.service import summarize_cluster
+
+logger = logging.getLogger("pulsewire.stream")
+
+# How often an idle batcher re-checks the stop event.
+IDLE_POLL_SECONDS = 0.5
+
+
+@dataclass(slots=True)
+class StreamStats:
+    received: int = 0
+    batches: int = 0
+    created: int = 0
+    deduplicated: int = 0
+    invalid: int = 0
+    reconnects: int = 0
+    failed_batches: int = 0
+    dirty_cluster_ids: set[str] = field(default_factory=set)
+
+    def to_json(self) -> dict:
+        return {
+            "received": self.received,
+            "batches": self.batches,
+            "created": self.created,
+            "deduplicated": self.deduplicated,
+            "invalid": self.invalid,
+            "reconnects": self.reconnects,
+            "failed_batches": self.failed_batches,
+            "dirty_clusters": len(self.dirty_cluster_ids),
+        }
+
+
+QueuedEvent = tuple[Source, StreamingConnector, StreamEvent]
+
+
+class StreamRunner:
+    """Keeps one stream per source open and feeds their events through normalize -> upsert -> cluster in micro-batches.
+
+    A batch is flushed at ``stream_batch_size`` events or ``stream_batch_max_wait_ms`` after its first event,
+    whichever comes first. Each source's resume token is committed with the batch that stored its events, and a
+    failed batch is retried with backoff until it commits or the runner stops.
+    """
+
+    def __init__(self, session_factory: sessionmaker, publish: Callable[[list[str]], object] | None = None) -> None:
+        self.session_factory = session_factory
+        self.publish = publish
+        self.stats = StreamStats()
+        self._engine = get_cluster_engine()
+        self._duplicates: DuplicateIndex | None = None
+        self._duplicates_loaded_at: float | None = None
+
+    def _load_state(self, source_ids: list[str]) -> dict[str, str | None]:
+        with self.session_factory() as db:
+            self._refresh_duplicates(db)
+            rows = db.scalars(select(SourceCursor).where(SourceCursor.source_id.in_(source_ids)))
+            return {row.source_id: row.resume_token for row in rows}
+
+    def _refresh_duplicates(self, db: Session) -> None:
+        # A reload drops items that have left the clustering window, which the index can't do in place.
+        if not settings.dedupe_enabled:
+            return
+        loaded_at = self._duplicates_loaded_at
+        if loaded_at is not None and monotonic() - loaded_at < settings.stream_dedupe_refresh_seconds:
+            return
+        cutoff = datetime.now(timezone.utc) - timedelta(hours=settings.cluster_window_hours)
+        self._duplicates = DuplicateIndex.load(db, cutoff, settings.dedupe_simhash_radius)
+        self._duplicates_loaded_at = monotonic()
+
+    async def run(self, streams: Iterable[tuple[Source, StreamingConnector]], stop: asyncio.Event) -> StreamStats:
+        streams = list(streams)
+        tokens = await asyncio.to_thread(self._load_state, [source.id for source, _ in streams])
+        queue: asyncio.Queue[QueuedEvent] = asyncio.Queue(maxsize=settings.stream_queue_size)
+        readers = [asyncio.create_task(self._read(source, connector, tokens.get(source.id), queue, stop)) for source, connector in streams]
+        try:
+            await self._batch(queue, stop)
+        finally:
+            for reader in readers:
+                reader.cancel()
+            await asyncio.gather(*readers, return_exceptions=True)
+        return self.stats
+
+    async def _read(
+        self, source: Source, connector: StreamingConnector, token: str | None, queue: asyncio.Queue[QueuedEvent], stop: asyncio.Event
+    ) -> None:
+        attempt = 0
+        while not stop.is_set():
+            try:
+                async for event in connector.stream(source, token):
+                    attempt = 0
+                    await queue.put((source, connector, event))
+                    token = event.resume_token or token
+                logger.info("stream for %s closed by upstream", source.id)
+            except Exception as exc:
+                logger.warning("stream for %s failed: %s: %s", source.id, type(exc).__name__, exc)
+            if stop.is_set():
+                return
+            self.stats.reconnects += 1
+            delay = backoff_seconds(attempt)
+            attempt += 1
+            try:
+                await asyncio.wait_for(stop.wait(), timeout=delay)
+            except TimeoutError:
+                pass
+
+    async def _batch(self, queue: asyncio.Queue[QueuedEvent], stop: asyncio.Event) -> None:
+        loop = asyncio.get_running_loop()
+        while not (stop.is_set() and queue.empty()):
+            try:
+                batch = [await asyncio.wait_for(queue.get(), timeout=IDLE_POLL_SECONDS)]
+            except TimeoutError:
+                continue
+            flush_at = loop.time() + settings.stream_batch_max_wait_ms / 1000
+            while len(batch) < settings.stream_batch_size:
+                remaining = flush_at - loop.time()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(queue.get(), timeout=remaining))
+                except TimeoutError:
+                    break
+            if not await self._ingest_with_retry(batch, stop):
+                # Later batches would commit resume tokens past the dropped events.
+                return
+
+    async def _ingest_with_retry(self, batch: list[QueuedEvent], stop: asyncio.Event) -> bool:
+        attempt = 0
+        while True:
+            try:
+                # DB and clustering work is synchronous; one batch at a time keeps the duplicate index single-threaded.
+                await asyncio.to_thread(self._ingest, batch)
+                return True
+            except Exception as exc:
+                self.stats.failed_batches += 1
+                # The index may hold entries from the rolled-back batch.
+                self._duplicates_loaded_at = None
+                logger.warning("stream batch of %d events failed: %s: %s", len(batch), type(exc).__name__, exc)
+            if stop.is_set():
+                # Its resume tokens were never committed, so the next run is sent these events again.
+                logger.warning("dropping a failed stream batch of %d events on shutdown", len(batch))
+                return False
+            delay = backoff_seconds(attempt)
+            attempt += 1
+            try:
+                await asyncio.wait_for(stop.wait(), timeout=delay)
+            except TimeoutError:
+                pass
+
+    def _ingest(self, batch: list[QueuedEvent]) -> None:
+        items: list[tuple[Source, NormalizedItem, dict]] = []
+        tokens: dict[str, str] = {}
+        invalid = 0
+        for source, connector, event in batch:
+            if event.resume_token:
+                tokens[source.id] = event.resume_token
+            if not connector.validate(event.raw):
+                invalid += 1
+                continue
+            try:
+                items.append((source, connector.normalize(source, event.raw), event.raw))
+            except Exception:
+                invalid += 1
+
+        # Leaving the session without committing rolls back the batch and its resume tokens together.
+        with self.session_factory() as db:
+            self._refresh_duplicates(db)
+            result = ingest_normalized_batch(db, items, self._engine, self._duplicates)
+            self._save_tokens(db, tokens)
+            if self.publish is None:
+                for cluster_id in sorted(result.touched_cluster_ids):
+                    cluster = db.get(StoryCluster, cluster_id)
+                    if cluster is not None:
+                        summarize_cluster(db, cluster)
+            db.commit()
+
+        self.stats.received += len(batch)
+        self.stats.invalid += invalid
+        self.stats.batches += 1
+        self.stats.created += result.created_count
+        self.stats.deduplicated += result.deduplicated_count
+        self.stats.dirty_cluster_ids.update(result.touched_cluster_ids)
+        if self.publish is not None and result.touched_cluster_ids:
+            self.publish(sorted(result.touched_cluster_ids))
+
+    def _save_tokens(self, db: Session, tokens: dict[str, str]) -> None:
+        for source_id, token in tokens.items():
+            row = db.get(SourceCursor, source_id)
+            if row is None:
+                row = SourceCursor(source_id=source_id)
+                db.add(row)
+            row.resume_token = token
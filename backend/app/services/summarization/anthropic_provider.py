@@ -46,4 +46,6 @@ class AnthropicProvider(SummarizerProvider):
             long_summary=text,
             changes_bullets=evidence[:3],
             why_it_matters="The update reflects corroboration from independent curated feeds.",
+            input_tokens=getattr(message.usage, "input_tokens", None),
+            output_tokens=getattr(message.usage, "output_tokens", None),
         )
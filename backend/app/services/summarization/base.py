@@ -12,6 +12,8 @@ class SummaryDraft:
     long_summary: str
     changes_bullets: list[str]
     why_it_matters: str | None
+    input_tokens: int | None = None
+    output_tokens: int | None = None
 
 
 class SummarizerProvider(ABC):
@@ -36,4 +36,6 @@ class OpenAIProvider(SummarizerProvider):
             long_summary=text,
             changes_bullets=evidence[:3],
             why_it_matters="This cluster includes corroboration from manually curated feeds.",
+            input_tokens=getattr(response.usage, "input_tokens", None),
+            output_tokens=getattr(response.usage, "output_tokens", None),
         )
@@ -1,9 +1,12 @@
 from __future__ import annotations
 
+from time import perf_counter
+
 from sqlalchemy import select
 from sqlalchemy.orm import Session
 
 from app.core.config import settings
+from app.core.metrics import LLM_REQUEST_SECONDS, LLM_TOKENS
 from app.db.models import ClusterItem, SourceItem, StoryCluster, Summary
 from app.services.summarization.anthropic_provider import AnthropicProvider
 from app.services.summarization.base import SummaryDraft, SummarizerProvider
@@ -32,6 +35,23 @@ def get_provider() -> SummarizerProvider:
     return StubProvider()
 
 
+def _summarize_with_metrics(provider: SummarizerProvider, headline: str, evidence: list[str]) -> SummaryDraft:
+    started = perf_counter()
+    try:
+        draft = provider.summarize(headline, evidence)
+    except Exception:
+        LLM_REQUEST_SECONDS.labels(provider=provider.provider_name, model="unknown", outcome="error").observe(
+            perf_counter() - started
+        )
+        raise
+
+    LLM_REQUEST_SECONDS.labels(provider=draft.provider, model=draft.model, outcome="ok").observe(perf_counter() - started)
+    for kind, tokens in (("input", draft.input_tokens), ("output", draft.output_tokens)):
+        if tokens:
+            LLM_TOKENS.labels(provider=draft.provider, model=draft.model, kind=kind).inc(tokens)
+    return draft
+
+
 def summarize_cluster(db: Session, cluster: StoryCluster) -> Summary:
     links = db.scalars(select(ClusterItem).where(ClusterItem.cluster_id == cluster.id)).all()
     source_item_ids = [link.source_item_id for link in links]
@@ -39,7 +59,7 @@ def summarize_cluster(db: Session, cluster: StoryCluster) -> Summary:
 
     evidence = [f"{item.title} ({item.canonical_url})" for item in sorted(items, key=lambda row: row.published_at, reverse=True)]
     provider = get_provider()
-    draft = provider.summarize(cluster.headline, evidence)
+    draft = _summarize_with_metrics(provider, cluster.headline, evidence)
 
     latest_summary = db.scalar(
         select(Summary)
@@ -0,0 +1,203 @@
+from __future__ import annotations
+
+import hmac
+import secrets
+import xml.etree.ElementTree as ET
+from datetime import datetime, timedelta, timezone
+
+import httpx
+from sqlalchemy import Select, select
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.db.models import RawIngestedItem, Source, WebSubSubscription
+from app.services.ingestion.feeds import fetch_feed_bytes, iter_feed_entries
+from app.services.ingestion.registry import get_connector
+
+YOUTUBE_HUB_URL = "https://pubsubhubbub.appspot.com/subscribe"
+
+PENDING = "pending"
+VERIFIED = "verified"
+UNSUBSCRIBING = "unsubscribing"
+UNSUBSCRIBED = "unsubscribed"
+DENIED = "denied"
+
+SIGNATURE_ALGORITHMS = {"sha1", "sha256", "sha384", "sha512"}
+
+
+class WebSubError(RuntimeError):
+    pass
+
+
+def callback_url(source_id: str) -> str:
+    if not settings.websub_callback_base_url:
+        raise WebSubError("WEBSUB_CALLBACK_BASE_URL is not set")
+    return f"{settings.websub_callback_base_url.rstrip('/')}/v1/websub/{source_id}"
+
+
+def _advertised_links(content: bytes) -> tuple[str | None, str | None]:
+    hub = topic = None
+    for element in ET.fromstring(content).iter():
+        if element.tag.rsplit("}", 1)[-1] != "link":
+            continue
+        rel, href = element.get("rel"), element.get("href")
+        if rel == "hub" and hub is None:
+            hub = href
+        elif rel == "self" and topic is None:
+            topic = href
+    return hub, topic
+
+
+def discover(source: Source) -> tuple[str, str]:
+    """Returns (hub, topic): configured on the source, YouTube's hub, or the feed's own rel="hub"/"self" links."""
+    auth = source.auth_config or {}
+    if auth.get("websub_hub"):
+        return auth["websub_hub"], auth.get("websub_topic") or source.external_ref
+    if source.source_type == "youtube":
+        return YOUTUBE_HUB_URL, source.external_ref
+    try:
+        hub, topic = _advertised_links(fetch_feed_bytes(source.external_ref, source.source_type))
+    except ET.ParseError as exc:
+        raise WebSubError(f"Could not read {source.external_ref}: {exc}") from exc
+    if hub is None:
+        raise WebSubError(f"{source.id} does not advertise a WebSub hub")
+    return hub, topic or source.external_ref
+
+
+def _hub_client() -> httpx.Client:
+    return httpx.Client(timeout=settings.ingestion_timeout_seconds)
+
+
+def request_subscription(db: Session, source: Source, mode: str = "subscribe") -> WebSubSubscription:
+    """Asks the hub to (un)subscribe; the subscription only takes effect once the hub verifies intent."""
+    callback = callback_url(source.id)
+    row = db.get(WebSubSubscription, source.id)
+    if mode == "unsubscribe":
+        if row is None:
+            raise WebSubError(f"{source.id} has no subscription")
+        row.state = UNSUBSCRIBING
+    else:
+        hub, topic = discover(source)
+        if row is None:
+            row = WebSubSubscription(source_id=source.id, hub_url=hub, topic_url=topic, secret=secrets.token_hex(32))
+            db.add(row)
+        row.hub_url, row.topic_url = hub, topic
+        # A renewal keeps the current subscription (and the source off polling) until the hub confirms.
+        if row.state != VERIFIED:
+            row.state = PENDING
+    # Hub callbacks are unauthenticated, so one is only honoured while this request is outstanding.
+    row.requested_at = datetime.now(timezone.utc)
+    # Committed first: hubs may call back to verify before they answer this request.
+    db.commit()
+
+    form = {
+        "hub.callback": callback,
+        "hub.mode": mode,
+        "hub.topic": row.topic_url,
+        "hub.secret": row.secret,
+        "hub.lease_seconds": str(settings.websub_lease_seconds),
+    }
+    try:
+        with _hub_client() as client:
+            response = client.post(row.hub_url, data=form)
+            response.raise_for_status()
+    except httpx.HTTPError:
+        row.requested_at = None
+        db.commit()
+        raise
+    return row
+
+
+def verify_intent(db: Session, source_id: str, mode: str, topic: str, challenge: str, lease_seconds: int | None) -> str | None:
+    """Returns the challenge to echo when the hub's request matches one we made, else None (answered with 404)."""
+    row = db.get(WebSubSubscription, source_id)
+    if row is None or topic != row.topic_url:
+        return None
+
+    now = datetime.now(timezone.utc)
+    outstanding = row.requested_at is not None
+    if mode == "subscribe" and outstanding and row.state in (PENDING, VERIFIED):
+        # The hub picks the lease, but an unbounded one would keep the source off polling indefinitely.
+        lease = min(lease_seconds or settings.websub_lease_seconds, settings.websub_max_lease_seconds)
+        row.state = VERIFIED
+        row.lease_seconds = lease
+        row.verified_at = now
+        row.expires_at = now + timedelta(seconds=lease)
+    elif mode == "unsubscribe" and outstanding and row.state == UNSUBSCRIBING:
+        row.state = UNSUBSCRIBED
+        row.expires_at = None
+    elif mode == "denied" and outstanding:
+        row.state = DENIED
+        row.expires_at = None
+    else:
+        return None
+    row.requested_at = None
+    db.commit()
+    return challenge
+
+
+def signature_valid(secret: str, body: bytes, header: str | None) -> bool:
+    algorithm, _, digest = (header or "").partition("=")
+    if algorithm not in SIGNATURE_ALGORITHMS or not digest:
+        return False
+    expected = hmac.new(secret.encode("utf-8"), body, algorithm).hexdigest()
+    return hmac.compare_digest(expected, digest.lower())
+
+
+def changed_entries(db: Session, source: Source, body: bytes) -> list[dict]:
+    """Entries in a pushed feed document that are new or differ from what is stored for the source."""
+    connector = get_connector(source.source_type)
+    by_id = {connector.entry_id(source, entry): entry for entry in iter_feed_entries([body])}
+    if not by_id:
+        return []
+    stored = dict(
+        db.execute(
+            select(RawIngestedItem.external_id, RawIngestedItem.payload_json).where(
+                RawIngestedItem.source_id == source.id, RawIngestedItem.external_id.in_(list(by_id))
+            )
+        ).all()
+    )
+    return [entry for external_id, entry in by_id.items() if stored.get(external_id) != entry]
+
+
+def receive_notification(db: Session, source_id: str, body: bytes, signature: str | None) -> list[dict] | None:
+    """Returns the changed entries of an authentic notification, or None if it must be ignored."""
+    row = db.get(WebSubSubscription, source_id)
+    source = db.get(Source, source_id)
+    if row is None or source is None or row.state != VERIFIED:
+        return None
+    if not signature_valid(row.secret, body, signature):
+        return None
+    try:
+        entries = changed_entries(db, source, body)
+    except ET.ParseError:
+        return None
+    row.last_notified_at = datetime.now(timezone.utc)
+    db.commit()
+    return entries
+
+
+def pushed_source_ids() -> Select:
+    """Sources a live, verified subscription keeps up to date; polling skips them until the lease lapses."""
+    return select(WebSubSubscription.source_id).where(
+        WebSubSubscription.state == VERIFIED, WebSubSubscription.expires_at > datetime.now(timezone.utc)
+    )
+
+
+def renew_expiring(db: Session) -> dict:
+    horizon = datetime.now(timezone.utc) + timedelta(seconds=settings.websub_renew_before_seconds)
+    rows = db.scalars(
+        select(WebSubSubscription).where(WebSubSubscription.state == VERIFIED, WebSubSubscription.expires_at <= horizon)
+    ).all()
+    renewed, errors = 0, {}
+    for row in rows:
+        source = db.get(Source, row.source_id)
+        if source is None or not source.enabled:
+            continue
+        try:
+            request_subscription(db, source)
+            renewed += 1
+        except Exception as exc:
+            db.rollback()
+            errors[row.source_id] = f"{type(exc).__name__}: {exc}"[:500]
+    return {"due": len(rows), "renewed": renewed, "errors": errors}
@@ -0,0 +1,59 @@
+from __future__ import annotations
+
+import subprocess
+from collections.abc import Iterator
+from contextlib import contextmanager
+from datetime import datetime, timezone
+
+from sqlalchemy import event, inspect
+from sqlalchemy.engine import Engine
+
+from app.db.models import Base
+
+
+def percentile(ordered: list[float], fraction: float) -> float:
+    index = min(len(ordered) - 1, max(0, round(fraction * (len(ordered) - 1))))
+    return ordered[index]
+
+
+@contextmanager
+def patched(target: object, name: str, value: object) -> Iterator[None]:
+    original = getattr(target, name)
+    setattr(target, name, value)
+    try:
+        yield
+    finally:
+        setattr(target, name, original)
+
+
+def _restore_utc(target, *args) -> None:
+    # SQLite drops tzinfo on DateTime(timezone=True); the services compare against aware datetimes.
+    state = inspect(target)
+    for attr in state.mapper.column_attrs:
+        value = state.dict.get(attr.key)
+        if isinstance(value, datetime) and value.tzinfo is None:
+            state.dict[attr.key] = value.replace(tzinfo=timezone.utc)
+
+
+@contextmanager
+def aware_datetimes() -> Iterator[None]:
+    event.listen(Base, "load", _restore_utc, propagate=True)
+    event.listen(Base, "refresh", _restore_utc, propagate=True)
+    try:
+        yield
+    finally:
+        event.remove(Base, "load", _restore_utc)
+        event.remove(Base, "refresh", _restore_utc)
+
+
+def reset_schema(engine: Engine) -> None:
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+
+
+def git_commit() -> str | None:
+    try:
+        completed = subprocess.run(["git", "rev-parse", "HEAD"], capture_output=True, text=True, check=True)
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return completed.stdout.strip()
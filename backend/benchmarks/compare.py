@@ -0,0 +1,49 @@
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+from pathlib import Path
+
+
+def compare_results(baseline: dict, candidate: dict, metric: str = "p50_ms") -> list[dict]:
+    before = {result["name"]: result for result in baseline["results"]}
+    rows = []
+    for result in candidate["results"]:
+        previous = before.get(result["name"])
+        if previous is None or not previous.get(metric):
+            continue
+        rows.append(
+            {
+                "name": result["name"],
+                "baseline": previous[metric],
+                "candidate": result[metric],
+                "ratio": round(result[metric] / previous[metric], 3),
+            }
+        )
+    return rows
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Compare two benchmark result files.")
+    parser.add_argument("baseline", type=Path)
+    parser.add_argument("candidate", type=Path)
+    parser.add_argument("--metric", default="p50_ms", help="Any timing field, e.g. mean_ms or p95_ms.")
+    parser.add_argument("--fail-above", type=float, help="Exit 1 if any ratio exceeds this, e.g. 1.2 for a 20%% slowdown.")
+    args = parser.parse_args(argv)
+
+    baseline = json.loads(args.baseline.read_text(encoding="utf-8"))
+    candidate = json.loads(args.candidate.read_text(encoding="utf-8"))
+    rows = compare_results(baseline, candidate, args.metric)
+
+    print(f"{'benchmark':<40} {'baseline':>12} {'candidate':>12} {'ratio':>8}")
+    for row in rows:
+        print(f"{row['name']:<40} {row['baseline']:>12.3f} {row['candidate']:>12.3f} {row['ratio']:>8.3f}")
+
+    if args.fail_above is not None and any(row["ratio"] > args.fail_above for row in rows):
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
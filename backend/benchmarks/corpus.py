@@ -0,0 +1,149 @@
+from __future__ import annotations
+
+import random
+from dataclasses import asdict, dataclass, field
+from datetime import datetime, timedelta, timezone
+
+from app.db.models import Source
+from app.services.ingestion.base import SourceConnector
+from app.services.ingestion.models import NormalizedItem, utc_now
+from app.services.ingestion.utils import parse_datetime
+
+SYNTHETIC_SOURCE_TYPE = "synthetic"
+
+_ONSETS = ["b", "br", "c", "ch", "d", "dr", "f", "g", "gr", "k", "l", "m", "n", "p", "pr", "r", "s", "st", "t", "tr", "v", "z"]
+_VOWELS = ["a", "e", "i", "o", "u", "ai", "ea", "io", "ou"]
+_CODAS = ["", "n", "r", "s", "t", "nd", "rk", "st", "x", "l"]
+
+
+@dataclass(slots=True)
+class CorpusConfig:
+    sources: int = 20
+    items_per_source: int = 50
+    # Share of items that report one of the shared stories; the rest are one-off items.
+    story_overlap: float = 0.6
+    # Share of items that re-publish another source's item verbatim (same URL), like wire copy.
+    syndication_ratio: float = 0.1
+    time_spread_hours: float = 48.0
+    stories: int | None = None
+    seed: int = 1337
+
+    @property
+    def story_count(self) -> int:
+        return self.stories if self.stories is not None else max(1, self.sources * self.items_per_source // 8)
+
+
+@dataclass(slots=True)
+class Corpus:
+    config: CorpusConfig
+    anchor: datetime
+    sources: list[dict] = field(default_factory=list)
+    items_by_source: dict[str, list[dict]] = field(default_factory=dict)
+
+    @property
+    def item_count(self) -> int:
+        return sum(len(items) for items in self.items_by_source.values())
+
+    def titles(self) -> list[str]:
+        return [item["title"] for items in self.items_by_source.values() for item in items]
+
+    def describe(self) -> dict:
+        return {**asdict(self.config), "item_count": self.item_count}
+
+
+def pseudo_word(rng: random.Random) -> str:
+    return "".join(rng.choice(part) for part in (_ONSETS, _VOWELS, _CODAS, _VOWELS, _CODAS))
+
+
+def _sentence(rng: random.Random, terms: list[str], filler_count: int) -> str:
+    # Filler is drawn fresh per sentence: the clusterer scores raw token overlap, so shared
+    # stop-words would glue unrelated items together.
+    words = [*terms, *(pseudo_word(rng) for _ in range(filler_count))]
+    rng.shuffle(words)
+    return " ".join(words).capitalize()
+
+
+def generate_corpus(config: CorpusConfig, anchor: datetime | None = None) -> Corpus:
+    """Builds a reproducible corpus: the same config always yields the same items, relative to ``anchor``."""
+    rng = random.Random(config.seed)
+    anchor = anchor or datetime.now(timezone.utc)
+    corpus = Corpus(config=config, anchor=anchor)
+
+    stories = [
+        {"terms": [pseudo_word(rng) for _ in range(6)], "offset_hours": rng.uniform(0, config.time_spread_hours)}
+        for _ in range(config.story_count)
+    ]
+    published: list[dict] = []
+
+    for source_index in range(config.sources):
+        source_id = f"syn_{source_index:04d}"
+        corpus.sources.append(
+            {
+                "id": source_id,
+                "source_type": SYNTHETIC_SOURCE_TYPE,
+                "name": f"Synthetic source {source_index}",
+                "external_ref": source_id,
+                "url": f"https://synthetic.example/{source_id}",
+                "category_hints": [],
+            }
+        )
+        items: list[dict] = []
+        for item_index in range(config.items_per_source):
+            external_id = f"{source_id}-{item_index:05d}"
+            roll = rng.random()
+            if published and roll < config.syndication_ratio:
+                original = rng.choice(published)
+                item = {**original, "id": external_id}
+            elif roll < config.syndication_ratio + config.story_overlap:
+                story = rng.choice(stories)
+                offset = story["offset_hours"] + rng.uniform(0, 3)
+                item = {
+                    "id": external_id,
+                    "title": _sentence(rng, rng.sample(story["terms"], 4), 2),
+                    "body": _sentence(rng, story["terms"], 6),
+                    "url": f"https://synthetic.example/{external_id}",
+                    "published_at": (anchor - timedelta(hours=min(offset, config.time_spread_hours))).isoformat(),
+                }
+            else:
+                terms = [pseudo_word(rng) for _ in range(4)]
+                item = {
+                    "id": external_id,
+                    "title": _sentence(rng, terms, 2),
+                    "body": _sentence(rng, terms, 6),
+                    "url": f"https://synthetic.example/{external_id}",
+                    "published_at": (anchor - timedelta(hours=rng.uniform(0, config.time_spread_hours))).isoformat(),
+                }
+            items.append(item)
+            published.append(item)
+        corpus.items_by_source[source_id] = items
+
+    return corpus
+
+
+def corpus_sources(corpus: Corpus) -> list[Source]:
+    return [Source(enabled=True, polling_interval_seconds=300, auth_config={}, **source) for source in corpus.sources]
+
+
+class CorpusConnector(SourceConnector):
+    source_type = SYNTHETIC_SOURCE_TYPE
+
+    def __init__(self, corpus: Corpus) -> None:
+        self.corpus = corpus
+
+    def fetch_latest(self, source: Source, limit: int = 25) -> list[dict]:
+        return self.corpus.items_by_source.get(source.id, [])[:limit]
+
+    def normalize(self, source: Source, raw_item: dict) -> NormalizedItem:
+        return NormalizedItem(
+            source_id=source.id,
+            source_type=source.source_type,
+            source_name=source.name,
+            external_id=raw_item["id"],
+            author=None,
+            title=raw_item["title"],
+            body=raw_item["body"],
+            url=raw_item["url"],
+            published_at=parse_datetime(raw_item["published_at"]),
+            fetched_at=utc_now(),
+            raw_payload={"id": raw_item["id"]},
+        )
@@ -0,0 +1,420 @@
+from __future__ import annotations
+
+import argparse
+import asyncio
+import hashlib
+import json
+import platform
+import random
+import statistics
+import sys
+import tempfile
+import threading
+import time
+from collections import Counter
+from collections.abc import AsyncIterator, Iterator
+from contextlib import AsyncExitStack, asynccontextmanager, contextmanager
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+import httpx
+from prometheus_client.parser import text_string_to_metric_families
+from sqlalchemy import URL, create_engine, insert, select
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, create_async_engine
+from sqlalchemy.orm import Session, sessionmaker
+
+from app.db.models import Category, ClusterItem, Source, SourceItem, StoryCluster, Summary
+from app.services import cache
+from app.services.store import CATEGORIES
+from benchmarks.common import aware_datetimes, git_commit, patched, percentile, reset_schema
+from benchmarks.corpus import pseudo_word
+
+ENDPOINTS = {
+    "latest": lambda rng, story_ids: "/v1/latest?limit=20",
+    "story": lambda rng, story_ids: f"/v1/stories/{rng.choices(story_ids[0], cum_weights=story_ids[1])[0]}",
+    "stories": lambda rng, story_ids: "/v1/stories?limit=20",
+    "categories": lambda rng, story_ids: "/v1/categories",
+}
+CACHE_MODES = ("memory", "redis", "none")
+INSERT_BATCH = 1000
+
+
+class MemoryRedis:
+    """Just enough of the Redis client for the response cache, for runs without a Redis server."""
+
+    def __init__(self) -> None:
+        self._values: dict[str, tuple[str, float]] = {}
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> str | None:
+        with self._lock:
+            entry = self._values.get(key)
+            if entry is None or entry[1] < time.monotonic():
+                self._values.pop(key, None)
+                return None
+            return entry[0]
+
+    def setex(self, key: str, ttl_seconds: int, value: str) -> bool:
+        with self._lock:
+            self._values[key] = (value, time.monotonic() + ttl_seconds)
+        return True
+
+
+@dataclass(slots=True)
+class Sample:
+    endpoint: str
+    status: int
+    latency_ms: float
+    db_queries: int
+
+
+def _insert(db: Session, model: type, rows: list[dict]) -> None:
+    for start in range(0, len(rows), INSERT_BATCH):
+        db.execute(insert(model), rows[start : start + INSERT_BATCH])
+
+
+def seed_dataset(db: Session, clusters: int, items_per_cluster: int, sources: int, seed: int = 1337) -> list[str]:
+    """Bulk-inserts clusters with their items and a current summary; returns cluster ids, most items first."""
+    rng = random.Random(seed)
+    now = datetime.now(timezone.utc)
+
+    category_rows = [{"id": f"cat_load_{category['slug']}", **category} for category in CATEGORIES]
+    source_rows = [
+        {
+            "id": f"load_{index:04d}",
+            "source_type": "rss",
+            "name": f"Load source {index}",
+            "external_ref": f"https://load.example/{index}/feed",
+            "url": f"https://load.example/{index}",
+            "enabled": True,
+            "polling_interval_seconds": 300,
+            "category_hints": [],
+            "auth_config": {},
+        }
+        for index in range(sources)
+    ]
+    cluster_rows: list[dict] = []
+    item_rows: list[dict] = []
+    link_rows: list[dict] = []
+    summary_rows: list[dict] = []
+
+    for cluster_index in range(clusters):
+        cluster_id = f"story_load_{cluster_index:06d}"
+        terms = [pseudo_word(rng) for _ in range(6)]
+        headline = " ".join(terms).capitalize()
+        updated = now - timedelta(hours=rng.uniform(0, 72))
+        size = max(1, round(rng.expovariate(1 / items_per_cluster)))
+        item_sources = rng.sample(source_rows, min(size, len(source_rows)))
+        for item_index in range(size):
+            item_id = f"item_load_{cluster_index:06d}_{item_index:03d}"
+            url = f"https://load.example/{cluster_index}/{item_index}"
+            digest = hashlib.sha256(url.encode()).hexdigest()
+            item_rows.append(
+                {
+                    "id": item_id,
+                    "source_id": item_sources[item_index % len(item_sources)]["id"],
+                    "external_id": item_id,
+                    "title": f"{headline} {pseudo_word(rng)}",
+                    "body": " ".join([*terms, *(pseudo_word(rng) for _ in range(30))]),
+                    "canonical_url": url,
+                    "published_at": updated - timedelta(minutes=15 * item_index),
+                    "fetched_at": updated,
+                    "content_hash": digest,
+                    "dedupe_key": digest,
+                }
+            )
+            link_rows.append(
+                {"id": f"ci_load_{cluster_index:06d}_{item_index:03d}", "cluster_id": cluster_id, "source_item_id": item_id}
+            )
+        cluster_rows.append(
+            {
+                "id": cluster_id,
+                "slug": f"{headline.lower().replace(' ', '-')}-{cluster_index}",
+                "headline": headline,
+                "primary_category_id": rng.choice(category_rows)["id"],
+                "status": "breaking" if rng.random() < 0.1 else "developing",
+                "representative_item_id": f"item_load_{cluster_index:06d}_000",
+                "first_seen_at": updated - timedelta(minutes=15 * size),
+                "last_updated_at": updated,
+                "item_count": size,
+                "source_count": len(item_sources),
+                "ranking_score": rng.uniform(0, 100),
+            }
+        )
+        summary_rows.append(
+            {
+                "id": f"sum_load_{cluster_index:06d}",
+                "cluster_id": cluster_id,
+                "provider": "stub",
+                "model": "loadtest",
+                "short_summary": " ".join(pseudo_word(rng) for _ in range(25)),
+                "long_summary": " ".join(pseudo_word(rng) for _ in range(150)),
+                "changes_bullets": [headline],
+                "why_it_matters": headline,
+                "generated_at": updated,
+            }
+        )
+
+    _insert(db, Category, category_rows)
+    _insert(db, Source, source_rows)
+    _insert(db, SourceItem, item_rows)
+    _insert(db, StoryCluster, cluster_rows)
+    _insert(db, ClusterItem, link_rows)
+    _insert(db, Summary, summary_rows)
+    db.commit()
+    return [row["id"] for row in sorted(cluster_rows, key=lambda row: row["item_count"], reverse=True)]
+
+
+def _hot_story_weights(story_ids: list[str]) -> tuple[list[str], list[float]]:
+    # Zipf-like popularity: a handful of stories take most of the detail traffic, as on a front page.
+    cumulative: list[float] = []
+    total = 0.0
+    for rank in range(len(story_ids)):
+        total += 1 / (rank + 1)
+        cumulative.append(total)
+    return story_ids, cumulative
+
+
+async def _cache_counts(client: httpx.AsyncClient) -> Counter[str]:
+    counts: Counter[str] = Counter()
+    response = await client.get("/metrics")
+    if response.status_code != 200:
+        return counts
+    for family in text_string_to_metric_families(response.text):
+        for metric in family.samples:
+            if metric.name == "pulsewire_cache_requests_total" and metric.labels.get("operation") == "get":
+                counts[metric.labels["result"]] += metric.value
+    return counts
+
+
+async def run_load(
+    client: httpx.AsyncClient,
+    mix: dict[str, float],
+    story_ids: list[str],
+    requests: int,
+    concurrency: int,
+    seed: int = 1337,
+) -> dict:
+    weighted = _hot_story_weights(story_ids)
+    endpoints, weights = list(mix), list(mix.values())
+    samples: list[Sample] = []
+    remaining = requests
+
+    async def worker(worker_index: int) -> None:
+        nonlocal remaining
+        rng = random.Random(seed + worker_index)
+        while remaining > 0:
+            remaining -= 1
+            endpoint = rng.choices(endpoints, weights)[0]
+            started = time.perf_counter()
+            try:
+                response = await client.get(ENDPOINTS[endpoint](rng, weighted))
+                status, queries = response.status_code, int(response.headers.get("X-DB-Queries", 0))
+            except httpx.HTTPError:
+                status, queries = 0, 0
+            samples.append(Sample(endpoint, status, (time.perf_counter() - started) * 1000, queries))
+
+    cache_before = await _cache_counts(client)
+    started = time.perf_counter()
+    await asyncio.gather(*(worker(index) for index in range(concurrency)))
+    elapsed = time.perf_counter() - started
+    cache_after = await _cache_counts(client)
+
+    cache_stats = {result: int(cache_after[result] - cache_before[result]) for result in ("hit", "miss", "error")}
+    lookups = sum(cache_stats.values())
+    total_queries = sum(sample.db_queries for sample in samples)
+    return {
+        "requests": len(samples),
+        "errors": sum(1 for sample in samples if not 200 <= sample.status < 400),
+        "duration_s": round(elapsed, 3),
+        "throughput_rps": round(len(samples) / elapsed, 1),
+        "latency_ms": _latency_summary([sample.latency_ms for sample in samples]),
+        "endpoints": {
+            endpoint: {
+                "requests": len(latencies),
+                **_latency_summary(latencies),
+            }
+            for endpoint in endpoints
+            if (latencies := [sample.latency_ms for sample in samples if sample.endpoint == endpoint])
+        },
+        "db_queries": {"total": total_queries, "per_request": round(total_queries / len(samples), 2) if samples else 0},
+        "cache": {**cache_stats, "hit_ratio": round(cache_stats["hit"] / lookups, 3) if lookups else None},
+    }
+
+
+def _latency_summary(latencies: list[float]) -> dict:
+    ordered = sorted(latencies)
+    return {
+        "mean": round(statistics.fmean(ordered), 3),
+        "p50": round(percentile(ordered, 0.50), 3),
+        "p95": round(percentile(ordered, 0.95), 3),
+        "p99": round(percentile(ordered, 0.99), 3),
+        "max": round(ordered[-1], 3),
+    }
+
+
+@contextmanager
+def cache_backend(mode: str) -> Iterator[None]:
+    if mode == "memory":
+        memory = MemoryRedis()
+        with patched(cache, "get_redis", lambda: memory):
+            yield
+    elif mode == "none":
+        def unavailable():
+            raise ConnectionError("cache disabled for this load run")
+
+        with patched(cache, "get_redis", unavailable):
+            yield
+    else:
+        # A real Redis at REDIS_URL; drop earlier runs' entries so every run starts cold.
+        redis = cache.get_redis()
+        for key in redis.scan_iter("public:*"):
+            redis.delete(key)
+        yield
+
+
+def async_database_url(url: URL) -> URL:
+    # postgresql+psycopg already serves async sessions; SQLite needs the aiosqlite driver.
+    return url.set(drivername="sqlite+aiosqlite") if url.get_backend_name() == "sqlite" else url
+
+
+@asynccontextmanager
+async def inprocess_client(session_factory: sessionmaker) -> AsyncIterator[httpx.AsyncClient]:
+    from app.db.session import get_async_db, get_db
+    from app.main import app
+
+    def override_db():
+        with session_factory() as db:
+            yield db
+
+    # With API_ASYNC_READS the app reads through get_async_db; point it at the same database.
+    # Built on first use, so sync-only runs do not need an async driver.
+    async_engines: list[AsyncEngine] = []
+
+    async def override_async_db():
+        if not async_engines:
+            async_engines.append(create_async_engine(async_database_url(session_factory.kw["bind"].url)))
+        async with AsyncSession(async_engines[0], autoflush=False, expire_on_commit=False) as db:
+            yield db
+
+    app.dependency_overrides[get_db] = override_db
+    app.dependency_overrides[get_async_db] = override_async_db
+    try:
+        yield httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://loadtest")
+    finally:
+        app.dependency_overrides.pop(get_db, None)
+        app.dependency_overrides.pop(get_async_db, None)
+        for async_engine in async_engines:
+            await async_engine.dispose()
+
+
+def parse_mix(value: str) -> dict[str, float]:
+    mix: dict[str, float] = {}
+    for part in value.split(","):
+        name, _, weight = part.partition("=")
+        if name not in ENDPOINTS:
+            raise argparse.ArgumentTypeError(f"unknown endpoint {name!r}; choose from {', '.join(ENDPOINTS)}")
+        mix[name] = float(weight or 1)
+    return mix
+
+
+async def _discover_story_ids(client: httpx.AsyncClient) -> list[str]:
+    response = await client.get("/v1/latest", params={"limit": 50})
+    response.raise_for_status()
+    return [item["id"] for item in response.json()["items"]]
+
+
+async def _run_remote(base_url: str, story_ids: list[str] | None, options: dict) -> list[dict]:
+    limits = httpx.Limits(max_connections=options["concurrency"], max_keepalive_connections=options["concurrency"])
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=30) as client:
+        story_ids = story_ids or await _discover_story_ids(client)
+        return [{"cache_backend": "server", **await run_load(client, story_ids=story_ids, **options)}]
+
+
+async def _run_inprocess(session_factory: sessionmaker, story_ids: list[str], cache_modes: list[str], options: dict) -> list[dict]:
+    runs = []
+    for mode in cache_modes:
+        async with AsyncExitStack() as stack:
+            stack.enter_context(cache_backend(mode))
+            client = await stack.enter_async_context(inprocess_client(session_factory))
+            async with client:
+                runs.append({"cache_backend": mode, **await run_load(client, story_ids=story_ids, **options)})
+    return runs
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Drive concurrent read traffic at the API and report latency percentiles.")
+    parser.add_argument("--base-url", help="Load a running server over HTTP instead of the app in-process.")
+    parser.add_argument("--database-url", help="Database to seed; defaults to a throwaway SQLite file in-process.")
+    parser.add_argument("--reset", action="store_true", help="Allow dropping and recreating tables in --database-url.")
+    parser.add_argument("--skip-seed", action="store_true", help="Use the data already in --database-url / the server.")
+    parser.add_argument("--clusters", type=int, default=2000)
+    parser.add_argument("--items-per-cluster", type=int, default=6)
+    parser.add_argument("--sources", type=int, default=80)
+    parser.add_argument("--mix", type=parse_mix, default=parse_mix("latest=6,story=3,stories=1"))
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--cache", action="append", choices=CACHE_MODES, help="Repeatable; default runs memory then none.")
+    parser.add_argument("--seed", type=int, default=1337)
+    parser.add_argument("--output", type=Path, help="Write JSON results here instead of stdout.")
+    args = parser.parse_args(argv)
+
+    if args.database_url and not (args.reset or args.skip_seed):
+        parser.error("seeding recreates the schema in --database-url; pass --reset to confirm or --skip-seed")
+    if args.base_url and not args.database_url and not args.skip_seed:
+        parser.error("--base-url needs the server's --database-url to seed, or --skip-seed")
+
+    options = {"mix": args.mix, "requests": args.requests, "concurrency": args.concurrency, "seed": args.seed}
+    with tempfile.TemporaryDirectory() as scratch:
+        database_url = args.database_url or f"sqlite:///{Path(scratch) / 'loadtest.db'}"
+        connect_args = {"check_same_thread": False} if database_url.startswith("sqlite") else {}
+        engine = create_engine(database_url, connect_args=connect_args, pool_size=args.concurrency, max_overflow=0)
+        session_factory = sessionmaker(bind=engine, autoflush=False, autocommit=False, expire_on_commit=False)
+        story_ids: list[str] | None = None
+        try:
+            with aware_datetimes():
+                if not args.skip_seed:
+                    reset_schema(engine)
+                    with session_factory() as db:
+                        story_ids = seed_dataset(db, args.clusters, args.items_per_cluster, args.sources, args.seed)
+                elif not args.base_url:
+                    with session_factory() as db:
+                        story_ids = list(db.scalars(select(StoryCluster.id).order_by(StoryCluster.item_count.desc())))
+
+                if args.base_url:
+                    runs = asyncio.run(_run_remote(args.base_url, story_ids, options))
+                else:
+                    runs = asyncio.run(_run_inprocess(session_factory, story_ids, args.cache or ["memory", "none"], options))
+        finally:
+            engine.dispose()
+
+    report = {
+        "meta": {
+            "commit": git_commit(),
+            "created_at": datetime.now(timezone.utc).isoformat(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "target": args.base_url or "in-process",
+            "database": engine.dialect.name,
+            "dataset": None if args.skip_seed else {
+                "clusters": args.clusters,
+                "items_per_cluster": args.items_per_cluster,
+                "sources": args.sources,
+                "seed": args.seed,
+            },
+            "mix": args.mix,
+            "concurrency": args.concurrency,
+        },
+        "runs": runs,
+    }
+    payload = json.dumps(report, indent=2)
+    if args.output:
+        args.output.write_text(payload + "\n", encoding="utf-8")
+    else:
+        print(payload)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,291 @@
+from __future__ import annotations
+
+import argparse
+import json
+import platform
+import statistics
+import sys
+import tempfile
+import time
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from pathlib import Path
+
+from sqlalchemy import create_engine, func, select
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import sessionmaker
+
+from app.core.config import settings
+from app.db.models import Source, StoryCluster
+from app.db.query_stats import track_queries
+from app.services import pipeline, store
+from app.services.clustering.clusterer import cluster_similarity, tokenize
+from app.services.clustering.service import assign_item_to_cluster, get_cluster_engine
+from app.services.ingestion.registry import CONNECTORS
+from app.services.summarization import service as summarization
+from app.services.summarization.base import SummaryDraft
+from app.services.summarization.service import StubProvider, summarize_cluster
+from benchmarks.common import aware_datetimes, git_commit, patched, percentile, reset_schema
+from benchmarks.corpus import (
+    SYNTHETIC_SOURCE_TYPE,
+    Corpus,
+    CorpusConfig,
+    CorpusConnector,
+    corpus_sources,
+    generate_corpus,
+)
+
+
+@dataclass(slots=True)
+class BenchmarkResult:
+    name: str
+    timings_ms: list[float]
+    extra: dict = field(default_factory=dict)
+
+    def to_json(self) -> dict:
+        ordered = sorted(self.timings_ms)
+        total = sum(ordered)
+        return {
+            "name": self.name,
+            "iterations": len(ordered),
+            "mean_ms": round(statistics.fmean(ordered), 3),
+            "p50_ms": round(percentile(ordered, 0.50), 3),
+            "p95_ms": round(percentile(ordered, 0.95), 3),
+            "min_ms": round(ordered[0], 3),
+            "max_ms": round(ordered[-1], 3),
+            "ops_per_second": round(len(ordered) / (total / 1000), 2) if total else None,
+            **self.extra,
+        }
+
+
+class LatencyProvider(StubProvider):
+    """Stub summaries that take as long as a real provider call would."""
+
+    def __init__(self, latency_ms: float) -> None:
+        self.latency_ms = latency_ms
+
+    def summarize(self, headline: str, evidence: list[str]) -> SummaryDraft:
+        time.sleep(self.latency_ms / 1000)
+        return super().summarize(headline, evidence)
+
+
+def _timed(func: Callable[[], object]) -> float:
+    started = time.perf_counter()
+    func()
+    return (time.perf_counter() - started) * 1000
+
+
+@contextmanager
+def _registered(connector: CorpusConnector) -> Iterator[None]:
+    CONNECTORS[connector.source_type] = connector
+    try:
+        yield
+    finally:
+        CONNECTORS.pop(connector.source_type, None)
+
+
+def bench_clusterer(corpus: Corpus, iterations: int) -> list[BenchmarkResult]:
+    titles = corpus.titles()
+    items = [
+        (f"{item['title']} {item['body']}", datetime.fromisoformat(item["published_at"]))
+        for source_items in corpus.items_by_source.values()
+        for item in source_items
+    ]
+    pairs = list(zip(items[:200], items[1:201]))
+
+    tokenize_ms = [_timed(lambda: [tokenize(title) for title in titles]) for _ in range(iterations)]
+    similarity_ms = [
+        _timed(lambda: [cluster_similarity(left[0], right[0], left[1], right[1]) for left, right in pairs])
+        for _ in range(iterations)
+    ]
+    return [
+        BenchmarkResult("clusterer.tokenize", tokenize_ms, {"calls_per_iteration": len(titles)}),
+        BenchmarkResult("clusterer.cluster_similarity", similarity_ms, {"calls_per_iteration": len(pairs)}),
+    ]
+
+
+def bench_pipeline(engine: Engine, factory: sessionmaker, corpus: Corpus, iterations: int) -> BenchmarkResult:
+    timings: list[float] = []
+    queries: list[int] = []
+    for _ in range(iterations):
+        reset_schema(engine)
+        with factory() as db:
+            db.add_all(corpus_sources(corpus))
+            db.commit()
+            with track_queries() as stats:
+                timings.append(_timed(lambda: pipeline.run_ingestion_pipeline(db, [SYNTHETIC_SOURCE_TYPE], summarize=False)))
+            queries.append(stats.count)
+            clusters = db.scalar(select(func.count()).select_from(StoryCluster))
+
+    mean_ms = statistics.fmean(timings)
+    return BenchmarkResult(
+        "pipeline.run_ingestion_pipeline",
+        timings,
+        {
+            "items": corpus.item_count,
+            "clusters": clusters,
+            "items_per_second": round(corpus.item_count / (mean_ms / 1000), 1),
+            "db_queries": round(statistics.fmean(queries)),
+        },
+    )
+
+
+def bench_assign(factory: sessionmaker, corpus: Corpus, probes: int) -> BenchmarkResult:
+    probe_corpus = generate_corpus(
+        CorpusConfig(
+            sources=corpus.config.sources,
+            items_per_source=max(1, probes // corpus.config.sources),
+            stories=corpus.config.story_count,
+            story_overlap=corpus.config.story_overlap,
+            syndication_ratio=0.0,
+            time_spread_hours=corpus.config.time_spread_hours,
+            seed=corpus.config.seed,
+        ),
+        anchor=corpus.anchor,
+    )
+    connector = CorpusConnector(probe_corpus)
+    cluster_engine = get_cluster_engine()
+    timings: list[float] = []
+
+    with factory() as db:
+        sources = {source.id: source for source in db.scalars(select(Source)).all()}
+        rows = []
+        for source_id, raw_items in probe_corpus.items_by_source.items():
+            for raw in raw_items:
+                # Fresh external ids so the probes are new rows rather than upserts of existing ones.
+                raw = {**raw, "id": f"probe-{raw['id']}", "url": raw["url"].replace("/syn_", "/probe_syn_")}
+                row, _ = pipeline._store_raw_item(db, sources[source_id], connector.normalize(sources[source_id], raw), raw)
+                rows.append(row)
+        for row in rows:
+            timings.append(_timed(lambda: assign_item_to_cluster(db, row, cluster_engine)))
+        db.rollback()
+
+    return BenchmarkResult("clustering.assign_item_to_cluster", timings, {"engine": settings.cluster_engine})
+
+
+def bench_summarize(factory: sessionmaker, clusters: int, latency_ms: float) -> BenchmarkResult:
+    timings: list[float] = []
+    with factory() as db, patched(summarization, "get_provider", lambda: LatencyProvider(latency_ms)):
+        for cluster in db.scalars(select(StoryCluster).order_by(StoryCluster.item_count.desc()).limit(clusters)).all():
+            timings.append(_timed(lambda: summarize_cluster(db, cluster)))
+        db.rollback()
+    return BenchmarkResult("summarization.summarize_cluster", timings, {"provider_latency_ms": latency_ms})
+
+
+def bench_store(factory: sessionmaker, iterations: int) -> list[BenchmarkResult]:
+    results: list[BenchmarkResult] = []
+    with factory() as db:
+        for limit in (20, 100):
+            timings: list[float] = []
+            for _ in range(iterations):
+                with track_queries() as stats:
+                    timings.append(_timed(lambda: store.get_story_cards(db, limit=limit)))
+            results.append(BenchmarkResult(f"store.get_story_cards[limit={limit}]", timings, {"db_queries": stats.count}))
+
+        story_ids = db.scalars(select(StoryCluster.id).order_by(StoryCluster.item_count.desc()).limit(iterations)).all()
+        timings = []
+        for story_id in story_ids:
+            with track_queries() as stats:
+                timings.append(_timed(lambda: store.get_story_detail(db, story_id)))
+        if timings:
+            results.append(BenchmarkResult("store.get_story_detail", timings, {"db_queries": stats.count}))
+    return results
+
+
+def run_benchmarks(
+    database_url: str,
+    config: CorpusConfig,
+    iterations: int = 5,
+    pipeline_runs: int = 1,
+    probes: int = 100,
+    summaries: int = 20,
+    summary_latency_ms: float = 50.0,
+) -> dict:
+    corpus = generate_corpus(config)
+    engine = create_engine(database_url)
+    factory = sessionmaker(bind=engine, autoflush=False, autocommit=False, expire_on_commit=False)
+
+    results: list[BenchmarkResult] = []
+    try:
+        with (
+            aware_datetimes(),
+            _registered(CorpusConnector(corpus)),
+            patched(settings, "ingestion_default_limit", max(settings.ingestion_default_limit, config.items_per_source)),
+        ):
+            results.extend(bench_clusterer(corpus, iterations))
+            results.append(bench_pipeline(engine, factory, corpus, pipeline_runs))
+            results.append(bench_assign(factory, corpus, probes))
+            results.append(bench_summarize(factory, summaries, summary_latency_ms))
+            results.extend(bench_store(factory, iterations))
+    finally:
+        engine.dispose()
+
+    return {
+        "meta": {
+            "commit": git_commit(),
+            "created_at": datetime.now(timezone.utc).isoformat(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "database": engine.dialect.name,
+            "cluster_engine": settings.cluster_engine,
+            "corpus": corpus.describe(),
+        },
+        "results": [result.to_json() for result in results],
+    }
+
+
+def main(argv: list[str] | None = None) -> int:
+    defaults = CorpusConfig()
+    parser = argparse.ArgumentParser(description="Benchmark clustering, ingestion, summarization and story reads.")
+    parser.add_argument("--database-url", help="Defaults to a throwaway SQLite file.")
+    parser.add_argument("--reset", action="store_true", help="Allow dropping and recreating tables in --database-url.")
+    parser.add_argument("--output", type=Path, help="Write JSON results here instead of stdout.")
+    parser.add_argument("--sources", type=int, default=defaults.sources)
+    parser.add_argument("--items-per-source", type=int, default=defaults.items_per_source)
+    parser.add_argument("--stories", type=int)
+    parser.add_argument("--story-overlap", type=float, default=defaults.story_overlap)
+    parser.add_argument("--syndication-ratio", type=float, default=defaults.syndication_ratio)
+    parser.add_argument("--time-spread-hours", type=float, default=defaults.time_spread_hours)
+    parser.add_argument("--seed", type=int, default=defaults.seed)
+    parser.add_argument("--iterations", type=int, default=5)
+    parser.add_argument("--pipeline-runs", type=int, default=1)
+    parser.add_argument("--probes", type=int, default=100)
+    parser.add_argument("--summaries", type=int, default=20)
+    parser.add_argument("--summary-latency-ms", type=float, default=50.0)
+    args = parser.parse_args(argv)
+
+    if args.database_url and not args.reset:
+        parser.error("--database-url is wiped before every pipeline run; pass --reset to confirm")
+
+    config = CorpusConfig(
+        sources=args.sources,
+        items_per_source=args.items_per_source,
+        stories=args.stories,
+        story_overlap=args.story_overlap,
+        syndication_ratio=args.syndication_ratio,
+        time_spread_hours=args.time_spread_hours,
+        seed=args.seed,
+    )
+    options = {
+        "iterations": args.iterations,
+        "pipeline_runs": args.pipeline_runs,
+        "probes": args.probes,
+        "summaries": args.summaries,
+        "summary_latency_ms": args.summary_latency_ms,
+    }
+    with tempfile.TemporaryDirectory() as scratch:
+        database_url = args.database_url or f"sqlite:///{Path(scratch) / 'bench.db'}"
+        report = run_benchmarks(database_url, config, **options)
+
+    payload = json.dumps(report, indent=2)
+    if args.output:
+        args.output.write_text(payload + "\n", encoding="utf-8")
+    else:
+        print(payload)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
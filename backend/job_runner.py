@@ -2,12 +2,35 @@ import json
 import os
 import sys
 
+from app.jobs.cluster_index import run_cluster_index_job
 from app.jobs.ingestion import run_ingestion_job
+from app.jobs.push import run_websub_renew_job
+from app.jobs.recluster import run_recluster_job
+from app.jobs.stream import run_stream_job
 
 
 def main() -> int:
     job_type = os.getenv("JOB_TYPE", "ingestion")
 
+    if job_type == "recluster":
+        full = os.getenv("RECLUSTER_FULL", "").strip().lower() in {"1", "true", "yes"}
+        print(json.dumps({"ok": True, "job_type": job_type, "result": run_recluster_job(full=full)}))
+        return 0
+
+    if job_type == "cluster-index":
+        print(json.dumps({"ok": True, "job_type": job_type, "result": run_cluster_index_job()}))
+        return 0
+
+    if job_type == "websub-renew":
+        print(json.dumps({"ok": True, "job_type": job_type, "result": run_websub_renew_job()}))
+        return 0
+
+    if job_type == "stream":
+        raw_types = os.getenv("SOURCE_TYPES", "").strip()
+        source_types = [item.strip() for item in raw_types.split(",") if item.strip()] or None
+        print(json.dumps({"ok": True, "job_type": job_type, "result": run_stream_job(source_types)}))
+        return 0
+
     if job_type != "ingestion":
         print(json.dumps({"ok": False, "error": f"Unsupported JOB_TYPE: {job_type}"}))
         return 2
@@ -15,8 +38,33 @@ def main() -> int:
     raw_types = os.getenv("SOURCE_TYPES", "").strip()
     source_types = [item.strip() for item in raw_types.split(",") if item.strip()] or None
 
-    result = run_ingestion_job(source_types=source_types)
-    print(json.dumps({"ok": True, "job_type": job_type, "source_types": source_types or [], "result": result}))
+    resume_run_id = os.getenv("RESUME_RUN_ID", "").strip() or None
+    task_index = int(os.getenv("CLOUD_RUN_TASK_INDEX", "0"))
+    task_count = int(os.getenv("CLOUD_RUN_TASK_COUNT", "1"))
+    execution_id = os.getenv("CLOUD_RUN_EXECUTION", "").strip() or None
+    if not 0 <= task_index < task_count:
+        print(json.dumps({"ok": False, "error": f"Invalid task index {task_index} for task count {task_count}"}))
+        return 2
+
+    result = run_ingestion_job(
+        source_types=source_types,
+        resume_run_id=resume_run_id,
+        task_index=task_index,
+        task_count=task_count,
+        execution_id=execution_id,
+    )
+    print(
+        json.dumps(
+            {
+                "ok": True,
+                "job_type": job_type,
+                "source_types": source_types or [],
+                "task_index": task_index,
+                "task_count": task_count,
+                "result": result,
+            }
+        )
+    )
     return 0
 
 
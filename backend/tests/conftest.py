@@ -0,0 +1,132 @@
+from __future__ import annotations
+
+from collections.abc import Callable, Generator, Iterator
+from contextlib import AbstractContextManager, contextmanager
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session, sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from app.core.config import settings
+from app.db.models import Base, Source
+from app.db.query_stats import QueryStats, track_queries
+from app.services import pipeline
+from app.services.ingestion.base import SourceConnector
+from app.services.ingestion.models import NormalizedItem, utc_now
+from app.services.ingestion.utils import parse_optional_datetime
+from benchmarks.common import aware_datetimes
+
+
+@pytest.fixture()
+def restore_utc():
+    with aware_datetimes():
+        yield
+
+
+@pytest.fixture()
+def db_engine(restore_utc):
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    Base.metadata.create_all(bind=engine)
+    try:
+        yield engine
+    finally:
+        engine.dispose()
+
+
+@pytest.fixture()
+def file_session_factory(tmp_path, restore_utc) -> Generator[sessionmaker, None, None]:
+    # One connection per thread, for tests that run sessions concurrently.
+    engine = create_engine(f"sqlite:///{tmp_path / 'pulsewire.db'}", connect_args={"timeout": 30})
+    Base.metadata.create_all(bind=engine)
+    try:
+        yield sessionmaker(bind=engine, autoflush=False, autocommit=False, expire_on_commit=False)
+    finally:
+        engine.dispose()
+
+
+@pytest.fixture()
+def session_factory(db_engine) -> sessionmaker:
+    return sessionmaker(bind=db_engine, autoflush=False, autocommit=False, expire_on_commit=False)
+
+
+@pytest.fixture()
+def db_session(session_factory) -> Generator[Session, None, None]:
+    with session_factory() as db:
+        yield db
+
+
+class FakeConnector(SourceConnector):
+    source_type = "fake"
+
+    def __init__(self, items_by_source: dict[str, list[dict]]) -> None:
+        self.items_by_source = items_by_source
+
+    def fetch_latest(self, source: Source, limit: int = 25) -> list[dict]:
+        return self.items_by_source.get(source.id, [])[:limit]
+
+    def normalize(self, source: Source, raw_item: dict) -> NormalizedItem:
+        published = parse_optional_datetime(raw_item.get("published_at"))
+        fetched_at = utc_now()
+        return NormalizedItem(
+            source_id=source.id,
+            source_type=source.source_type,
+            source_name=source.name,
+            external_id=raw_item["id"],
+            author=None,
+            title=raw_item["title"],
+            body="",
+            url=raw_item.get("url") or f"https://example.com/{source.id}/{raw_item['id']}",
+            published_at=published or fetched_at,
+            fetched_at=fetched_at,
+            raw_payload={"id": raw_item["id"]},
+            published_at_estimated=published is None,
+        )
+
+
+def make_source(source_id: str) -> Source:
+    return Source(
+        id=source_id,
+        source_type="fake",
+        name=f"{source_id} name",
+        external_ref=source_id,
+        url=f"https://example.com/{source_id}",
+        enabled=True,
+        polling_interval_seconds=300,
+        category_hints=[],
+        auth_config={},
+    )
+
+
+def make_items(prefix: str, count: int) -> list[dict]:
+    now = datetime.now(timezone.utc)
+    return [
+        {
+            "id": f"{prefix}-{index}",
+            "title": f"{prefix} headline number {index} unique{prefix}{index}",
+            "published_at": (now - timedelta(minutes=index)).isoformat(),
+        }
+        for index in range(count)
+    ]
+
+
+@pytest.fixture()
+def fake_sources(db_session, monkeypatch) -> FakeConnector:
+    db_session.add_all([make_source("src_a"), make_source("src_b"), make_source("src_c")])
+    db_session.commit()
+    connector = FakeConnector({"src_a": make_items("alpha", 5), "src_b": make_items("beta", 3), "src_c": make_items("gamma", 2)})
+    monkeypatch.setattr(pipeline, "get_connector", lambda source_type: connector)
+    monkeypatch.setattr(settings, "ingestion_chunk_size", 2)
+    return connector
+
+
+@pytest.fixture()
+def query_budget() -> Callable[[int], AbstractContextManager[QueryStats]]:
+    @contextmanager
+    def budget(max_queries: int) -> Iterator[QueryStats]:
+        with track_queries() as stats:
+            yield stats
+        assert stats.count <= max_queries, f"{stats.count} queries issued, budget is {max_queries}"
+
+    return budget
@@ -0,0 +1,92 @@
+from __future__ import annotations
+
+import asyncio
+import inspect
+
+import httpx
+import pytest
+from fastapi import FastAPI
+
+from app.api import routes_public, routes_public_async
+from app.db.session import get_async_db
+from app.services import cache
+from app.services.store import get_story_cards, get_story_detail
+from benchmarks.loadtest import seed_dataset
+
+
+class AsyncMemoryRedis:
+    def __init__(self) -> None:
+        self.values: dict[str, str] = {}
+
+    async def get(self, key: str) -> str | None:
+        return self.values.get(key)
+
+    async def setex(self, key: str, ttl_seconds: int, value: str) -> None:
+        self.values[key] = value
+
+
+def route_signatures(router) -> set[tuple[str, frozenset[str]]]:
+    return {(route.path, frozenset(route.methods)) for route in router.routes}
+
+
+def test_async_router_mirrors_the_sync_routes() -> None:
+    assert route_signatures(routes_public_async.router) == route_signatures(routes_public.router)
+    assert all(inspect.iscoroutinefunction(route.endpoint) for route in routes_public_async.router.routes)
+
+
+def test_async_cache_round_trip_and_redis_errors(monkeypatch) -> None:
+    redis = AsyncMemoryRedis()
+    monkeypatch.setattr(cache, "get_async_redis", lambda: redis)
+
+    async def round_trip() -> tuple[dict | None, dict | None]:
+        missing = await cache.get_cache_json_async("public:latest:5")
+        await cache.set_cache_json_async("public:latest:5", {"items": []}, 30)
+        return missing, await cache.get_cache_json_async("public:latest:5")
+
+    assert asyncio.run(round_trip()) == (None, {"items": []})
+
+    def unavailable():
+        raise ConnectionError("redis down")
+
+    monkeypatch.setattr(cache, "get_async_redis", unavailable)
+    assert asyncio.run(cache.get_cache_json_async("public:latest:5")) is None
+
+
+def test_async_routes_serve_the_same_stories_as_the_sync_store(file_session_factory, monkeypatch) -> None:
+    pytest.importorskip("aiosqlite")
+    from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+    with file_session_factory() as db:
+        story_ids = seed_dataset(db, clusters=12, items_per_cluster=3, sources=4)
+        expected_cards = [card.model_dump(mode="json") for card in get_story_cards(db, limit=10)]
+        expected_detail = get_story_detail(db, story_ids[0]).model_dump(mode="json")
+
+    monkeypatch.setattr(cache, "get_async_redis", AsyncMemoryRedis)
+    database_path = file_session_factory.kw["bind"].url.database
+    async_engine = create_async_engine(f"sqlite+aiosqlite:///{database_path}")
+    sessions = async_sessionmaker(async_engine, expire_on_commit=False)
+
+    async def override_db():
+        async with sessions() as db:
+            yield db
+
+    app = FastAPI()
+    app.include_router(routes_public_async.router)
+    app.dependency_overrides[get_async_db] = override_db
+
+    async def fetch() -> tuple[list, dict, int]:
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            latest, detail, missing = await asyncio.gather(
+                client.get("/v1/latest", params={"limit": 10}),
+                client.get(f"/v1/stories/{story_ids[0]}"),
+                client.get("/v1/stories/missing"),
+            )
+        await async_engine.dispose()
+        return latest.json()["items"], detail.json(), missing.status_code
+
+    cards, detail, missing_status = asyncio.run(fetch())
+
+    assert cards == expected_cards
+    assert detail == expected_detail
+    assert missing_status == 404
@@ -0,0 +1,73 @@
+from __future__ import annotations
+
+from datetime import datetime, timedelta, timezone
+
+from app.db.models import ClusterItem, Source, SourceItem, StoryCluster
+from app.services.clustering.service import assign_item_to_cluster, assign_items_to_clusters
+
+
+def make_item(db, external_id: str, title: str, minutes_ago: int) -> SourceItem:
+    if db.get(Source, "src_batch") is None:
+        db.add(
+            Source(
+                id="src_batch",
+                source_type="rss",
+                name="Batch source",
+                external_ref="https://example.com/feed.xml",
+                url="https://example.com",
+                enabled=True,
+                polling_interval_seconds=300,
+                category_hints=[],
+                auth_config={},
+            )
+        )
+    published_at = datetime.now(timezone.utc) - timedelta(minutes=minutes_ago)
+    item = SourceItem(
+        id=f"item_{external_id}",
+        source_id="src_batch",
+        external_id=external_id,
+        title=title,
+        body="",
+        canonical_url=f"https://example.com/{external_id}",
+        published_at=published_at,
+        fetched_at=published_at,
+        content_hash=external_id,
+        dedupe_key=external_id,
+    )
+    db.add(item)
+    db.flush()
+    return item
+
+
+def test_batch_groups_same_event_into_one_new_cluster(db_session) -> None:
+    items = [
+        make_item(db_session, "quake-2", "Earthquake strikes coastal city, buildings damaged", 5),
+        make_item(db_session, "quake-1", "Strong earthquake strikes coastal city overnight", 10),
+        make_item(db_session, "match", "Underdog club wins cup final on penalties", 7),
+        make_item(db_session, "quake-3", "Coastal city earthquake damaged buildings, rescuers say", 3),
+    ]
+
+    clusters = assign_items_to_clusters(db_session, items)
+
+    assert clusters[0].id == clusters[1].id == clusters[3].id
+    assert clusters[2].id != clusters[0].id
+    # The oldest item in a component seeds the new cluster.
+    assert clusters[0].representative_item_id == "item_quake-1"
+    assert clusters[0].item_count == 3
+    assert db_session.query(StoryCluster).count() == 2
+
+
+def test_batch_attaches_to_existing_candidate_clusters(db_session) -> None:
+    seed = make_item(db_session, "quake-1", "Strong earthquake strikes coastal city overnight", 30)
+    existing = assign_item_to_cluster(db_session, seed)
+
+    clusters = assign_items_to_clusters(
+        db_session,
+        [
+            make_item(db_session, "quake-2", "Earthquake strikes coastal city, buildings damaged", 5),
+            make_item(db_session, "quake-3", "Coastal city earthquake strikes again overnight", 3),
+        ],
+    )
+
+    assert [cluster.id for cluster in clusters] == [existing.id, existing.id]
+    assert db_session.query(ClusterItem).filter(ClusterItem.cluster_id == existing.id).count() == 3
@@ -0,0 +1,55 @@
+from __future__ import annotations
+
+from datetime import datetime, timezone
+
+from benchmarks.compare import compare_results
+from benchmarks.corpus import CorpusConfig, generate_corpus
+from benchmarks.run import run_benchmarks
+
+ANCHOR = datetime(2026, 1, 1, tzinfo=timezone.utc)
+
+
+def test_corpus_is_deterministic_for_a_seed() -> None:
+    config = CorpusConfig(sources=4, items_per_source=10, seed=7)
+
+    first = generate_corpus(config, anchor=ANCHOR)
+    second = generate_corpus(config, anchor=ANCHOR)
+    other = generate_corpus(CorpusConfig(sources=4, items_per_source=10, seed=8), anchor=ANCHOR)
+
+    assert first.items_by_source == second.items_by_source
+    assert first.titles() != other.titles()
+    assert first.item_count == 40
+
+
+def test_corpus_syndicates_items_across_sources() -> None:
+    corpus = generate_corpus(CorpusConfig(sources=5, items_per_source=40, syndication_ratio=0.3), anchor=ANCHOR)
+    items = [item for source_items in corpus.items_by_source.values() for item in source_items]
+
+    assert len({item["url"] for item in items}) < len(items)
+    assert all(
+        ANCHOR.timestamp() - datetime.fromisoformat(item["published_at"]).timestamp() <= 48 * 3600 for item in items
+    )
+
+
+def test_benchmark_run_reports_every_stage(tmp_path) -> None:
+    report = run_benchmarks(
+        f"sqlite:///{tmp_path / 'bench.db'}",
+        CorpusConfig(sources=3, items_per_source=8),
+        iterations=2,
+        probes=3,
+        summaries=2,
+        summary_latency_ms=0,
+    )
+
+    names = {result["name"] for result in report["results"]}
+    assert {
+        "clusterer.tokenize",
+        "clusterer.cluster_similarity",
+        "pipeline.run_ingestion_pipeline",
+        "clustering.assign_item_to_cluster",
+        "summarization.summarize_cluster",
+        "store.get_story_detail",
+    } <= names
+    assert report["meta"]["database"] == "sqlite"
+    assert report["meta"]["corpus"]["item_count"] == 24
+    assert all(row["ratio"] == 1.0 for row in compare_results(report, report))
@@ -0,0 +1,198 @@
+from __future__ import annotations
+
+import os
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from sqlalchemy import create_engine, func, select
+from sqlalchemy.orm import sessionmaker
+
+from app.core.config import settings
+from app.db.models import Base, ClusterItem, IngestionSourceStats, Source, SourceCursor, SourceItem, StoryCluster
+from app.services import pipeline
+from app.services.clustering import service
+from app.services.clustering.locks import CREATE_LOCK, ClusterLockTimeout, acquire_cluster_locks, cluster_lock_name
+
+
+@pytest.fixture()
+def concurrent_factory(request, restore_utc):
+    # Postgres exercises the advisory-lock backend; without it, a file SQLite database and in-process locks.
+    url = os.getenv("TEST_DATABASE_URL")
+    if not url:
+        return request.getfixturevalue("file_session_factory")
+
+    engine = create_engine(url)
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+    request.addfinalizer(engine.dispose)
+    request.addfinalizer(lambda: Base.metadata.drop_all(bind=engine))
+    return sessionmaker(bind=engine, autoflush=False, autocommit=False, expire_on_commit=False)
+
+
+def seed_items(factory, titles: list[str]) -> list[str]:
+    now = datetime.now(timezone.utc)
+    with factory() as db:
+        for index, title in enumerate(titles):
+            db.add(
+                Source(
+                    id=f"src_lock_{index}",
+                    source_type="rss",
+                    name=f"Lock source {index}",
+                    external_ref=f"https://example{index}.com/feed.xml",
+                    url=f"https://example{index}.com",
+                    enabled=True,
+                    polling_interval_seconds=300,
+                    category_hints=[],
+                    auth_config={},
+                )
+            )
+            db.add(
+                SourceItem(
+                    id=f"item_lock_{index}",
+                    source_id=f"src_lock_{index}",
+                    external_id=f"lock-{index}",
+                    title=title,
+                    body="",
+                    canonical_url=f"https://example{index}.com/story",
+                    published_at=now - timedelta(minutes=index),
+                    fetched_at=now,
+                    content_hash=f"lock-{index}",
+                    dedupe_key=f"lock-{index}",
+                )
+            )
+        db.commit()
+    return [f"item_lock_{index}" for index in range(len(titles))]
+
+
+def run_workers(factory, item_ids: list[str], assign) -> None:
+    errors: list[BaseException] = []
+
+    def worker(item_id: str) -> None:
+        try:
+            with factory() as db:
+                assign(db, db.get(SourceItem, item_id))
+                db.commit()
+        except BaseException as exc:
+            errors.append(exc)
+
+    threads = [threading.Thread(target=worker, args=(item_id,)) for item_id in item_ids]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(timeout=60)
+    assert not errors, errors
+
+
+def scan_in_lockstep(monkeypatch, parties: int) -> None:
+    # Every worker finishes its candidate scan before any of them can create a cluster.
+    barrier = threading.Barrier(parties, timeout=10)
+    original = service.load_candidate_clusters
+
+    def load(*args, **kwargs):
+        candidates = original(*args, **kwargs)
+        barrier.wait()
+        return candidates
+
+    monkeypatch.setattr(service, "load_candidate_clusters", load)
+
+
+SAME_STORY = [
+    "Earthquake strikes coastal city, buildings damaged",
+    "Strong earthquake strikes coastal city overnight",
+    "Coastal city earthquake damages buildings overnight",
+]
+
+
+@pytest.mark.parametrize(
+    "assign",
+    [service.assign_item_to_cluster, lambda db, item: service.assign_items_to_clusters(db, [item])],
+    ids=["per-item", "batch"],
+)
+def test_concurrent_workers_create_one_cluster(concurrent_factory, monkeypatch, assign) -> None:
+    item_ids = seed_items(concurrent_factory, SAME_STORY)
+    scan_in_lockstep(monkeypatch, len(item_ids))
+
+    run_workers(concurrent_factory, item_ids, assign)
+
+    with concurrent_factory() as db:
+        clusters = db.scalars(select(StoryCluster)).all()
+        assert len(clusters) == 1
+        assert clusters[0].item_count == 3
+        assert clusters[0].source_count == 3
+
+
+def test_without_locks_the_race_duplicates_clusters(file_session_factory, monkeypatch) -> None:
+    monkeypatch.setattr(settings, "cluster_lock_backend", "none")
+    item_ids = seed_items(file_session_factory, SAME_STORY[:2])
+    scan_in_lockstep(monkeypatch, len(item_ids))
+
+    run_workers(file_session_factory, item_ids, service.assign_item_to_cluster)
+
+    with file_session_factory() as db:
+        assert db.scalar(select(func.count()).select_from(StoryCluster)) == 2
+
+
+def test_concurrent_attaches_keep_counts(concurrent_factory) -> None:
+    item_ids = seed_items(concurrent_factory, SAME_STORY + ["Earthquake strikes coastal city, rescuers search buildings"])
+    with concurrent_factory() as db:
+        service.assign_item_to_cluster(db, db.get(SourceItem, item_ids[0]))
+        db.commit()
+
+    run_workers(concurrent_factory, item_ids[1:], service.assign_item_to_cluster)
+
+    with concurrent_factory() as db:
+        cluster = db.scalars(select(StoryCluster)).one()
+        assert db.scalar(select(func.count()).select_from(ClusterItem)) == 4
+        assert cluster.item_count == 4
+        assert cluster.source_count == 4
+
+
+def test_locks_are_held_until_the_transaction_ends(file_session_factory, monkeypatch) -> None:
+    monkeypatch.setattr(settings, "cluster_lock_timeout_seconds", 0.05)
+    with file_session_factory() as first, file_session_factory() as second:
+        acquire_cluster_locks(first, [cluster_lock_name("story")])
+        with pytest.raises(ClusterLockTimeout):
+            acquire_cluster_locks(second, [cluster_lock_name("story")])
+
+        first.commit()
+        acquire_cluster_locks(second, [cluster_lock_name("story")])
+        second.rollback()
+
+
+def test_create_lock_comes_first_and_is_not_waited_for_behind_cluster_locks(file_session_factory, monkeypatch) -> None:
+    monkeypatch.setattr(settings, "cluster_lock_timeout_seconds", 5.0)
+    with file_session_factory() as first, file_session_factory() as second:
+        acquire_cluster_locks(first, [cluster_lock_name("story"), CREATE_LOCK])
+        assert list(first.info["cluster_locks"]) == [CREATE_LOCK, cluster_lock_name("story")]
+
+        acquire_cluster_locks(second, [cluster_lock_name("other")])
+        started = time.monotonic()
+        with pytest.raises(ClusterLockTimeout):
+            acquire_cluster_locks(second, [CREATE_LOCK])
+        assert time.monotonic() - started < 1.0
+        first.rollback()
+        second.rollback()
+
+
+def test_pipeline_retries_a_chunk_after_a_lock_timeout(db_session, fake_sources, monkeypatch) -> None:
+    cluster_chunk = pipeline._cluster_chunk
+    attempts: list[int] = []
+
+    def contended_once(db, rows, engine, duplicates, counts):
+        attempts.append(len(rows))
+        if len(attempts) == 2:
+            raise ClusterLockTimeout("Timed out waiting for clustering:create")
+        return cluster_chunk(db, rows, engine, duplicates, counts)
+
+    monkeypatch.setattr(pipeline, "_cluster_chunk", contended_once)
+    monkeypatch.setattr(pipeline, "sleep", lambda seconds: None)
+
+    result = pipeline.run_ingestion_pipeline(db_session, summarize=False)
+
+    assert attempts[1] == attempts[2]
+    assert result.normalized_count == 10
+    assert db_session.query(ClusterItem).count() == 10
+    assert db_session.query(IngestionSourceStats).count() == 3
+    assert {row.source_id for row in db_session.query(SourceCursor)} == {"src_a", "src_b", "src_c"}
@@ -0,0 +1,95 @@
+from __future__ import annotations
+
+from datetime import datetime, timedelta, timezone
+
+from app.db.models import ClusterItem, Source, SourceItem, StoryCluster
+from app.services.clustering.merge import merge_fragmented_clusters
+from app.services.clustering.service import attach_item_to_cluster
+
+
+def make_cluster(db, key: str, headline: str, hours_ago: float) -> StoryCluster:
+    if db.get(Source, "src_merge") is None:
+        db.add(
+            Source(
+                id="src_merge",
+                source_type="rss",
+                name="Merge source",
+                external_ref="https://example.com/feed.xml",
+                url="https://example.com",
+                enabled=True,
+                polling_interval_seconds=300,
+                category_hints=[],
+                auth_config={},
+            )
+        )
+    published_at = datetime.now(timezone.utc) - timedelta(hours=hours_ago)
+    item = SourceItem(
+        id=f"item_{key}",
+        source_id="src_merge",
+        external_id=key,
+        title=headline,
+        body="",
+        canonical_url=f"https://example.com/{key}",
+        published_at=published_at,
+        fetched_at=published_at,
+        content_hash=key,
+        dedupe_key=key,
+    )
+    cluster = StoryCluster(
+        id=f"story_{key}",
+        slug=key,
+        headline=headline,
+        representative_item_id=item.id,
+        first_seen_at=published_at,
+        last_updated_at=published_at,
+    )
+    db.add_all([item, cluster])
+    db.flush()
+    return attach_item_to_cluster(db, cluster, item)
+
+
+def test_merge_collapses_fragmented_story_into_oldest_cluster(db_session) -> None:
+    make_cluster(db_session, "a", "Central bank raises interest rates by half point", 3)
+    make_cluster(db_session, "b", "Central bank raises interest rates half point surprise", 2)
+    make_cluster(db_session, "c", "Interest rates: central bank raises by half point", 1)
+    make_cluster(db_session, "d", "Volcano eruption forces evacuation of island villages", 1)
+
+    result = merge_fragmented_clusters(db_session, threshold=0.5)
+
+    assert result.merged_count == 2
+    assert result.surviving_cluster_ids == ["story_a"]
+    survivor = db_session.get(StoryCluster, "story_a")
+    assert survivor.item_count == 3
+    assert {link.source_item_id for link in db_session.query(ClusterItem).filter_by(cluster_id="story_a")} == {
+        "item_a",
+        "item_b",
+        "item_c",
+    }
+    assert {row.id for row in db_session.query(StoryCluster)} == {"story_a", "story_d"}
+
+
+def test_merge_moves_an_item_shared_by_two_absorbed_clusters_once(db_session) -> None:
+    make_cluster(db_session, "a", "Central bank raises interest rates by half point", 3)
+    make_cluster(db_session, "b", "Central bank raises interest rates half point surprise", 2)
+    make_cluster(db_session, "c", "Interest rates: central bank raises by half point", 1)
+    # Older databases can link one item to several clusters.
+    db_session.add(ClusterItem(cluster_id="story_c", source_item_id="item_b"))
+    db_session.flush()
+
+    result = merge_fragmented_clusters(db_session, threshold=0.5)
+
+    assert result.merged_count == 2
+    links = [link.source_item_id for link in db_session.query(ClusterItem).filter_by(cluster_id="story_a")]
+    assert sorted(links) == ["item_a", "item_b", "item_c"]
+    assert db_session.query(ClusterItem).count() == 3
+
+
+def test_merge_only_examines_clusters_changed_since_last_pass(db_session) -> None:
+    make_cluster(db_session, "a", "Central bank raises interest rates by half point", 3)
+    make_cluster(db_session, "b", "Central bank raises interest rates half point surprise", 2)
+    db_session.commit()
+
+    result = merge_fragmented_clusters(db_session, since=datetime.now(timezone.utc) + timedelta(minutes=5), threshold=0.5)
+
+    assert result.examined_count == 0
+    assert db_session.query(StoryCluster).count() == 2
@@ -0,0 +1,46 @@
+from app.services.clustering.dedupe import (
+    DuplicateIndex,
+    from_signed64,
+    hamming_distance,
+    item_fingerprint,
+    simhash,
+    to_signed64,
+)
+
+WIRE_COPY = (
+    "Regulators approved the merger of the two largest regional railways on Tuesday, "
+    "clearing the way for a combined network spanning twelve states and three ports."
+)
+
+
+def test_simhash_keeps_near_duplicates_within_small_radius() -> None:
+    syndicated = WIRE_COPY.replace("Tuesday", "Tuesday evening")
+    unrelated = "Local bakery wins national pastry championship after surprise entry from apprentice chef team."
+
+    assert hamming_distance(simhash(WIRE_COPY), simhash(syndicated)) <= 3
+    assert hamming_distance(simhash(WIRE_COPY), simhash(unrelated)) > 10
+
+
+def test_signed_round_trip_preserves_fingerprint() -> None:
+    fingerprint = (1 << 63) | 12345
+    assert to_signed64(fingerprint) < 0
+    assert from_signed64(to_signed64(fingerprint)) == fingerprint
+
+
+def test_item_fingerprint_skips_short_texts() -> None:
+    assert item_fingerprint("Short title", "", min_tokens=8) is None
+    assert item_fingerprint("Rail merger", WIRE_COPY, min_tokens=8) is not None
+
+
+def test_duplicate_index_matches_exact_keys_and_near_duplicate_bodies() -> None:
+    index = DuplicateIndex(radius=3)
+    original = item_fingerprint("Rail merger", WIRE_COPY, min_tokens=8)
+    index.add("key-original", original, "story_rail")
+
+    exact = index.match("key-original", None)
+    near = index.match("key-syndicated", item_fingerprint("Rail merger", WIRE_COPY + " AP", min_tokens=8))
+    miss = index.match("key-other", item_fingerprint("Bakery", "Local bakery wins national pastry championship", 1))
+
+    assert exact is not None and exact.kind == "exact" and exact.cluster_id == "story_rail"
+    assert near is not None and near.kind == "simhash" and near.cluster_id == "story_rail"
+    assert miss is None
@@ -0,0 +1,168 @@
+from __future__ import annotations
+
+from concurrent.futures import Future, ProcessPoolExecutor
+
+import pytest
+
+from app.core.config import settings
+from app.services import pipeline
+from app.services.ingestion import feeds
+from app.services.ingestion.feeds import parse_feed, stream_feed_entries
+from app.services.ingestion.youtube import YouTubeConnector
+from app.services.run_stats import count_downloads
+from tests.test_ingestion_adapters import make_source
+
+
+def atom_feed(entries: int) -> bytes:
+    body = "".join(
+        f"<entry><id>urn:entry:{index}</id><title>Entry {index}</title>"
+        f"<updated>2026-02-26T10:{index % 60:02d}:00Z</updated><summary>Body {index}</summary></entry>"
+        for index in range(entries)
+    )
+    return f'<?xml version="1.0"?><feed xmlns="http://www.w3.org/2005/Atom"><title>t</title>{body}</feed>'.encode()
+
+
+def test_process_pool_parse_matches_inline_parse(monkeypatch) -> None:
+    content = atom_feed(40)
+    monkeypatch.setattr(settings, "feed_parse_processes", 0)
+    inline = parse_feed(content, limit=10)
+
+    monkeypatch.setattr(settings, "feed_parse_processes", 1)
+    monkeypatch.setattr(feeds, "_pool", None)
+    try:
+        pooled = parse_feed(content, limit=10)
+        assert isinstance(feeds._pool, ProcessPoolExecutor)
+    finally:
+        if feeds._pool is not None:
+            feeds._pool.shutdown()
+
+    assert pooled == inline
+    assert [entry["id"] for entry in pooled] == [f"urn:entry:{index}" for index in range(10)]
+
+
+def test_parse_timeout_recycles_the_pool(monkeypatch) -> None:
+    class StuckProcess:
+        terminated = False
+
+        def terminate(self) -> None:
+            self.terminated = True
+
+    class StuckPool:
+        def __init__(self) -> None:
+            self._processes = {1: StuckProcess()}
+            self.shut_down = False
+
+        def submit(self, func, *args) -> Future:
+            return Future()
+
+        def shutdown(self, wait: bool = True, cancel_futures: bool = False) -> None:
+            self.shut_down = True
+
+    stuck = StuckPool()
+    monkeypatch.setattr(settings, "feed_parse_processes", 1)
+    monkeypatch.setattr(settings, "ingestion_timeout_seconds", 0.05)
+    monkeypatch.setattr(feeds, "_pool", stuck)
+
+    with pytest.raises(TimeoutError):
+        parse_feed(atom_feed(1), limit=10)
+
+    assert feeds._pool is None
+    assert stuck.shut_down and stuck._processes[1].terminated
+
+
+def rss_feed(entries: int, summary_bytes: int = 40) -> bytes:
+    items = "".join(
+        f"<item><guid>guid-{index}</guid><title>Item {index}</title><link>https://example.com/{index}</link>"
+        f"<description>{'x' * summary_bytes}</description><pubDate>Thu, 26 Feb 2026 10:15:00 GMT</pubDate>"
+        f"<dc:creator>Desk {index}</dc:creator></item>"
+        for index in range(entries)
+    )
+    return (
+        '<?xml version="1.0"?><rss version="2.0" xmlns:dc="http://purl.org/dc/elements/1.1/">'
+        f"<channel><title>Example</title><link>https://example.com</link>{items}</channel></rss>"
+    ).encode()
+
+
+def write_feed(tmp_path, content: bytes) -> str:
+    path = tmp_path / "feed.xml"
+    path.write_bytes(content)
+    return str(path)
+
+
+def test_streaming_parse_stops_at_limit_and_known_entries(tmp_path) -> None:
+    ref = write_feed(tmp_path, rss_feed(10))
+
+    limited = stream_feed_entries(ref, limit=2, is_known=lambda entry: False)
+    new_only = stream_feed_entries(ref, limit=25, is_known=lambda entry: entry["id"] == "guid-3")
+
+    assert limited[0] == {
+        "id": "guid-0",
+        "title": "Item 0",
+        "link": "https://example.com/0",
+        "summary": "x" * 40,
+        "published": "Thu, 26 Feb 2026 10:15:00 GMT",
+        "author": "Desk 0",
+    }
+    assert [entry["id"] for entry in limited] == ["guid-0", "guid-1"]
+    assert [entry["id"] for entry in new_only] == ["guid-0", "guid-1", "guid-2"]
+
+
+def test_streaming_parse_reads_only_the_head_of_a_large_feed(tmp_path) -> None:
+    content = rss_feed(500, summary_bytes=8_000)
+    ref = write_feed(tmp_path, content)
+
+    with count_downloads() as downloaded:
+        entries = stream_feed_entries(ref, limit=5, is_known=lambda entry: False)
+
+    assert len(entries) == 5
+    assert downloaded[0] < len(content) / 10
+
+
+def test_streaming_parse_reads_youtube_atom_fields(tmp_path) -> None:
+    ref = write_feed(
+        tmp_path,
+        b"""<?xml version="1.0"?>
+        <feed xmlns="http://www.w3.org/2005/Atom" xmlns:yt="http://www.youtube.com/xml/schemas/2015"
+              xmlns:media="http://search.yahoo.com/mrss/">
+          <title>Channel</title>
+          <entry>
+            <id>yt:video:vid123</id><yt:videoId>vid123</yt:videoId><title>New video</title>
+            <link rel="alternate" href="https://www.youtube.com/watch?v=vid123"/>
+            <author><name>Channel</name></author>
+            <published>2026-02-26T10:15:00+00:00</published>
+            <media:group><media:description>Video summary</media:description></media:group>
+          </entry>
+        </feed>""",
+    )
+
+    [entry] = stream_feed_entries(ref, limit=5, is_known=lambda entry: False)
+
+    normalized = YouTubeConnector().normalize(make_source("youtube", ref), entry)
+    assert normalized.external_id == "vid123"
+    assert normalized.url == "https://www.youtube.com/watch?v=vid123"
+    assert normalized.body == "Video summary"
+    assert normalized.author == "Channel"
+
+
+def test_malformed_feed_falls_back_to_feedparser(tmp_path) -> None:
+    ref = write_feed(tmp_path, rss_feed(4).replace(b"Item 1<", b"Item&nbsp;1<"))
+
+    entries = stream_feed_entries(ref, limit=25, is_known=lambda entry: entry["id"] == "guid-2")
+
+    assert [entry["id"] for entry in entries] == ["guid-0", "guid-1"]
+
+
+def test_pipeline_skips_entries_already_stored(db_session, tmp_path, monkeypatch) -> None:
+    ref = write_feed(tmp_path, rss_feed(6))
+    db_session.add(make_source("rss", ref))
+    db_session.commit()
+    monkeypatch.setattr(settings, "ingestion_default_limit", 4)
+
+    first = pipeline.run_ingestion_pipeline(db_session, source_types=["rss"], summarize=False)
+    second = pipeline.run_ingestion_pipeline(db_session, source_types=["rss"], summarize=False)
+    fresh = b"<item><guid>guid-new</guid><title>Fresh</title></item>"
+    (tmp_path / "feed.xml").write_bytes(rss_feed(6).replace(b"<item>", fresh + b"<item>", 1))
+    third = pipeline.run_ingestion_pipeline(db_session, source_types=["rss"], summarize=False)
+
+    assert (first.fetched_count, second.fetched_count, third.fetched_count) == (4, 0, 1)
+    assert third.normalized_count == 1
@@ -1,11 +1,13 @@
 from __future__ import annotations
 
-from datetime import timezone
+from datetime import datetime, timedelta, timezone
 
 import pytest
 
+from app.core.config import settings
 from app.db.models import Source
 from app.services.ingestion.discord import DiscordConnector
+from app.services.ingestion.models import FetchCursor
 from app.services.ingestion.reddit import RedditConnector
 from app.services.ingestion.rss import RSSConnector
 from app.services.ingestion.twitter import TwitterConnector
@@ -26,19 +28,25 @@ def make_source(source_type: str, external_ref: str) -> Source:
     )
 
 
-def test_rss_fetch_latest_uses_feedparser(monkeypatch) -> None:
+def test_rss_fetch_latest_returns_trimmed_plain_entries(monkeypatch) -> None:
     connector = RSSConnector()
     source = make_source("rss", "https://example.com/rss.xml")
+    feed = b"""<?xml version="1.0"?>
+    <rss version="2.0"><channel><title>Example</title>
+      <item><guid>1</guid><title>a</title><pubDate>Thu, 26 Feb 2026 10:15:00 GMT</pubDate></item>
+      <item><guid>2</guid><title>b</title></item>
+    </channel></rss>"""
 
-    class DummyFeed:
-        entries = [{"id": "1", "title": "a"}, {"id": "2", "title": "b"}]
-
-    monkeypatch.setattr("app.services.ingestion.rss.feedparser.parse", lambda _: DummyFeed())
+    monkeypatch.setattr(settings, "feed_parser", "feedparser")
+    monkeypatch.setattr(settings, "feed_parse_processes", 0)
+    monkeypatch.setattr("app.services.ingestion.feeds.fetch_feed_bytes", lambda ref, source_type: feed)
 
     items = connector.fetch_latest(source, limit=1)
 
     assert len(items) == 1
     assert items[0]["id"] == "1"
+    assert type(items[0]) is dict
+    assert not any(key.endswith(("_parsed", "_detail")) for key in items[0])
 
 
 def test_reddit_fetch_latest_parses_children(monkeypatch) -> None:
@@ -46,8 +54,9 @@ def test_reddit_fetch_latest_parses_children(monkeypatch) -> None:
     source = make_source("reddit", "worldnews")
 
     class DummyResponse:
-        def raise_for_status(self) -> None:
-            return None
+        content = b"{}"
+        headers: dict = {}
+        is_success = True
 
         def json(self) -> dict:
             return {
@@ -69,7 +78,11 @@ def test_reddit_fetch_latest_parses_children(monkeypatch) -> None:
         def __exit__(self, exc_type, exc, tb):
             return None
 
-        def get(self, url, params=None):
+        def build_request(self, method, url, params=None):
+            return url, params
+
+        def send(self, request, stream=False):
+            url, params = request
             assert "/r/worldnews/new.json" in url
             assert params and params["limit"] == 2
             return DummyResponse()
@@ -116,3 +129,25 @@ def test_placeholder_adapters_are_stubbed() -> None:
 
     with pytest.raises(NotImplementedError):
         discord.normalize(source_discord, {})
+
+
+def test_reddit_fetch_new_asks_only_for_posts_after_the_cursor(monkeypatch) -> None:
+    connector = RedditConnector()
+    source = make_source("reddit", "worldnews")
+    requests: list[dict] = []
+
+    def listing(self, source, params):
+        requests.append(params)
+        return []
+
+    monkeypatch.setattr(RedditConnector, "_fetch_listing", listing)
+
+    fresh = FetchCursor("a9", datetime.now(timezone.utc) - timedelta(minutes=5))
+    stale = FetchCursor("a9", datetime.now(timezone.utc) - timedelta(days=3))
+
+    assert connector.fetch_new(source, 25, fresh) == []
+    assert requests == [{"limit": 25, "before": "t3_a9"}]
+    connector.fetch_new(source, 25, stale)
+    assert requests[1:] == [{"limit": 25, "before": "t3_a9"}, {"limit": 25}]
+    connector.fetch_new(source, 25, FetchCursor())
+    assert requests[-1] == {"limit": 25}
@@ -62,3 +62,16 @@ def test_reddit_normalization_includes_engagement() -> None:
     assert normalized.engagement["upvotes"] == 321
     assert normalized.engagement["comments"] == 45
     assert normalized.published_at.tzinfo == timezone.utc
+
+
+def test_feed_entries_without_a_link_do_not_share_a_dedupe_key() -> None:
+    connector = RSSConnector()
+    source = make_source("rss", "https://example.com/feed.xml")
+
+    first = connector.normalize(source, {"id": "entry-1", "title": "Bridge reopens"})
+    second = connector.normalize(source, {"id": "entry-2", "title": "Storm warning issued"})
+    linked = connector.normalize(source, {"id": "entry-3", "title": "Rates held", "link": "https://example.com/rates"})
+
+    assert first.url == second.url == "https://example.com/feed.xml"
+    assert first.dedupe_key != second.dedupe_key
+    assert linked.dedupe_key == connector.normalize(source, {"id": "entry-4", "link": "https://example.com/rates"}).dedupe_key
@@ -1,6 +1,6 @@
 from datetime import timezone
 
-from app.services.ingestion.utils import parse_datetime
+from app.services.ingestion.utils import parse_datetime, parse_optional_datetime
 
 
 def test_parse_datetime_handles_unix_epoch_strings() -> None:
@@ -13,3 +13,9 @@ def test_parse_datetime_handles_iso8601() -> None:
     parsed = parse_datetime("2026-02-26T10:15:00Z")
     assert parsed.tzinfo == timezone.utc
     assert parsed.month == 2
+
+
+def test_parse_optional_datetime_returns_none_for_missing_or_unparseable_values() -> None:
+    assert parse_optional_datetime(None) is None
+    assert parse_optional_datetime("not a date") is None
+    assert parse_optional_datetime("2026-02-26T10:15:00Z") == parse_datetime("2026-02-26T10:15:00Z")
@@ -0,0 +1,48 @@
+from __future__ import annotations
+
+import asyncio
+
+import pytest
+from sqlalchemy import func, select
+
+from app.db.models import StoryCluster
+from app.db.session import get_async_db
+from benchmarks.loadtest import _run_inprocess, inprocess_client, parse_mix, seed_dataset
+
+
+def test_load_run_reports_latency_queries_and_cache_hits(file_session_factory) -> None:
+    with file_session_factory() as db:
+        story_ids = seed_dataset(db, clusters=40, items_per_cluster=3, sources=5)
+    options = {"mix": parse_mix("latest=3,story=1"), "requests": 60, "concurrency": 4}
+
+    cached, uncached = asyncio.run(_run_inprocess(file_session_factory, story_ids, ["memory", "none"], options))
+
+    assert [cached["cache_backend"], uncached["cache_backend"]] == ["memory", "none"]
+    for run in (cached, uncached):
+        assert run["requests"] == 60
+        assert run["errors"] == 0
+        assert run["latency_ms"]["p50"] <= run["latency_ms"]["p99"]
+        assert set(run["endpoints"]) == {"latest", "story"}
+    assert cached["cache"]["hit_ratio"] > 0.5
+    assert uncached["cache"]["hit"] == 0
+    assert cached["db_queries"]["total"] < uncached["db_queries"]["total"]
+
+
+def test_inprocess_client_points_async_reads_at_the_seeded_database(file_session_factory) -> None:
+    pytest.importorskip("aiosqlite")
+    from app.main import app
+
+    with file_session_factory() as db:
+        seed_dataset(db, clusters=7, items_per_cluster=2, sources=3)
+
+    async def count_clusters() -> int:
+        async with inprocess_client(file_session_factory):
+            sessions = app.dependency_overrides[get_async_db]()
+            db = await anext(sessions)
+            try:
+                return await db.scalar(select(func.count(StoryCluster.id)))
+            finally:
+                await sessions.aclose()
+
+    assert asyncio.run(count_clusters()) == 7
+    assert get_async_db not in app.dependency_overrides
@@ -0,0 +1,98 @@
+from __future__ import annotations
+
+from fastapi.testclient import TestClient
+from prometheus_client import REGISTRY
+
+from app.core import metrics
+from app.core.config import settings
+from app.db import session
+from app.db.session import get_db
+from app.main import app
+from app.services import cache, queue
+from app.services.summarization.base import SummaryDraft, SummarizerProvider
+from app.services.summarization.service import _summarize_with_metrics
+
+
+def sample(name: str, **labels) -> float:
+    return REGISTRY.get_sample_value(name, labels) or 0.0
+
+
+def test_metrics_endpoint_reports_route_latency_and_cache_errors(db_session, monkeypatch) -> None:
+    def unavailable():
+        raise ConnectionError("redis down")
+
+    monkeypatch.setattr(cache, "get_redis", unavailable)
+    app.dependency_overrides[get_db] = lambda: db_session
+    try:
+        client = TestClient(app)
+        errors_before = sample("pulsewire_cache_requests_total", operation="get", result="error")
+
+        categories = client.get("/v1/categories")
+        response = client.get("/metrics")
+    finally:
+        app.dependency_overrides.clear()
+
+    assert categories.status_code == 200
+    assert categories.headers["X-DB-Queries"] == "1"
+    assert categories.headers["Server-Timing"].startswith("db;dur=")
+    assert response.status_code == 200
+    assert 'pulsewire_http_request_duration_seconds_count{method="GET",route="/v1/categories",status="200"}' in response.text
+    assert sample("pulsewire_cache_requests_total", operation="get", result="error") == errors_before + 1
+
+
+def test_summaries_count_provider_tokens() -> None:
+    class CountingProvider(SummarizerProvider):
+        provider_name = "counting"
+
+        def summarize(self, headline: str, evidence: list[str]) -> SummaryDraft:
+            return SummaryDraft(
+                provider=self.provider_name,
+                model="counting-1",
+                short_summary=headline,
+                long_summary=headline,
+                changes_bullets=[],
+                why_it_matters=None,
+                input_tokens=120,
+                output_tokens=30,
+            )
+
+    _summarize_with_metrics(CountingProvider(), "Headline", ["evidence"])
+
+    assert sample("pulsewire_llm_tokens_total", provider="counting", model="counting-1", kind="input") == 120
+    assert sample("pulsewire_llm_tokens_total", provider="counting", model="counting-1", kind="output") == 30
+    assert sample("pulsewire_llm_request_duration_seconds_count", provider="counting", model="counting-1", outcome="ok") == 1
+
+
+def test_observed_jobs_write_the_textfile_sink(tmp_path, monkeypatch) -> None:
+    path = tmp_path / "pulsewire.prom"
+    monkeypatch.setattr(metrics.settings, "metrics_textfile_path", str(path))
+
+    @metrics.observe_job("test-job")
+    def job() -> str:
+        return "done"
+
+    assert job() == "done"
+    assert 'pulsewire_job_duration_seconds_count{job="test-job",outcome="succeeded"} 1.0' in path.read_text()
+
+
+def test_multiprocess_scrape_keeps_live_collectors(tmp_path, monkeypatch) -> None:
+    class CountedQueue:
+        count = 7
+
+    monkeypatch.setenv("PROMETHEUS_MULTIPROC_DIR", str(tmp_path))
+    monkeypatch.setattr(queue, "get_queue", lambda name: CountedQueue())
+
+    body, _ = metrics.render_metrics()
+
+    text = body.decode()
+    assert f'pulsewire_queue_jobs{{queue="{settings.ingestion_queue_name}"}} 7.0' in text
+    assert 'pulsewire_db_pool_checked_out{pool="sync"}' in text
+
+
+def test_async_engine_pool_is_instrumented(monkeypatch) -> None:
+    monkeypatch.setattr(session, "_async_sessions", None)
+
+    bind = session.get_async_sessionmaker().kw["bind"]
+
+    assert isinstance(bind.sync_engine.pool, session.TimedAsyncAdaptedQueuePool)
+    assert REGISTRY.get_sample_value("pulsewire_db_pool_checked_out", {"pool": "async"}) == 0.0
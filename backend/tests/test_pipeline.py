@@ -0,0 +1,178 @@
+from __future__ import annotations
+
+import threading
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from app.core.config import settings
+from app.db.models import ClusterItem, IngestionRun, IngestionSourceStats, Source, SourceCursor, SourceItem
+from app.services import pipeline
+
+
+def test_pipeline_checkpoints_progress_per_source(db_session, fake_sources) -> None:
+    result = pipeline.run_ingestion_pipeline(db_session, summarize=False)
+
+    run = db_session.get(IngestionRun, result.run_id)
+    assert run.status == "completed"
+    assert run.completed_source_ids == ["src_a", "src_b", "src_c"]
+    assert result.normalized_count == 10
+    assert len(result.dirty_cluster_ids) == len(set(run.touched_cluster_ids)) > 0
+    # Every chunk is committed and expunged, so only the run itself stays in the identity map.
+    assert list(db_session) == [run]
+
+
+def test_pipeline_resumes_interrupted_run(db_session, fake_sources, monkeypatch) -> None:
+    assign = pipeline.assign_items_to_clusters
+
+    def crash_on_gamma(db, items, engine=None, pinned=None):
+        if any(item.source_id == "src_c" for item in items):
+            raise RuntimeError("worker killed")
+        return assign(db, items, engine, pinned=pinned)
+
+    monkeypatch.setattr(pipeline, "assign_items_to_clusters", crash_on_gamma)
+    with pytest.raises(RuntimeError):
+        pipeline.run_ingestion_pipeline(db_session, summarize=False)
+
+    failed = db_session.query(IngestionRun).one()
+    assert failed.status == "failed"
+    assert failed.completed_source_ids == ["src_a", "src_b"]
+    assert db_session.query(SourceItem).count() == 8
+
+    monkeypatch.setattr(pipeline, "assign_items_to_clusters", assign)
+    result = pipeline.run_ingestion_pipeline(db_session, summarize=False, resume_run_id=failed.id)
+
+    assert result.run_id == failed.id
+    assert result.normalized_count == 10
+    assert db_session.get(IngestionRun, failed.id).completed_source_ids == ["src_a", "src_b", "src_c"]
+    assert db_session.query(ClusterItem).count() == 10
+
+
+def test_pipeline_limits_run_to_shard_and_records_fetch_costs(db_session, fake_sources) -> None:
+    result = pipeline.run_ingestion_pipeline(db_session, summarize=False, source_ids=["src_b", "src_c"])
+
+    run = db_session.get(IngestionRun, result.run_id)
+    assert run.completed_source_ids == ["src_b", "src_c"]
+    assert run.stats_json["source_ids"] == ["src_b", "src_c"]
+    assert set(run.stats_json["source_fetch_ms"]) == {"src_b", "src_c"}
+    assert result.normalized_count == 5
+
+
+def test_pipeline_collapses_cross_source_duplicates(db_session, fake_sources) -> None:
+    shared = {"url": "https://news.example.com/rail-merger", "published_at": datetime.now(timezone.utc).isoformat()}
+    fake_sources.items_by_source = {
+        "src_a": [{**shared, "id": "a-1", "title": "Rail merger approved by regulators"}],
+        "src_b": [{**shared, "id": "b-1", "title": "Regulators sign off on railway deal"}],
+        "src_c": [],
+    }
+
+    result = pipeline.run_ingestion_pipeline(db_session, summarize=False)
+
+    assert result.deduplicated_count == 1
+    assert len(result.dirty_cluster_ids) == 1
+    assert db_session.query(ClusterItem).count() == 2
+
+
+def test_pipeline_records_stage_and_source_stats(db_session, fake_sources, monkeypatch) -> None:
+    fetch_latest = fake_sources.fetch_latest
+
+    def flaky_fetch(source: Source, limit: int = 25) -> list[dict]:
+        if source.id == "src_c":
+            raise TimeoutError("feed timed out")
+        return fetch_latest(source, limit)
+
+    monkeypatch.setattr(fake_sources, "fetch_latest", flaky_fetch)
+
+    result = pipeline.run_ingestion_pipeline(db_session, summarize=False)
+
+    run = db_session.get(IngestionRun, result.run_id)
+    stages = run.stats_json["stages"]
+    assert stages["fetch"]["calls"] == 3
+    assert stages["upsert"]["calls"] == 8
+    assert stages["upsert"]["db_queries"] > 0
+    assert stages["cluster"]["db_queries"] > 0
+    assert run.stats_json["totals"]["db_queries"] >= stages["upsert"]["db_queries"] + stages["cluster"]["db_queries"]
+
+    assert result.stats["sources"]["src_a"]["created_count"] == 5
+    assert result.stats["sources"]["src_c"]["error"] == "TimeoutError: feed timed out"
+    assert db_session.query(IngestionSourceStats).filter_by(run_id=run.id).count() == 3
+
+
+def test_pipeline_fetches_sources_concurrently_in_source_order(db_session, fake_sources, monkeypatch) -> None:
+    # Only passes if all three fetches are in flight at once.
+    barrier = threading.Barrier(3, timeout=5)
+    fetch_latest = fake_sources.fetch_latest
+
+    def rendezvous(source, limit=25):
+        barrier.wait()
+        return fetch_latest(source, limit)
+
+    monkeypatch.setattr(fake_sources, "fetch_latest", rendezvous)
+    monkeypatch.setattr(settings, "ingestion_fetch_concurrency", 3)
+
+    result = pipeline.run_ingestion_pipeline(db_session, summarize=False)
+
+    run = db_session.get(IngestionRun, result.run_id)
+    assert run.completed_source_ids == ["src_a", "src_b", "src_c"]
+    assert result.fetched_count == 10
+
+
+def test_pipeline_advances_cursor_and_skips_items_behind_it(db_session, fake_sources) -> None:
+    first = pipeline.run_ingestion_pipeline(db_session, summarize=False)
+    cursor = db_session.get(SourceCursor, "src_a")
+    assert cursor.last_external_id == "alpha-0"
+
+    steady = pipeline.run_ingestion_pipeline(db_session, summarize=False)
+    steady_run = db_session.get(IngestionRun, steady.run_id)
+    assert steady.normalized_count == 0
+    assert steady_run.stats_json["stages"]["upsert"]["calls"] == 0
+    assert steady.stats["sources"]["src_a"]["skipped_count"] == 5
+
+    now = datetime.now(timezone.utc)
+    fake_sources.items_by_source["src_a"] = [
+        {"id": "alpha-new", "title": "alpha fresh headline uniquefresh", "published_at": (now + timedelta(minutes=1)).isoformat()},
+        {"id": "alpha-late", "title": "alpha backdated headline uniquelate", "published_at": (now - timedelta(days=1)).isoformat()},
+        *fake_sources.items_by_source["src_a"],
+    ]
+    third = pipeline.run_ingestion_pipeline(db_session, summarize=False)
+
+    assert first.normalized_count == 10
+    assert third.normalized_count == 1
+    assert third.stats["sources"]["src_a"]["skipped_count"] == 6
+    assert db_session.get(SourceCursor, "src_a").last_external_id == "alpha-new"
+
+
+def test_pipeline_advances_existing_cursors_across_chunk_checkpoints(db_session, fake_sources) -> None:
+    pipeline.run_ingestion_pipeline(db_session, summarize=False)
+    assert db_session.query(SourceCursor).count() == 3
+
+    now = datetime.now(timezone.utc)
+    for source_id, items in fake_sources.items_by_source.items():
+        items.insert(0, {"id": f"{source_id}-new", "title": f"{source_id} fresh headline unique{source_id}", "published_at": now.isoformat()})
+    # Three sources with a chunk size of 2: src_b and src_c are advanced after the first checkpoint.
+    second = pipeline.run_ingestion_pipeline(db_session, summarize=False)
+
+    assert second.normalized_count == 3
+    db_session.expire_all()
+    cursors = {row.source_id: row.last_external_id for row in db_session.query(SourceCursor)}
+    assert cursors == {"src_a": "src_a-new", "src_b": "src_b-new", "src_c": "src_c-new"}
+
+
+def test_pipeline_keeps_cursor_off_future_and_undated_timestamps(db_session, fake_sources) -> None:
+    now = datetime.now(timezone.utc)
+    fake_sources.items_by_source = {
+        "src_a": [
+            {"id": "alpha-undated", "title": "alpha undated headline uniqueundated"},
+            {"id": "alpha-future", "title": "alpha future headline uniquefuture", "published_at": (now + timedelta(days=30)).isoformat()},
+        ],
+        "src_b": [{"id": "beta-undated", "title": "beta undated headline uniquebetaundated", "published_at": "not a date"}],
+        "src_c": [],
+    }
+
+    result = pipeline.run_ingestion_pipeline(db_session, summarize=False)
+
+    assert result.normalized_count == 3
+    cursor = db_session.get(SourceCursor, "src_a")
+    assert cursor.last_external_id == "alpha-future"
+    assert cursor.last_published_at <= datetime.now(timezone.utc)
+    assert db_session.get(SourceCursor, "src_b") is None
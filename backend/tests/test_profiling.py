@@ -0,0 +1,122 @@
+from __future__ import annotations
+
+import pstats
+import threading
+import time
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.core import profiling
+from app.core.profiling import StackSampler, install_request_profiler
+from app.db.models import IngestionRun
+from app.jobs import ingestion
+from app.services import pipeline
+
+
+def test_profiled_ingestion_job_saves_profile_next_to_run(session_factory, tmp_path, monkeypatch) -> None:
+    monkeypatch.setattr(profiling.settings, "profile_dir", str(tmp_path))
+    monkeypatch.setattr(ingestion, "SessionLocal", session_factory)
+    monkeypatch.setattr(ingestion, "publish_dirty_clusters", lambda cluster_ids: {"queued": 0, "coalesced": 0, "inline": 0})
+    monkeypatch.setattr(pipeline, "get_connector", lambda source_type: None)
+
+    result = ingestion.run_ingestion_job(profile=True)
+
+    with session_factory() as db:
+        run = db.get(IngestionRun, result["run_id"])
+    assert run.stats_json["profile_path"] == result["profile_path"]
+    assert result["run_id"] in result["profile_path"]
+    stats = pstats.Stats(result["profile_path"])
+    assert any(name == "run_ingestion_pipeline" for _, _, name in stats.stats)
+
+
+def test_unprofiled_ingestion_job_writes_nothing(session_factory, tmp_path, monkeypatch) -> None:
+    monkeypatch.setattr(profiling.settings, "profile_dir", str(tmp_path))
+    monkeypatch.setattr(ingestion, "SessionLocal", session_factory)
+    monkeypatch.setattr(ingestion, "publish_dirty_clusters", lambda cluster_ids: {"queued": 0, "coalesced": 0, "inline": 0})
+    monkeypatch.setattr(pipeline, "get_connector", lambda source_type: None)
+
+    result = ingestion.run_ingestion_job()
+
+    assert "profile_path" not in result
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_stack_sampler_sees_work_on_other_threads() -> None:
+    def busy_work(deadline: float) -> None:
+        while time.monotonic() < deadline:
+            sum(range(1000))
+
+    worker = threading.Thread(target=busy_work, args=(time.monotonic() + 0.2,))
+    sampler = StackSampler(interval_seconds=0.002).start()
+    worker.start()
+    worker.join()
+    counts = sampler.stop()
+
+    assert any("busy_work" in stack for stack in counts)
+
+
+def test_request_profiler_writes_folded_stacks_for_sampled_requests(tmp_path, monkeypatch) -> None:
+    monkeypatch.setattr(profiling.settings, "profile_dir", str(tmp_path))
+    monkeypatch.setattr(profiling.settings, "profile_request_rate", 1.0)
+    app = FastAPI()
+
+    @app.get("/v1/items/{item_id}")
+    def read_item(item_id: str) -> dict:
+        time.sleep(0.05)
+        return {"id": item_id}
+
+    install_request_profiler(app)
+
+    assert TestClient(app).get("/v1/items/42").status_code == 200
+
+    [profile] = list(tmp_path.iterdir())
+    assert profile.name.startswith("request-GET-_v1_items_item_id-")
+    assert profile.suffix == ".folded"
+    lines = profile.read_text().splitlines()
+    assert lines and all("read_item" in line for line in lines)
+
+
+def test_stack_sampler_keeps_only_stacks_within_the_given_code() -> None:
+    def busy_work(deadline: float) -> None:
+        while time.monotonic() < deadline:
+            sum(range(1000))
+
+    def other_work(deadline: float) -> None:
+        while time.monotonic() < deadline:
+            sum(range(1000))
+
+    deadline = time.monotonic() + 0.2
+    workers = [threading.Thread(target=busy_work, args=(deadline,)), threading.Thread(target=other_work, args=(deadline,))]
+    sampler = StackSampler(interval_seconds=0.002, within=busy_work.__code__).start()
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+    counts = sampler.stop()
+
+    assert counts
+    assert all("busy_work" in stack and "other_work" not in stack for stack in counts)
+
+
+def test_failed_ingestion_profile_is_named_after_its_run(session_factory, tmp_path, monkeypatch) -> None:
+    monkeypatch.setattr(profiling.settings, "profile_dir", str(tmp_path))
+    monkeypatch.setattr(ingestion, "SessionLocal", session_factory)
+
+    def crash(db, **kwargs):
+        run = IngestionRun(source_filter=[], completed_source_ids=[], touched_cluster_ids=[], stats_json={}, status="failed")
+        db.add(run)
+        db.commit()
+        raise RuntimeError("worker killed")
+
+    monkeypatch.setattr(ingestion, "run_ingestion_pipeline", crash)
+
+    with pytest.raises(RuntimeError):
+        ingestion.run_ingestion_job(profile=True)
+
+    with session_factory() as db:
+        run = db.query(IngestionRun).one()
+    [profile] = list(tmp_path.iterdir())
+    assert profile.name.startswith(f"ingestion-{run.id}-failed-")
+    assert run.stats_json["profile_path"] == str(profile)
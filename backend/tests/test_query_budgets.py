@@ -0,0 +1,128 @@
+from __future__ import annotations
+
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from app.core.config import settings
+from app.db.models import Category, Source, SourceItem, StoryCluster
+from app.services import pipeline
+from app.services.clustering.service import assign_items_to_clusters
+from app.services.ingestion.base import SourceConnector
+from app.services.ingestion.models import NormalizedItem, utc_now
+from app.services.store import get_story_cards, get_story_detail
+from app.services.summarization.service import summarize_cluster
+
+TOPICS = ["volcano", "election", "merger", "satellite", "championship", "vaccine", "drought", "heist"]
+
+
+def topic_title(topic: str) -> str:
+    return f"{topic.title()} {topic}ology {topic}watch"
+
+
+def make_source(source_id: str, category_hints: list[str]) -> Source:
+    return Source(
+        id=source_id,
+        source_type="budget",
+        name=f"{source_id} name",
+        external_ref=source_id,
+        url=f"https://example.com/{source_id}",
+        enabled=True,
+        polling_interval_seconds=300,
+        category_hints=category_hints,
+        auth_config={},
+    )
+
+
+class TopicConnector(SourceConnector):
+    source_type = "budget"
+
+    def fetch_latest(self, source: Source, limit: int = 25) -> list[dict]:
+        return [{"id": f"{source.id}-{topic}", "topic": topic} for topic in TOPICS][:limit]
+
+    def normalize(self, source: Source, raw_item: dict) -> NormalizedItem:
+        topic = raw_item["topic"]
+        return NormalizedItem(
+            source_id=source.id,
+            source_type=source.source_type,
+            source_name=source.name,
+            external_id=raw_item["id"],
+            author=None,
+            title=topic_title(topic),
+            body="",
+            url=f"https://example.com/{raw_item['id']}",
+            published_at=utc_now() - timedelta(minutes=TOPICS.index(topic)),
+            fetched_at=utc_now(),
+            raw_payload={"id": raw_item["id"]},
+        )
+
+
+@pytest.fixture()
+def topic_sources(db_session, monkeypatch) -> list[str]:
+    db_session.add_all([Category(slug="world", name="World"), Category(slug="science", name="Science")])
+    source_ids = ["src_one", "src_two", "src_three"]
+    db_session.add_all([make_source(source_id, ["world" if index % 2 else "science"]) for index, source_id in enumerate(source_ids)])
+    db_session.commit()
+    monkeypatch.setattr(pipeline, "get_connector", lambda source_type: TopicConnector())
+    monkeypatch.setattr(settings, "ingestion_chunk_size", 10)
+    return source_ids
+
+
+@pytest.fixture()
+def summarized_clusters(db_session, topic_sources) -> list[StoryCluster]:
+    now = datetime.now(timezone.utc)
+    items = [
+        SourceItem(
+            source_id=topic_sources[index % len(topic_sources)],
+            external_id=f"seed-{topic}-{index}",
+            title=topic_title(topic),
+            body="",
+            canonical_url=f"https://example.com/seed/{topic}/{index}",
+            published_at=now - timedelta(minutes=index),
+            fetched_at=now,
+            content_hash=f"seed-{topic}-{index}",
+            dedupe_key=f"seed-{topic}-{index}",
+        )
+        for index, topic in enumerate(TOPICS * 2)
+    ]
+    db_session.add_all(items)
+    db_session.flush()
+    clusters = list({cluster.id: cluster for cluster in assign_items_to_clusters(db_session, items)}.values())
+    for cluster in clusters:
+        summarize_cluster(db_session, cluster)
+        summarize_cluster(db_session, cluster)
+    db_session.commit()
+    return clusters
+
+
+def test_story_cards_query_count_does_not_grow_with_cards(db_session, summarized_clusters, query_budget) -> None:
+    with query_budget(3):
+        cards = get_story_cards(db_session, limit=20)
+
+    assert len(cards) == len(TOPICS)
+    assert all(card.short_summary != "Summary pending." for card in cards)
+
+    with query_budget(4):
+        assert get_story_cards(db_session, limit=20, category_slug="world")
+
+
+def test_story_detail_query_budget(db_session, summarized_clusters, query_budget) -> None:
+    cluster = summarized_clusters[0]
+    db_session.expunge_all()
+
+    with query_budget(4):
+        detail = get_story_detail(db_session, cluster.id)
+
+    assert len(detail.sources) == 2
+    assert {source.source_name for source in detail.sources} <= {"src_one name", "src_two name", "src_three name"}
+
+
+def test_ingestion_pipeline_query_budget(db_session, topic_sources, query_budget) -> None:
+    item_count = len(TOPICS) * len(topic_sources)
+
+    # Upserts and cluster attachment are still per item; the budget pins that cost so it cannot creep.
+    with query_budget(50 + 9 * item_count) as stats:
+        result = pipeline.run_ingestion_pipeline(db_session, summarize=False)
+
+    assert result.clustered_count == item_count
+    assert stats.count > 0
@@ -0,0 +1,135 @@
+from __future__ import annotations
+
+import time
+
+import httpx
+import pytest
+
+from app.core.config import settings
+from app.db.models import SourceHealth
+from app.services import pipeline
+from app.services.ingestion import ratelimit
+from app.services.ingestion.ratelimit import HostRateLimited, TokenBucket, fetch_deadline, send
+
+
+@pytest.fixture()
+def sleeps(monkeypatch) -> list[float]:
+    recorded: list[float] = []
+    monkeypatch.setattr(ratelimit, "_buckets", {})
+    monkeypatch.setattr(ratelimit.time, "sleep", recorded.append)
+    monkeypatch.setattr(settings, "connector_backoff_base_seconds", 0.1)
+    return recorded
+
+
+def scripted_client(responses: list[httpx.Response]) -> tuple[httpx.Client, list[httpx.Request]]:
+    seen: list[httpx.Request] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        seen.append(request)
+        return responses.pop(0)
+
+    return httpx.Client(transport=httpx.MockTransport(handler)), seen
+
+
+def test_token_bucket_spaces_reservations_after_the_burst() -> None:
+    bucket = TokenBucket(rate=2.0, burst=2)
+
+    waits = [bucket.reserve() for _ in range(4)]
+
+    assert waits[:2] == [0.0, 0.0]
+    assert waits[2] == pytest.approx(0.5, abs=0.05)
+    assert waits[3] == pytest.approx(1.0, abs=0.05)
+    assert bucket.reserve(max_wait=1.0) is None
+
+
+def test_send_honours_retry_after_then_succeeds(sleeps) -> None:
+    client, seen = scripted_client([httpx.Response(429, headers={"Retry-After": "3"}), httpx.Response(200, json={"ok": True})])
+
+    response = send(client, "reddit", "GET", "https://www.reddit.com/r/news/new.json", params={"limit": 5})
+
+    assert response.json() == {"ok": True}
+    assert len(seen) == 2 and seen[1].url.params["limit"] == "5"
+    # The backoff sleep plus the bucket's wait cover the whole Retry-After window.
+    assert sum(sleeps) >= 3.0
+
+
+def test_send_retries_server_errors_then_raises(sleeps, monkeypatch) -> None:
+    monkeypatch.setattr(settings, "connector_retry_attempts", 2)
+    client, seen = scripted_client([httpx.Response(503) for _ in range(3)])
+
+    with pytest.raises(httpx.HTTPStatusError):
+        send(client, "rss", "GET", "https://feeds.example.com/rss.xml")
+
+    assert len(seen) == 3
+    assert len([wait for wait in sleeps if wait]) <= 2
+
+
+def test_send_gives_up_when_throttling_outlasts_the_deadline(sleeps) -> None:
+    client, seen = scripted_client([httpx.Response(429, headers={"Retry-After": "600"})])
+
+    with fetch_deadline(time.monotonic() + 10), pytest.raises(HostRateLimited):
+        send(client, "reddit", "GET", "https://www.reddit.com/r/news/new.json")
+
+    assert len(seen) == 1
+    assert ratelimit.bucket_for("https://www.reddit.com/r/other/new.json", "reddit").reserve(max_wait=10) is None
+
+
+def test_send_makes_one_attempt_after_the_deadline_has_passed(sleeps) -> None:
+    assert TokenBucket(rate=1.0, burst=1).reserve(max_wait=-1.0) == 0.0
+    client, seen = scripted_client([httpx.Response(200, json={"ok": True}), httpx.Response(503)])
+
+    with fetch_deadline(time.monotonic() - 60):
+        assert send(client, "rss", "GET", "https://feeds.example.com/rss.xml").json() == {"ok": True}
+        # Past the deadline a failure is not retried.
+        with pytest.raises(httpx.HTTPStatusError):
+            send(client, "rss", "GET", "https://feeds.example.com/rss.xml")
+
+    assert len(seen) == 2
+
+
+def test_send_paces_to_the_remaining_quota(sleeps, monkeypatch) -> None:
+    monkeypatch.setattr(settings, "connector_rate_limits", {"reddit": 5.0})
+    headers = {"X-Ratelimit-Remaining": "10", "X-Ratelimit-Reset": "20"}
+    client, _ = scripted_client([httpx.Response(200, headers=headers), httpx.Response(200, headers={**headers, "X-Ratelimit-Remaining": "0"})])
+
+    send(client, "reddit", "GET", "https://www.reddit.com/r/news/new.json")
+    bucket = ratelimit.bucket_for("https://www.reddit.com", "reddit")
+    assert bucket.rate == 0.5
+    send(client, "reddit", "GET", "https://www.reddit.com/r/news/new.json")
+
+    assert bucket.reserve() == pytest.approx(20.0 + 1 / 0.5, abs=0.1)
+
+
+def test_pipeline_does_not_count_throttling_against_source_health(db_session, fake_sources, monkeypatch) -> None:
+    fetch_latest = fake_sources.fetch_latest
+
+    def throttled(source, limit=25):
+        if source.id == "src_b":
+            raise HostRateLimited("www.reddit.com answered 429 after 4 attempt(s)")
+        return fetch_latest(source, limit)
+
+    monkeypatch.setattr(fake_sources, "fetch_latest", throttled)
+
+    result = pipeline.run_ingestion_pipeline(db_session, summarize=False)
+
+    assert result.stats["sources"]["src_b"]["error"].startswith("HostRateLimited")
+    assert db_session.get(SourceHealth, "src_b") is None
+    assert db_session.get(SourceHealth, "src_a").consecutive_failures == 0
+
+
+def test_pipeline_past_its_deadline_still_fetches_each_source_once(db_session, fake_sources, sleeps, monkeypatch) -> None:
+    client, seen = scripted_client([httpx.Response(200) for _ in range(3)])
+    fetch_latest = fake_sources.fetch_latest
+
+    def fetch_through_limiter(source, limit=25):
+        send(client, "rss", "GET", f"https://feeds.example.com/{source.id}.xml")
+        return fetch_latest(source, limit)
+
+    monkeypatch.setattr(fake_sources, "fetch_latest", fetch_through_limiter)
+    monkeypatch.setattr(settings, "ingestion_run_deadline_seconds", -60)
+
+    result = pipeline.run_ingestion_pipeline(db_session, summarize=False)
+
+    assert len(seen) == 3
+    assert result.normalized_count == 10
+    assert all(stats["error"] is None for stats in result.stats["sources"].values())
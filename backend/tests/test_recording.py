@@ -0,0 +1,134 @@
+from __future__ import annotations
+
+import pytest
+
+from app.core.config import settings
+from app.db.models import SourceCursor
+from app.services import pipeline
+from app.services.ingestion import recording, registry
+from app.services.ingestion.models import FetchCursor
+from app.services.ingestion.recording import RecordingConnector, ReplayConnector, ReplayedFetchError, load_recording
+from app.services.ingestion.rss import RSSConnector
+from tests.conftest import FakeConnector, make_items, make_source
+
+
+class FlakyConnector(FakeConnector):
+    def __init__(self, items_by_source: dict[str, list[dict]]) -> None:
+        super().__init__(items_by_source)
+        self.fail_next = False
+
+    def fetch_latest(self, source, limit: int = 25) -> list[dict]:
+        if self.fail_next:
+            self.fail_next = False
+            raise TimeoutError("upstream timed out")
+        return super().fetch_latest(source, limit)
+
+
+def test_recording_captures_items_timing_and_errors(tmp_path) -> None:
+    source = make_source("src_a")
+    live = FlakyConnector({"src_a": make_items("alpha", 3)})
+    recorder = RecordingConnector(live, tmp_path)
+
+    assert len(recorder.fetch_latest(source)) == 3
+    live.fail_next = True
+    with pytest.raises(TimeoutError):
+        recorder.fetch_latest(source)
+
+    first, second = load_recording(tmp_path, source)
+    assert [item["id"] for item in first["items"]] == ["alpha-0", "alpha-1", "alpha-2"]
+    assert first["fetch_ms"] >= 0 and "recorded_at" in first
+    assert second["error"] == "TimeoutError: upstream timed out"
+    assert (tmp_path / "fake" / "src_a.jsonl.gz").exists()
+
+
+def test_replay_loops_reraises_and_multiplies_with_unique_ids(tmp_path) -> None:
+    source = make_source("src_a")
+    live = FlakyConnector({"src_a": make_items("alpha", 2)})
+    recorder = RecordingConnector(live, tmp_path)
+    recorder.fetch_latest(source)
+    live.fail_next = True
+    with pytest.raises(TimeoutError):
+        recorder.fetch_latest(source)
+
+    replay = ReplayConnector(live, tmp_path, multiplier=3)
+    items = replay.fetch_latest(source)
+    with pytest.raises(ReplayedFetchError, match="upstream timed out"):
+        replay.fetch_latest(source)
+    looped = replay.fetch_latest(source)
+
+    assert len(items) == len(looped) == 6
+    normalized = [replay.normalize(source, item) for item in items]
+    assert len({item.external_id for item in normalized}) == 6
+    assert len({item.dedupe_key for item in normalized}) == 6
+    assert {item.title for item in normalized} == {raw["title"] for raw in make_items("alpha", 2)}
+    assert replay.fetch_latest(make_source("unrecorded")) == []
+
+
+def test_replay_spaces_batches_by_recorded_time_over_speed(tmp_path, monkeypatch) -> None:
+    source = make_source("src_a")
+    for second in (0, 10):
+        recording.append_recording(
+            tmp_path, source, {"recorded_at": f"2026-01-01T00:00:{second:02d}+00:00", "fetch_ms": 500.0, "items": []}
+        )
+    sleeps: list[float] = []
+    monkeypatch.setattr(recording.time, "sleep", sleeps.append)
+
+    replay = ReplayConnector(FakeConnector({}), tmp_path, speed=5.0)
+    replay.fetch_latest(source)
+    replay.fetch_latest(source)
+
+    assert sleeps[0] == pytest.approx(0.1)
+    assert sleeps[1] == pytest.approx(2.1, abs=0.05)
+
+
+def test_pipeline_replays_recordings_through_the_registry(db_session, tmp_path, monkeypatch) -> None:
+    db_session.add(make_source("src_a"))
+    db_session.commit()
+    live = FakeConnector({"src_a": make_items("alpha", 4)})
+    monkeypatch.setitem(registry.CONNECTORS, "fake", live)
+    monkeypatch.setattr(registry, "_wrapped", {})
+    monkeypatch.setattr(settings, "connector_recording_dir", str(tmp_path))
+
+    monkeypatch.setattr(settings, "connector_mode", "record")
+    recorded = pipeline.run_ingestion_pipeline(db_session, summarize=False)
+    live.items_by_source.clear()
+    # Replays honour cursors like live fetches; a fresh database would not have the recording run's.
+    db_session.query(SourceCursor).delete()
+    db_session.commit()
+    monkeypatch.setattr(settings, "connector_mode", "replay")
+    monkeypatch.setattr(settings, "connector_replay_multiplier", 5)
+    replayed = pipeline.run_ingestion_pipeline(db_session, summarize=False)
+
+    assert recorded.normalized_count == 4
+    assert replayed.fetched_count == 20
+    # The first copy re-serves the recorded items, which already exist.
+    assert replayed.normalized_count == 16
+
+
+class AnchoredConnector(FakeConnector):
+    cursor_filter = False
+
+    def fetch_new(self, source, limit, cursor) -> list[dict]:
+        items = self.fetch_latest(source, limit)
+        return items[: next((index for index, item in enumerate(items) if cursor.knows(item["id"])), len(items))]
+
+
+def test_recording_and_replay_keep_the_inner_fetch_new_and_cursor_filter(tmp_path) -> None:
+    source = make_source("src_a")
+    recorder = RecordingConnector(AnchoredConnector({"src_a": make_items("alpha", 4)}), tmp_path)
+
+    fetched = recorder.fetch_new(source, 25, FetchCursor(external_id="alpha-2"))
+
+    assert [item["id"] for item in fetched] == ["alpha-0", "alpha-1"]
+    assert [item["id"] for item in load_recording(tmp_path, source)[0]["items"]] == ["alpha-0", "alpha-1"]
+    assert recorder.cursor_filter is False
+    assert ReplayConnector(AnchoredConnector({}), tmp_path).cursor_filter is False
+    assert ReplayConnector(FakeConnector({}), tmp_path).cursor_filter is True
+
+
+def test_recording_and_replay_forward_entry_id(tmp_path) -> None:
+    source = make_source("src_a")
+    entry = {"id": "urn:entry:1", "link": "https://example.com/1"}
+
+    assert RecordingConnector(RSSConnector(), tmp_path).entry_id(source, entry) == "urn:entry:1"
+    assert ReplayConnector(RSSConnector(), tmp_path).entry_id(source, entry) == "urn:entry:1"
@@ -0,0 +1,150 @@
+from __future__ import annotations
+
+import threading
+
+import pytest
+from redis.exceptions import ConnectionError as RedisConnectionError
+
+from app.jobs import reingest
+from app.jobs.reingest import ReingestUnavailable, reingest_key, submit_reingest
+
+
+class FakeRedis:
+    def __init__(self) -> None:
+        self.values: dict[str, str] = {}
+
+    def get(self, key: str) -> str | None:
+        return self.values.get(key)
+
+    def set(self, key: str, value: str, nx: bool = False, ex: int | None = None) -> bool:
+        if nx and key in self.values:
+            return False
+        self.values[key] = value
+        return True
+
+    def eval(self, script: str, numkeys: int, key: str, expected: str) -> int:
+        if self.values.get(key) != expected:
+            return 0
+        del self.values[key]
+        return 1
+
+
+class FakeJob:
+    def __init__(self, job_id: str, status: str, kwargs: dict, callbacks: dict) -> None:
+        self.id = job_id
+        self.status = status
+        self.kwargs = kwargs
+        self.callbacks = callbacks
+
+    def get_status(self, refresh: bool = True) -> str:
+        return self.status
+
+
+class FakeQueue:
+    def __init__(self) -> None:
+        self.jobs: dict[str, FakeJob] = {}
+
+    def fetch_job(self, job_id: str) -> FakeJob | None:
+        return self.jobs.get(job_id)
+
+    def enqueue(self, func, *, source_types, profile, job_id: str, **callbacks) -> FakeJob:
+        self.jobs[job_id] = FakeJob(job_id, "queued", {"source_types": source_types, "profile": profile}, callbacks)
+        return self.jobs[job_id]
+
+
+@pytest.fixture()
+def fake_redis() -> FakeRedis:
+    return FakeRedis()
+
+
+@pytest.fixture()
+def fake_queue(monkeypatch, fake_redis) -> FakeQueue:
+    queue = FakeQueue()
+    monkeypatch.setattr(reingest, "get_redis", lambda: fake_redis)
+    monkeypatch.setattr(reingest, "get_queue", lambda: queue)
+    return queue
+
+
+def test_reingest_key_ignores_source_type_order() -> None:
+    assert reingest_key(["rss", "reddit"]) == reingest_key(["reddit", "rss", "rss"])
+    assert reingest_key(None) == reingest_key([]) != reingest_key(["rss"])
+
+
+def test_reingest_attaches_to_queued_or_running_job(fake_queue) -> None:
+    first = submit_reingest(["rss"])
+    second = submit_reingest(["rss"])
+    other = submit_reingest(["reddit"])
+
+    assert second == {"job_id": first["job_id"], "coalesced": True, "mode": "queue"}
+    assert other["coalesced"] is False
+    assert len(fake_queue.jobs) == 2
+
+    fake_queue.jobs[first["job_id"]].status = "started"
+    assert submit_reingest(["rss"])["job_id"] == first["job_id"]
+
+
+def test_reingest_enqueues_again_once_the_job_finished(fake_queue) -> None:
+    first = submit_reingest(None)
+    fake_queue.jobs[first["job_id"]].status = "finished"
+
+    second = submit_reingest(None)
+
+    assert second["coalesced"] is False
+    assert second["job_id"] != first["job_id"]
+
+
+def test_reingest_falls_back_to_bounded_local_execution(monkeypatch) -> None:
+    def unavailable():
+        raise RedisConnectionError("redis down")
+
+    release = threading.Event()
+    ran: list[list[str] | None] = []
+
+    def slow_run(source_types=None, profile=None):
+        release.wait(timeout=10)
+        ran.append(source_types)
+
+    monkeypatch.setattr(reingest, "get_redis", unavailable)
+    monkeypatch.setattr(reingest, "run_ingestion_job", slow_run)
+    monkeypatch.setattr(reingest.settings, "reingest_fallback_max_pending", 2)
+    monkeypatch.setattr(reingest, "_fallback_jobs", {})
+
+    first = submit_reingest(["rss"])
+    assert first["mode"] == "local"
+    assert submit_reingest(["rss"]) == {"job_id": first["job_id"], "coalesced": True, "mode": "local"}
+    submit_reingest(["reddit"])
+    with pytest.raises(ReingestUnavailable):
+        submit_reingest(None)
+
+    release.set()
+    for _, future in list(reingest._fallback_jobs.values()):
+        future.result(timeout=10)
+    assert ran == [["rss"], ["reddit"]]
+    assert submit_reingest(None)["coalesced"] is False
+
+
+def test_reingest_key_is_released_when_the_job_ends(fake_queue, fake_redis) -> None:
+    first = submit_reingest(["rss"])
+    job = fake_queue.jobs[first["job_id"]]
+    assert set(job.callbacks) == {"on_success", "on_failure", "on_stopped"}
+
+    job.status = "finished"
+    job.callbacks["on_success"].func(job, fake_redis, None)
+
+    assert fake_redis.values == {}
+    second = submit_reingest(["rss"])
+    # A late callback from the first job leaves the new claim alone.
+    job.callbacks["on_failure"].func(job, fake_redis, RuntimeError, RuntimeError("boom"), None)
+    assert fake_redis.values == {reingest_key(["rss"]): second["job_id"]}
+
+
+def test_reingest_only_falls_back_when_redis_is_unreachable(fake_queue, monkeypatch) -> None:
+    def broken_enqueue(*args, **kwargs):
+        raise TypeError("cannot pickle job arguments")
+
+    monkeypatch.setattr(fake_queue, "enqueue", broken_enqueue)
+    monkeypatch.setattr(reingest, "_fallback_jobs", {})
+
+    with pytest.raises(TypeError):
+        submit_reingest(["rss"])
+    assert reingest._fallback_jobs == {}
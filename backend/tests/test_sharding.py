@@ -0,0 +1,57 @@
+import pytest
+
+from app.db.models import IngestionRun
+from app.services.sharding import execution_shards, load_fetch_costs, shard_sources
+from tests.conftest import make_source
+
+
+def test_shard_sources_covers_every_source_exactly_once() -> None:
+    source_ids = [f"src_{index}" for index in range(23)]
+
+    shards = shard_sources(source_ids, task_count=4)
+
+    assigned = [source_id for shard in shards for source_id in shard.source_ids]
+    assert sorted(assigned) == sorted(source_ids)
+    assert [shard.task_index for shard in shards] == [0, 1, 2, 3]
+    assert max(len(shard.source_ids) for shard in shards) - min(len(shard.source_ids) for shard in shards) <= 1
+
+
+def test_shard_sources_is_stable_across_calls_and_input_order() -> None:
+    source_ids = [f"src_{index}" for index in range(10)]
+
+    first = shard_sources(source_ids, task_count=3)
+    second = shard_sources(list(reversed(source_ids)), task_count=3)
+
+    assert [shard.source_ids for shard in first] == [shard.source_ids for shard in second]
+
+
+def test_shard_sources_balances_by_historical_fetch_cost() -> None:
+    costs = {"slow": 9000.0, "a": 1000.0, "b": 1000.0, "c": 1000.0, "d": 1000.0, "e": 1000.0}
+
+    shards = shard_sources(list(costs), task_count=2, costs=costs)
+
+    slow_shard = next(shard for shard in shards if "slow" in shard.source_ids)
+    assert slow_shard.source_ids == ["slow"]
+    assert sorted(shard.estimated_cost_ms for shard in shards) == [5000.0, 9000.0]
+
+
+def test_tasks_of_one_execution_share_a_partition_when_costs_change(db_session) -> None:
+    source_ids = [f"src_{index}" for index in range(8)]
+    db_session.add_all([make_source(source_id) for source_id in source_ids])
+    db_session.add(IngestionRun(status="completed", stats_json={"source_fetch_ms": {source_id: 1000.0 for source_id in source_ids}}))
+    db_session.commit()
+
+    first_task = execution_shards(db_session, "ingest-exec-1", source_ids, task_count=3)
+    # A run completes between the two tasks starting: src_0 is now by far the slowest source.
+    db_session.add(IngestionRun(status="completed", stats_json={"source_fetch_ms": {"src_0": 60000.0}}))
+    db_session.commit()
+    later_task = execution_shards(db_session, "ingest-exec-1", source_ids, task_count=3)
+
+    assert [shard.source_ids for shard in later_task] == [shard.source_ids for shard in first_task]
+    assert [shard.source_ids for shard in shard_sources(source_ids, 3, load_fetch_costs(db_session))] != [
+        shard.source_ids for shard in first_task
+    ]
+    assigned = [source_id for shard in later_task for source_id in shard.source_ids]
+    assert sorted(assigned) == source_ids
+    with pytest.raises(ValueError):
+        execution_shards(db_session, "ingest-exec-1", source_ids, task_count=2)
@@ -0,0 +1,122 @@
+from __future__ import annotations
+
+from datetime import datetime, timedelta, timezone
+
+from app.core.config import settings
+from app.db.models import StoryCluster
+from app.jobs import cluster_index
+from app.services.clustering import service, shared_index
+from app.services.clustering.engines import JaccardEngine
+from app.services.clustering.shared_index import SharedClusterIndex, build_shared_index
+
+
+def add_cluster(db, cluster_id: str, headline: str, hours_ago: float) -> StoryCluster:
+    updated = datetime.now(timezone.utc) - timedelta(hours=hours_ago)
+    cluster = StoryCluster(id=cluster_id, slug=cluster_id, headline=headline, first_seen_at=updated, last_updated_at=updated)
+    db.add(cluster)
+    db.flush()
+    return cluster
+
+
+def test_shared_index_round_trips_active_window(db_session, tmp_path) -> None:
+    add_cluster(db_session, "story_new", "Newest headline ünïcode", 1)
+    add_cluster(db_session, "story_old", "Older headline", 5)
+    add_cluster(db_session, "story_stale", "Outside the window", 200)
+    path = tmp_path / "clusters.idx"
+
+    assert build_shared_index(db_session, path, window_hours=72) == 2
+
+    index = SharedClusterIndex(path)
+    assert index.is_fresh(max_age_seconds=60)
+    candidates = index.candidates(datetime.now(timezone.utc) - timedelta(hours=3))
+    assert [candidate.cluster_id for candidate in candidates] == ["story_new"]
+    assert candidates[0].headline == "Newest headline ünïcode"
+    assert candidates[0].last_updated_at.tzinfo is not None
+
+
+def test_shared_index_remaps_after_owner_rebuild(db_session, tmp_path) -> None:
+    path = tmp_path / "clusters.idx"
+    add_cluster(db_session, "story_a", "First", 1)
+    build_shared_index(db_session, path, window_hours=72)
+    index = SharedClusterIndex(path)
+    assert len(index.candidates(datetime.now(timezone.utc) - timedelta(hours=72))) == 1
+
+    add_cluster(db_session, "story_b", "Second", 0.5)
+    build_shared_index(db_session, path, window_hours=72)
+
+    assert [row.cluster_id for row in index.candidates(datetime.now(timezone.utc) - timedelta(hours=72))] == [
+        "story_b",
+        "story_a",
+    ]
+
+
+def test_load_candidates_uses_index_plus_recent_changes(db_session, tmp_path, monkeypatch) -> None:
+    path = tmp_path / "clusters.idx"
+    add_cluster(db_session, "story_indexed", "Indexed story", 2)
+    build_shared_index(db_session, path, window_hours=72)
+    monkeypatch.setattr(settings, "cluster_index_path", str(path))
+    monkeypatch.setattr(service, "_shared_index", None)
+
+    queries: list[str] = []
+    original = service._query_candidates
+
+    def tracking_query(db, engine, *criteria, limit=None):
+        queries.append(" AND ".join(str(criterion) for criterion in criteria))
+        return original(db, engine, *criteria, limit=limit)
+
+    monkeypatch.setattr(service, "_query_candidates", tracking_query)
+    candidates = service.load_candidate_clusters(db_session, JaccardEngine())
+
+    assert [candidate.cluster_id for candidate in candidates] == ["story_indexed"]
+    assert len(queries) == 1 and "updated_at" in queries[0]
+
+
+def test_load_candidates_includes_clusters_from_transactions_open_during_the_build(db_session, tmp_path, monkeypatch) -> None:
+    path = tmp_path / "clusters.idx"
+    oldest_open = datetime.now(timezone.utc) - timedelta(minutes=10)
+    # A chunk transaction started ten minutes before the build and commits after it.
+    monkeypatch.setattr(shared_index, "_change_horizon", lambda db, built_at: oldest_open)
+    build_shared_index(db_session, path, window_hours=72)
+    late = add_cluster(db_session, "story_late", "Committed after the build", 0.1)
+    late.updated_at = oldest_open + timedelta(minutes=1)
+    db_session.flush()
+    monkeypatch.setattr(settings, "cluster_index_path", str(path))
+    monkeypatch.setattr(service, "_shared_index", None)
+
+    candidates = service.load_candidate_clusters(db_session, JaccardEngine())
+
+    assert service.get_shared_index().changed_since == oldest_open
+    assert [candidate.cluster_id for candidate in candidates] == ["story_late"]
+
+
+def test_load_candidates_reads_only_the_newest_limit_from_the_index(db_session, tmp_path, monkeypatch) -> None:
+    path = tmp_path / "clusters.idx"
+    for index in range(5):
+        add_cluster(db_session, f"story_{index}", f"Story {index}", index + 1)
+    build_shared_index(db_session, path, window_hours=72)
+    monkeypatch.setattr(settings, "cluster_index_path", str(path))
+    monkeypatch.setattr(service, "_shared_index", None)
+
+    limits: list[int | None] = []
+    original = SharedClusterIndex.candidates
+
+    def tracking_candidates(self, cutoff, limit=None):
+        limits.append(limit)
+        return original(self, cutoff, limit)
+
+    monkeypatch.setattr(SharedClusterIndex, "candidates", tracking_candidates)
+    candidates = service.load_candidate_clusters(db_session, JaccardEngine(), limit=2)
+
+    assert limits == [2]
+    assert [candidate.cluster_id for candidate in candidates] == ["story_0", "story_1"]
+
+
+def test_failed_owner_refresh_is_logged(monkeypatch, caplog) -> None:
+    def broken_build():
+        raise OSError("disk full")
+
+    monkeypatch.setattr(settings, "cluster_index_owner", True)
+    monkeypatch.setattr(cluster_index, "run_cluster_index_job", broken_build)
+
+    assert cluster_index.refresh_cluster_index_if_owner() == {"built": False, "reason": "refresh failed"}
+    assert "cluster index refresh failed" in caplog.text
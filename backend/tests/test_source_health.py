@@ -0,0 +1,92 @@
+from __future__ import annotations
+
+from datetime import datetime, timedelta, timezone
+
+from fastapi.testclient import TestClient
+
+from app.core.config import settings
+from app.db.models import SourceHealth
+from app.db.session import get_db
+from app.main import app
+from app.services import pipeline
+from app.services.sharding import load_fetch_costs
+from app.services.source_health import HALF_OPEN, OPEN, begin_fetch, record_fetch
+
+
+def test_breaker_opens_after_threshold_and_backs_off_failed_probes(db_session, monkeypatch) -> None:
+    monkeypatch.setattr(settings, "source_breaker_failure_threshold", 2)
+    monkeypatch.setattr(settings, "source_breaker_cooldown_seconds", 60)
+    monkeypatch.setattr(settings, "source_latency_ewma_alpha", 0.5)
+    now = datetime(2026, 10, 19, 12, 0, tzinfo=timezone.utc)
+
+    record_fetch(db_session, "src", 100.0, None, now)
+    record_fetch(db_session, "src", 15000.0, "TimeoutError: timed out", now)
+    health = db_session.get(SourceHealth, "src")
+    assert health.state != OPEN and begin_fetch(db_session, "src", now)
+    record_fetch(db_session, "src", 15000.0, "TimeoutError: timed out", now)
+
+    assert health.state == OPEN
+    assert health.retry_at == now + timedelta(seconds=60)
+    assert health.latency_ewma_ms == 11275.0
+    assert not begin_fetch(db_session, "src", now + timedelta(seconds=59))
+
+    probe_at = now + timedelta(seconds=60)
+    assert begin_fetch(db_session, "src", probe_at) and health.state == HALF_OPEN
+    record_fetch(db_session, "src", 15000.0, "TimeoutError: timed out", probe_at)
+    assert health.retry_at == probe_at + timedelta(seconds=120)
+
+    record_fetch(db_session, "src", 80.0, None, probe_at + timedelta(seconds=120))
+    assert (health.state, health.consecutive_failures, health.retry_at) == ("closed", 0, None)
+
+
+def test_pipeline_skips_sources_with_open_circuits(db_session, fake_sources, monkeypatch) -> None:
+    monkeypatch.setattr(settings, "source_breaker_failure_threshold", 1)
+    calls: list[str] = []
+    fetch_latest = fake_sources.fetch_latest
+
+    def src_c_down(source, limit=25):
+        calls.append(source.id)
+        if source.id == "src_c":
+            raise TimeoutError("feed timed out")
+        return fetch_latest(source, limit)
+
+    monkeypatch.setattr(fake_sources, "fetch_latest", src_c_down)
+
+    pipeline.run_ingestion_pipeline(db_session, summarize=False)
+    second = pipeline.run_ingestion_pipeline(db_session, summarize=False)
+
+    assert calls.count("src_c") == 1
+    assert second.stats["sources"]["src_c"]["error"].startswith("CircuitOpen")
+    assert db_session.get(SourceHealth, "src_c").state == OPEN
+    assert db_session.get(SourceHealth, "src_a").latency_ewma_ms is not None
+    assert load_fetch_costs(db_session)["src_c"] == 0.0
+
+    app.dependency_overrides[get_db] = lambda: db_session
+    try:
+        client = TestClient(app)
+        unauthorized = client.get("/v1/admin/sources/health")
+        response = client.get("/v1/admin/sources/health", headers={"Authorization": f"Bearer {settings.api_admin_token}"})
+    finally:
+        app.dependency_overrides.clear()
+
+    assert unauthorized.status_code == 401
+    items = response.json()["items"]
+    assert [item["source_id"] for item in items] == ["src_c", "src_a", "src_b"]
+    assert items[0]["state"] == "open"
+    assert items[0]["last_error"] == "TimeoutError: feed timed out"
+
+
+def test_pipeline_keeps_health_of_existing_rows_across_chunk_checkpoints(db_session, fake_sources, monkeypatch) -> None:
+    monkeypatch.setattr(settings, "source_breaker_failure_threshold", 3)
+
+    def all_down(source, limit=25):
+        raise TimeoutError("feed timed out")
+
+    monkeypatch.setattr(fake_sources, "fetch_latest", all_down)
+    # Failed sources have nothing to cluster, so every source is followed by a checkpoint.
+    for _ in range(3):
+        pipeline.run_ingestion_pipeline(db_session, summarize=False)
+
+    db_session.expire_all()
+    health = {row.source_id: (row.consecutive_failures, row.state) for row in db_session.query(SourceHealth)}
+    assert health == {"src_a": (3, OPEN), "src_b": (3, OPEN), "src_c": (3, OPEN)}
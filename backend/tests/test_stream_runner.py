@@ -0,0 +1,193 @@
+from __future__ import annotations
+
+import asyncio
+import json
+import threading
+from datetime import datetime, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from app.core.config import settings
+from app.db.models import ClusterItem, Source, SourceCursor, SourceItem
+from app.services import stream_runner
+from app.services.ingestion.twitter import TwitterStreamConnector
+from app.services.stream_runner import StreamRunner
+
+
+def tweet(tweet_id: str, text: str) -> bytes:
+    message = {
+        "data": {"id": tweet_id, "text": text, "author_id": "u1", "created_at": datetime.now(timezone.utc).isoformat()},
+        "includes": {"users": [{"id": "u1", "username": "wiredesk"}]},
+    }
+    return json.dumps(message).encode() + b"\r\n"
+
+
+class ChunkedStreamServer(ThreadingHTTPServer):
+    """Stand-in for a chunked NDJSON stream: each connection serves the next script, then closes."""
+
+    daemon_threads = True
+
+    def __init__(self, scripts: list[list[bytes]]) -> None:
+        self.scripts = scripts
+        self.resume_headers: list[str | None] = []
+        super().__init__(("127.0.0.1", 0), ChunkedStreamHandler)
+
+    @property
+    def url(self) -> str:
+        return f"http://127.0.0.1:{self.server_address[1]}/2/tweets/search/stream"
+
+
+class ChunkedStreamHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, format, *args) -> None:
+        pass
+
+    def do_GET(self) -> None:
+        self.server.resume_headers.append(self.headers.get("Last-Event-ID"))
+        lines = self.server.scripts.pop(0) if self.server.scripts else []
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Transfer-Encoding", "chunked")
+        self.end_headers()
+        for line in lines:
+            self.wfile.write(f"{len(line):x}\r\n".encode() + line + b"\r\n")
+            self.wfile.flush()
+        self.wfile.write(b"0\r\n\r\n")
+
+
+@pytest.fixture()
+def stream_server():
+    server = ChunkedStreamServer([])
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        yield server
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+def test_stream_runner_ingests_micro_batches_and_resumes_after_reconnect(file_session_factory, stream_server, monkeypatch) -> None:
+    monkeypatch.setattr(settings, "connector_backoff_base_seconds", 0.01)
+    monkeypatch.setattr(settings, "stream_batch_max_wait_ms", 50.0)
+    stream_server.scripts = [
+        [tweet("101", "Harbour bridge closed after ship strike"), b"\r\n", tweet("102", "Central bank holds rates steady")],
+        [json.dumps({"errors": [{"title": "operational-disconnect"}]}).encode() + b"\r\n", tweet("103", "Wildfire forces evacuations")],
+    ]
+    source = Source(
+        id="tw_desk",
+        source_type="twitter",
+        name="Wire desk",
+        external_ref="wiredesk",
+        url="https://twitter.com/wiredesk",
+        enabled=True,
+        polling_interval_seconds=300,
+        category_hints=[],
+        auth_config={"stream_url": stream_server.url, "bearer_token": "test"},
+    )
+    with file_session_factory() as db:
+        db.add(source)
+        db.commit()
+
+    published: list[list[str]] = []
+    runner = StreamRunner(file_session_factory, publish=published.append)
+
+    async def run_until_three_created() -> None:
+        stop = asyncio.Event()
+
+        async def watch() -> None:
+            while runner.stats.created < 3:
+                await asyncio.sleep(0.02)
+            stop.set()
+
+        watcher = asyncio.create_task(watch())
+        await asyncio.wait_for(runner.run([(source, TwitterStreamConnector())], stop), timeout=10)
+        await watcher
+
+    asyncio.run(run_until_three_created())
+
+    assert stream_server.resume_headers[:2] == [None, "102"]
+    assert runner.stats.reconnects >= 1
+    assert published and all(published)
+    with file_session_factory() as db:
+        items = db.query(SourceItem).order_by(SourceItem.external_id).all()
+        assert [item.external_id for item in items] == ["101", "102", "103"]
+        assert items[0].canonical_url == "https://twitter.com/wiredesk/status/101"
+        assert db.query(ClusterItem).count() == 3
+        assert db.get(SourceCursor, "tw_desk").resume_token == "103"
+
+
+def test_stream_runner_retries_a_failed_batch_before_committing_its_token(file_session_factory, stream_server, monkeypatch) -> None:
+    monkeypatch.setattr(settings, "connector_backoff_base_seconds", 0.01)
+    monkeypatch.setattr(settings, "stream_batch_max_wait_ms", 50.0)
+    stream_server.scripts = [[tweet("201", "Harbour bridge closed after ship strike")]]
+    source = Source(
+        id="tw_desk",
+        source_type="twitter",
+        name="Wire desk",
+        external_ref="wiredesk",
+        url="https://twitter.com/wiredesk",
+        enabled=True,
+        polling_interval_seconds=300,
+        category_hints=[],
+        auth_config={"stream_url": stream_server.url, "bearer_token": "test"},
+    )
+    with file_session_factory() as db:
+        db.add(source)
+        db.commit()
+
+    runner = StreamRunner(file_session_factory, publish=lambda cluster_ids: None)
+    save_tokens = runner._save_tokens
+    tokens_on_retry: list[str | None] = []
+
+    def save_then_fail(db, tokens):
+        with file_session_factory() as other:
+            committed = other.get(SourceCursor, "tw_desk")
+            tokens_on_retry.append(committed.resume_token if committed else None)
+        save_tokens(db, tokens)
+        if len(tokens_on_retry) == 1:
+            raise RuntimeError("deadlock detected")
+
+    monkeypatch.setattr(runner, "_save_tokens", save_then_fail)
+
+    async def run_until_created() -> None:
+        stop = asyncio.Event()
+
+        async def watch() -> None:
+            while runner.stats.created < 1:
+                await asyncio.sleep(0.02)
+            stop.set()
+
+        watcher = asyncio.create_task(watch())
+        await asyncio.wait_for(runner.run([(source, TwitterStreamConnector())], stop), timeout=10)
+        await watcher
+
+    asyncio.run(run_until_created())
+
+    # The first attempt's token was rolled back with its items.
+    assert tokens_on_retry == [None, None]
+    assert runner.stats.failed_batches == 1
+    assert runner.stats.received == 1
+    with file_session_factory() as db:
+        assert db.query(SourceItem).count() == 1
+        assert db.get(SourceCursor, "tw_desk").resume_token == "201"
+
+
+def test_stream_runner_rebuilds_the_duplicate_index_by_age(file_session_factory, monkeypatch) -> None:
+    monkeypatch.setattr(settings, "dedupe_enabled", True)
+    loads: list[datetime] = []
+    monkeypatch.setattr(stream_runner.DuplicateIndex, "load", classmethod(lambda cls, db, cutoff, radius: loads.append(cutoff) or cls(radius)))
+    runner = StreamRunner(file_session_factory)
+
+    with file_session_factory() as db:
+        runner._refresh_duplicates(db)
+        runner._refresh_duplicates(db)
+        assert len(loads) == 1
+
+        runner._duplicates_loaded_at -= settings.stream_dedupe_refresh_seconds
+        runner._refresh_duplicates(db)
+
+    assert len(loads) == 2
+    assert loads[1] >= loads[0]
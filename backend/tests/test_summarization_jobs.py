@@ -0,0 +1,97 @@
+from __future__ import annotations
+
+import pytest
+from redis.exceptions import ConnectionError as RedisConnectionError
+
+from app.jobs import summarization
+from app.jobs.summarization import publish_dirty_clusters, summarization_followup_job_id, summarization_job_id
+
+
+class DummyJob:
+    def __init__(self, status: str) -> None:
+        self.status = status
+
+    def get_status(self, refresh: bool = True) -> str:
+        return self.status
+
+
+class DummyQueue:
+    def __init__(self, jobs: dict[str, DummyJob] | None = None) -> None:
+        self.jobs = jobs or {}
+        self.enqueued: list[str] = []
+        self.dependencies: dict[str, object] = {}
+
+    def fetch_job(self, job_id: str) -> DummyJob | None:
+        return self.jobs.get(job_id)
+
+    def enqueue(self, func, *args, job_id: str, depends_on=None, **kwargs) -> DummyJob:
+        self.enqueued.append(job_id)
+        self.dependencies[job_id] = depends_on
+        self.jobs[job_id] = DummyJob("queued")
+        return self.jobs[job_id]
+
+
+def test_publish_dirty_clusters_coalesces_pending_jobs(monkeypatch) -> None:
+    queue = DummyQueue(
+        {
+            summarization_job_id("story_a"): DummyJob("queued"),
+            summarization_job_id("story_b"): DummyJob("finished"),
+        }
+    )
+    monkeypatch.setattr(summarization, "get_queue", lambda name: queue)
+
+    outcome = publish_dirty_clusters(["story_a", "story_b", "story_c"])
+
+    assert outcome == {"queued": 2, "coalesced": 1, "inline": 0}
+    assert queue.enqueued == [summarization_job_id("story_b"), summarization_job_id("story_c")]
+
+
+def test_publish_dirty_clusters_queues_behind_a_running_job(monkeypatch) -> None:
+    running = DummyJob("started")
+    queue = DummyQueue({summarization_job_id("story_a"): running})
+    monkeypatch.setattr(summarization, "get_queue", lambda name: queue)
+
+    first = publish_dirty_clusters(["story_a"])
+    second = publish_dirty_clusters(["story_a"])
+
+    assert first == {"queued": 1, "coalesced": 0, "inline": 0}
+    assert second == {"queued": 0, "coalesced": 1, "inline": 0}
+    assert queue.enqueued == [summarization_followup_job_id("story_a")]
+    assert queue.jobs[summarization_job_id("story_a")] is running
+    assert queue.dependencies[summarization_followup_job_id("story_a")].dependencies == [summarization_job_id("story_a")]
+
+    # Once the follow-up is itself running, the next change goes back to the first id.
+    running.status = "finished"
+    queue.jobs[summarization_followup_job_id("story_a")].status = "started"
+    publish_dirty_clusters(["story_a"])
+
+    assert queue.enqueued[-1] == summarization_job_id("story_a")
+    assert queue.dependencies[summarization_job_id("story_a")].dependencies == [summarization_followup_job_id("story_a")]
+
+
+def test_publish_dirty_clusters_falls_back_to_inline_when_queue_is_down(monkeypatch) -> None:
+    def unavailable_queue(name: str):
+        raise RedisConnectionError("redis down")
+
+    summarized: list[str] = []
+    monkeypatch.setattr(summarization, "get_queue", unavailable_queue)
+    monkeypatch.setattr(summarization, "run_summarization_job", lambda cluster_id: summarized.append(cluster_id))
+
+    outcome = publish_dirty_clusters(["story_a", "story_b"])
+
+    assert outcome == {"queued": 0, "coalesced": 0, "inline": 2}
+    assert summarized == ["story_a", "story_b"]
+
+
+def test_publish_dirty_clusters_does_not_hide_enqueue_bugs(monkeypatch) -> None:
+    class BrokenQueue(DummyQueue):
+        def enqueue(self, func, *args, job_id: str, **kwargs) -> DummyJob:
+            raise TypeError("cannot pickle")
+
+    summarized: list[str] = []
+    monkeypatch.setattr(summarization, "get_queue", lambda name: BrokenQueue())
+    monkeypatch.setattr(summarization, "run_summarization_job", lambda cluster_id: summarized.append(cluster_id))
+
+    with pytest.raises(TypeError):
+        publish_dirty_clusters(["story_a"])
+    assert summarized == []
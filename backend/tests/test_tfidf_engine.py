@@ -0,0 +1,118 @@
+from datetime import datetime, timedelta, timezone
+
+import numpy as np
+import pytest
+
+from app.core.config import settings
+from app.services.clustering.engines import ClusterCandidate, JaccardEngine
+from app.services.clustering.service import get_cluster_engine
+from app.services.clustering.tfidf import TfidfEngine, hashed_term_counts
+
+
+def make_candidates(now: datetime) -> list[ClusterCandidate]:
+    return [
+        ClusterCandidate(
+            cluster_id="story_outage",
+            headline="Cloud provider outage knocks storage offline across regions",
+            last_updated_at=now - timedelta(hours=1),
+            member_texts=["Storage outage hits cloud customers in several regions"],
+        ),
+        ClusterCandidate(
+            cluster_id="story_transfer",
+            headline="Striker completes record transfer to league champions",
+            last_updated_at=now - timedelta(hours=1),
+            member_texts=["Champions sign striker in record deal"],
+        ),
+    ]
+
+
+def test_tfidf_engine_ranks_paraphrased_headline_with_its_story() -> None:
+    now = datetime.now(timezone.utc)
+    engine = TfidfEngine(n_features=1024)
+
+    scores = engine.score("Regions report storage outage at major cloud provider", now, make_candidates(now))
+
+    assert scores[0] > scores[1]
+    assert scores[0] >= settings.cluster_similarity_threshold
+
+
+def test_tfidf_engine_applies_recency_weight() -> None:
+    now = datetime.now(timezone.utc)
+    candidates = make_candidates(now)
+    stale = ClusterCandidate(
+        cluster_id="story_old",
+        headline=candidates[0].headline,
+        last_updated_at=now - timedelta(days=10),
+        member_texts=list(candidates[0].member_texts),
+    )
+
+    fresh_score, stale_score = TfidfEngine(n_features=1024).score(candidates[0].headline, now, [candidates[0], stale])
+
+    assert fresh_score > stale_score
+
+
+def test_cluster_engine_is_selected_per_deployment(monkeypatch) -> None:
+    monkeypatch.setattr(settings, "cluster_engine", "tfidf")
+    assert isinstance(get_cluster_engine(), TfidfEngine)
+
+    monkeypatch.setattr(settings, "cluster_engine", "jaccard")
+    assert isinstance(get_cluster_engine(), JaccardEngine)
+
+
+def reference_centroids(candidates: list[ClusterCandidate], n_features: int) -> np.ndarray:
+    texts = [[candidate.headline, *candidate.member_texts] for candidate in candidates]
+    counts = hashed_term_counts([text for group in texts for text in group], n_features)
+    idf = np.log((1.0 + len(counts)) / (1.0 + np.count_nonzero(counts, axis=0))) + 1.0
+    weighted = np.log1p(counts) * idf
+    weighted /= np.linalg.norm(weighted, axis=1, keepdims=True)
+    owners = np.repeat(np.arange(len(texts)), [len(group) for group in texts])
+    centroids = np.zeros((len(texts), n_features))
+    np.add.at(centroids, owners, weighted)
+    return centroids / np.linalg.norm(centroids, axis=1, keepdims=True)
+
+
+def test_tfidf_engine_reuses_centroids_of_unchanged_clusters(monkeypatch) -> None:
+    now = datetime.now(timezone.utc)
+    candidates = [
+        ClusterCandidate(
+            cluster_id=f"story_{index}", headline=f"Headline {index} about topic{index}", last_updated_at=now, member_texts=[f"Report {index}"]
+        )
+        for index in range(40)
+    ]
+    engine = TfidfEngine(n_features=1024)
+    first, _ = engine.centroids(candidates)
+    assert np.allclose(first, reference_centroids(candidates, 1024), atol=1e-5)
+
+    tokenized: list[str] = []
+    terms = engine._terms
+    monkeypatch.setattr(engine, "_terms", lambda text: tokenized.append(text) or terms(text))
+    candidates[3].member_texts.append("Follow-up on topic3")
+    second, _ = engine.centroids(candidates)
+
+    assert sorted(tokenized) == ["Follow-up on topic3", "Headline 3 about topic3", "Report 3"]
+    changed = [row for row in range(len(candidates)) if not np.array_equal(first[row], second[row])]
+    assert changed == [3]
+
+    # Replacing most of the set drifts the document frequencies far enough to refresh the IDF.
+    for candidate in candidates[:10]:
+        candidate.member_texts.append("Late update")
+    third, _ = engine.centroids(candidates)
+    assert np.allclose(third, reference_centroids(candidates, 1024), atol=1e-5)
+
+
+def test_tfidf_engine_scores_batch_peers_outside_the_cluster_cache() -> None:
+    now = datetime.now(timezone.utc)
+    engine = TfidfEngine(n_features=1024)
+    engine.centroids([ClusterCandidate(cluster_id="story_a", headline="Central bank holds interest rates", last_updated_at=now)])
+    entries, documents = dict(engine._entries), engine._documents
+    frequencies = engine._document_frequency.copy()
+
+    scores = engine.score_peers(
+        ["Wildfire forces evacuations near the coast", "Coastal wildfire forces new evacuations", "Parliament passes budget"],
+        [now, now, now],
+    )
+
+    assert engine._entries == entries and engine._documents == documents
+    assert np.array_equal(engine._document_frequency, frequencies)
+    assert scores[0][1] > scores[0][2]
+    assert scores[0][0] == pytest.approx(1.0, abs=1e-4)
@@ -0,0 +1,173 @@
+from __future__ import annotations
+
+import hashlib
+import hmac
+import secrets
+from datetime import datetime, timezone
+from urllib.parse import parse_qsl
+
+import httpx
+import pytest
+from fastapi.testclient import TestClient
+from redis.exceptions import ConnectionError as RedisConnectionError
+
+from app.core.config import settings
+from app.db.models import SourceItem, WebSubSubscription
+from app.db.session import get_db
+from app.jobs import push
+from app.main import app
+from app.services import pipeline, websub
+from tests.conftest import FakeConnector, make_source
+
+TOPIC = "https://www.youtube.com/xml/feeds/videos.xml?channel_id=UCdesk"
+ADMIN = {"Authorization": f"Bearer {settings.api_admin_token}"}
+
+
+def atom(*videos: tuple[str, str]) -> bytes:
+    published = datetime.now(timezone.utc).isoformat()
+    entries = "".join(
+        f"<entry><id>yt:video:{video_id}</id><yt:videoId>{video_id}</yt:videoId><title>{title}</title>"
+        f'<link rel="alternate" href="https://www.youtube.com/watch?v={video_id}"/>'
+        f"<author><name>Desk</name></author><published>{published}</published></entry>"
+        for video_id, title in videos
+    )
+    return (
+        '<feed xmlns="http://www.w3.org/2005/Atom" xmlns:yt="http://www.youtube.com/xml/schemas/2015">'
+        f'<link rel="hub" href="https://hub.example.com/"/><link rel="self" href="{TOPIC}"/>{entries}</feed>'
+    ).encode()
+
+
+class LocalHub:
+    """Stand-in WebSub hub: takes subscription requests, verifies intent later, and publishes signed content."""
+
+    def __init__(self, subscriber: TestClient) -> None:
+        self.subscriber = subscriber
+        self.pending: list[dict[str, str]] = []
+        self.subscriptions: dict[str, dict[str, str]] = {}
+
+    def handle(self, request: httpx.Request) -> httpx.Response:
+        self.pending.append(dict(parse_qsl(request.content.decode())))
+        return httpx.Response(202)
+
+    def verify_pending(self) -> list[int]:
+        statuses = []
+        for form in self.pending:
+            challenge = secrets.token_hex(8)
+            params = {"hub.mode": form["hub.mode"], "hub.topic": form["hub.topic"], "hub.challenge": challenge, "hub.lease_seconds": "600"}
+            response = self.subscriber.get(form["hub.callback"], params=params)
+            statuses.append(response.status_code)
+            if response.status_code == 200 and response.text == challenge:
+                self.subscriptions[form["hub.topic"]] = form
+        self.pending.clear()
+        return statuses
+
+    def publish(self, topic: str, body: bytes, secret: str | None = None) -> httpx.Response:
+        form = self.subscriptions[topic]
+        digest = hmac.new((secret or form["hub.secret"]).encode(), body, hashlib.sha256).hexdigest()
+        headers = {"Content-Type": "application/atom+xml", "X-Hub-Signature-256": f"sha256={digest}"}
+        return self.subscriber.post(form["hub.callback"], content=body, headers=headers)
+
+
+@pytest.fixture()
+def hub(db_session, monkeypatch):
+    monkeypatch.setattr(settings, "websub_enabled", True)
+    monkeypatch.setattr(settings, "websub_callback_base_url", "http://testserver")
+    monkeypatch.setattr(settings, "summarization_mode", "queue")
+
+    def queue_down():
+        raise RedisConnectionError("redis down")
+
+    monkeypatch.setattr(push, "get_queue", queue_down)
+    monkeypatch.setattr(push, "publish_dirty_clusters", lambda cluster_ids: {"queued": len(cluster_ids)})
+    app.dependency_overrides[get_db] = lambda: db_session
+    hub = LocalHub(TestClient(app))
+    monkeypatch.setattr(websub, "_hub_client", lambda: httpx.Client(transport=httpx.MockTransport(hub.handle)))
+    try:
+        yield hub
+    finally:
+        app.dependency_overrides.clear()
+
+
+def test_websub_subscribe_verify_and_ingest_only_changed_entries(db_session, hub, monkeypatch) -> None:
+    channel = make_source("yt_desk")
+    channel.source_type, channel.external_ref = "youtube", TOPIC
+    db_session.add_all([channel, make_source("src_a")])
+    db_session.commit()
+
+    subscribed = hub.subscriber.post("/v1/admin/websub/yt_desk/subscribe", headers=ADMIN)
+    assert subscribed.json()["state"] == "pending"
+    assert hub.pending[0]["hub.callback"] == "http://testserver/v1/websub/yt_desk"
+    assert hub.subscriber.get("/v1/websub/yt_desk", params={"hub.mode": "subscribe", "hub.topic": "https://other.example.com"}).status_code == 404
+    assert hub.verify_pending() == [200]
+    assert db_session.get(WebSubSubscription, "yt_desk").state == "verified"
+
+    assert hub.publish(TOPIC, atom(("vid1", "Bridge reopens after repairs"), ("vid2", "Storm warning issued"))).status_code == 202
+    assert hub.publish(TOPIC, atom(("vid3", "Forged upload")), secret="wrong").status_code == 202
+    hub.publish(TOPIC, atom(("vid1", "Bridge reopens after repairs"), ("vid2", "Storm warning issued for the coast")))
+
+    items = {item.external_id: item.title for item in db_session.query(SourceItem).all()}
+    assert items == {"vid1": "Bridge reopens after repairs", "vid2": "Storm warning issued for the coast"}
+
+    # The pushed source is off the polling schedule while its lease is live.
+    fetched: list[str] = []
+    poller = FakeConnector({})
+    monkeypatch.setattr(poller, "fetch_latest", lambda source, limit=25: fetched.append(source.id) or [])
+    monkeypatch.setattr(pipeline, "get_connector", lambda source_type: poller)
+    pipeline.run_ingestion_pipeline(db_session, summarize=False)
+    assert fetched == ["src_a"]
+
+    hub.subscriber.post("/v1/admin/websub/yt_desk/unsubscribe", headers=ADMIN)
+    assert hub.verify_pending() == [200]
+    assert db_session.get(WebSubSubscription, "yt_desk").state == "unsubscribed"
+    assert hub.publish(TOPIC, atom(("vid4", "After unsubscribe"))).status_code == 202
+    assert db_session.query(SourceItem).count() == 2
+
+
+def test_signature_check_rejects_tampering() -> None:
+    body = b"<feed/>"
+    signature = "sha1=" + hmac.new(b"s3cret", body, hashlib.sha1).hexdigest()
+
+    assert websub.signature_valid("s3cret", body, signature)
+    assert not websub.signature_valid("s3cret", body + b" ", signature)
+    assert not websub.signature_valid("s3cret", body, "md5=" + hashlib.md5(body).hexdigest())
+    assert not websub.signature_valid("s3cret", body, None)
+
+
+def test_verification_needs_an_outstanding_request_and_caps_the_lease(db_session, hub, monkeypatch) -> None:
+    channel = make_source("yt_desk")
+    channel.source_type, channel.external_ref = "youtube", TOPIC
+    db_session.add(channel)
+    db_session.commit()
+    monkeypatch.setattr(settings, "websub_max_lease_seconds", 3600)
+
+    hub.subscriber.post("/v1/admin/websub/yt_desk/subscribe", headers=ADMIN)
+    params = {"hub.mode": "subscribe", "hub.topic": TOPIC, "hub.challenge": "c1", "hub.lease_seconds": str(10**12)}
+    assert hub.subscriber.get("/v1/websub/yt_desk", params=params).text == "c1"
+    row = db_session.get(WebSubSubscription, "yt_desk")
+    assert row.lease_seconds == 3600
+    assert row.requested_at is None
+
+    # Nothing is outstanding any more, so a replayed or forged verification can't extend the lease.
+    expires_at = row.expires_at
+    assert hub.subscriber.get("/v1/websub/yt_desk", params={**params, "hub.challenge": "c2"}).status_code == 404
+    assert db_session.get(WebSubSubscription, "yt_desk").expires_at == expires_at
+    denied = {"hub.mode": "denied", "hub.topic": TOPIC, "hub.challenge": "c3"}
+    assert hub.subscriber.get("/v1/websub/yt_desk", params=denied).status_code == 404
+    assert db_session.get(WebSubSubscription, "yt_desk").state == "verified"
+
+
+def test_failed_push_ingestion_is_logged_and_still_acknowledged(db_session, hub, monkeypatch, caplog) -> None:
+    channel = make_source("yt_desk")
+    channel.source_type, channel.external_ref = "youtube", TOPIC
+    db_session.add(channel)
+    db_session.commit()
+    hub.subscriber.post("/v1/admin/websub/yt_desk/subscribe", headers=ADMIN)
+    hub.verify_pending()
+
+    def broken_ingest(db, source_id, entries):
+        raise RuntimeError("cluster engine unavailable")
+
+    monkeypatch.setattr(push, "ingest_pushed_entries", broken_ingest)
+
+    assert hub.publish(TOPIC, atom(("vid1", "Bridge reopens after repairs"))).status_code == 202
+    assert "push ingestion for yt_desk failed" in caplog.text
@@ -1,9 +1,14 @@
+import os
+
 from rq import SimpleWorker
 
+from app.core.config import settings
 from app.core.redis_client import get_redis
 
 
 if __name__ == "__main__":
+    default_queues = f"{settings.ingestion_queue_name},{settings.summarization_queue_name}"
+    queues = [name.strip() for name in os.getenv("WORKER_QUEUES", default_queues).split(",") if name.strip()]
     redis = get_redis(decode_responses=False)
-    worker = SimpleWorker(["pulsewire"], connection=redis)
+    worker = SimpleWorker(queues, connection=redis)
     worker.work()